@@ -0,0 +1,167 @@
+"""
+증분 갱신용 종목별 분석 상태 저장소
+
+run_full_analysis 결과(종목별 스크래핑 데이터)를 JSON 파일에 보관해 두고,
+다음 실행에서 어떤 종목만 다시 스크래핑하면 되는지 판단합니다.
+
+다시 가져오는 종목:
+    - 이전 실행에 없던 신규 종목
+    - 이전 실행에서 오류가 났던 종목
+    - 마지막 스크래핑 이후 분기가 바뀐 종목 (재무 정보 갱신)
+    - 마지막 스크래핑이 최대 보관 기간보다 오래된 종목 (투자지표/투자의견 갱신)
+    - 시세 스냅샷에 없고, 마지막 스크래핑이 오늘이 아닌 종목 (가격 갱신)
+
+나머지 종목은 저장된 데이터를 재사용하고, 가격 필드만 시세 스냅샷으로 덮어씁니다.
+
+환경 변수:
+    STOCK_ANALYSIS_STATE          상태 파일 경로 (기본 analysis_state.json)
+    STOCK_ANALYSIS_MAX_AGE_DAYS   저장 데이터 최대 보관 일수 (기본 7)
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app_logging import get_logger
+from stock_record import StockRecord, parse_number
+
+
+log = get_logger(__name__)
+
+
+STATE_PATH = os.environ.get('STOCK_ANALYSIS_STATE', 'analysis_state.json')
+MAX_AGE_DAYS = float(os.environ.get('STOCK_ANALYSIS_MAX_AGE_DAYS', '7'))
+
+# 시세 스냅샷(시가총액 목록 페이지)에서 종목 페이지와 같은 형식으로 얻을 수 있는 필드
+SNAPSHOT_PRICE_FIELDS = ('current_price', 'volume')
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def quarter_of(moment: datetime) -> str:
+    """날짜가 속한 분기 (예: "2026Q4")"""
+    return f"{moment.year}Q{(moment.month - 1) // 3 + 1}"
+
+
+def parse_timestamp(text: Optional[str]) -> Optional[datetime]:
+    """scraped_at 문자열을 datetime으로 바꿉니다. (형식이 다르면 None)"""
+    try:
+        return datetime.strptime(text, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def refresh_reason(record: Optional[StockRecord], now: datetime, max_age: timedelta,
+                   price_available: bool) -> Optional[str]:
+    """
+    종목을 다시 스크래핑해야 하는 이유를 반환합니다.
+
+    Args:
+        record: 이전 실행에서 저장된 데이터 (없으면 None)
+        now: 기준 시각
+        max_age: 저장 데이터 최대 보관 기간
+        price_available: 시세 스냅샷에서 가격을 받을 수 있는지 여부
+
+    Returns:
+        "new", "error", "quarter", "expired", "price" 중 하나, 재사용 가능하면 None
+    """
+    if record is None:
+        return 'new'
+    if record.error is not None:
+        return 'error'
+
+    scraped_at = parse_timestamp(record.scraped_at)
+    if scraped_at is None:
+        return 'new'
+    if quarter_of(scraped_at) != quarter_of(now):
+        return 'quarter'
+    if now - scraped_at >= max_age:
+        return 'expired'
+    if not price_available and scraped_at.date() != now.date():
+        return 'price'
+    return None
+
+
+class AnalysisState:
+    """종목별 마지막 스크래핑 결과를 보관하는 JSON 파일 저장소"""
+
+    def __init__(self, path: str = STATE_PATH, max_age_days: float = MAX_AGE_DAYS):
+        """
+        Args:
+            path: 상태 파일 경로
+            max_age_days: 이 기간보다 오래된 데이터는 다시 스크래핑
+        """
+        self.path = path
+        self.max_age = timedelta(days=max_age_days)
+        self.records: Dict[str, StockRecord] = {}
+        self.load()
+
+    def load(self):
+        """상태 파일을 읽습니다. 파일이 없거나 손상되었으면 빈 상태로 시작합니다."""
+        if not os.path.exists(self.path):
+            self.records = {}
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stocks = json.load(f).get('stocks', {})
+            self.records = {ticker: StockRecord.from_json(data) for ticker, data in stocks.items()}
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Ignoring unreadable analysis state", extra={"path": self.path, "error": e})
+            self.records = {}
+
+    def save(self):
+        """상태 파일을 씁니다. (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'saved_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+                'stocks': {ticker: record.to_json() for ticker, record in self.records.items()},
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def update(self, records: Iterable[StockRecord]):
+        """스크래핑 결과로 상태를 갱신합니다."""
+        for record in records:
+            self.records[record.ticker] = record
+
+    def plan(self, stocks: List[Dict], prices: Optional[Dict[str, Dict]] = None,
+             now: Optional[datetime] = None) -> Tuple[List[Dict], List[StockRecord], Dict[str, int]]:
+        """
+        다시 스크래핑할 종목과 재사용할 종목을 나눕니다.
+
+        Args:
+            stocks: 이번 실행의 종목 리스트 [{'ticker', 'name', 'market'}, ...]
+            prices: 종목 코드 -> 시세 스냅샷 항목 (없으면 가격 덮어쓰기 없음)
+            now: 기준 시각 (기본 현재 시각)
+
+        Returns:
+            (스크래핑할 종목 리스트, 재사용할 StockRecord 리스트, 이유별 종목 수)
+        """
+        now = now or datetime.now()
+        prices = prices or {}
+        to_fetch = []
+        reused = []
+        reasons: Dict[str, int] = {}
+
+        for stock_info in stocks:
+            ticker = stock_info['ticker']
+            record = self.records.get(ticker)
+            reason = refresh_reason(record, now, self.max_age, ticker in prices)
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + 1
+                to_fetch.append(stock_info)
+                continue
+
+            changes = {'name': stock_info['name'], 'market': stock_info['market']}
+            snapshot = prices.get(ticker)
+            if snapshot:
+                for field in SNAPSHOT_PRICE_FIELDS:
+                    value = parse_number(snapshot.get(field))
+                    if value is not None:
+                        changes[field] = value
+            reused.append(record.copy(**changes))
+
+        return to_fetch, reused, reasons
@@ -0,0 +1,315 @@
+"""
+레벨/샘플링/구조화 로깅 (큐 기반 비동기 출력)
+
+요청 처리 경로의 print(..., flush=True)를 대신합니다. 로그를 남기는 스레드는 레코드를 큐에
+넣기만 하고, 메시지 포맷(결과 딕셔너리 repr 포함)과 stdout 쓰기는 별도 스레드(QueueListener)가 합니다.
+꺼진 레벨과 샘플링에서 빠진 DEBUG 호출은 LogRecord를 만들기 전에 끝나며 (LOG_SAMPLE_RATE 비율만 남김),
+레코드에는 포맷에 쓰지 않는 호출 위치/스레드/프로세스 정보를 찾지 않습니다. 큐가 가득 차면 기다리지 않고
+버린 뒤 개수를 셉니다. (/api/metrics)
+
+    log = get_logger(__name__)
+    log.debug("Trading analysis result", extra={"ticker": ticker, "result": result})
+
+extra로 넘긴 값은 구조화 필드가 되어 text 형식에서는 key=value로, json 형식에서는 JSON 키로 나갑니다.
+text 형식은 기존 print 규칙을 따릅니다. (INFO는 메시지만, 나머지는 [DEBUG]/[WARN]/[ERROR] 접두사)
+포맷은 나중에 하므로 extra/인자로 넘긴 객체는 로그를 남긴 뒤 수정하지 않아야 합니다.
+
+설정 (환경 변수):
+    LOG_LEVEL        DEBUG, INFO, WARNING, ERROR (기본 INFO)
+    LOG_SAMPLE_RATE  남길 DEBUG 레코드 비율 0~1 (기본 1)
+    LOG_FORMAT       text 또는 json (기본 text)
+    LOG_QUEUE_SIZE   출력 대기 레코드 수 한도 (기본 10000)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Mapping, Optional
+
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '1'))
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+
+# 모든 모듈 로거의 부모 ('stock.main', 'stock.naver_scraper_trading', ...)
+ROOT_LOGGER = 'stock'
+
+# 기존 print 접두사와 같은 이름
+LEVEL_PREFIXES = {'WARNING': 'WARN', 'CRITICAL': 'ERROR'}
+
+_START_TIME = time.time()
+
+# LogRecord 기본 속성 (이외의 속성은 extra로 넘긴 구조화 필드)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def record_fields(record: logging.LogRecord) -> Dict:
+    """extra로 넘긴 구조화 필드"""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class TextFormatter(logging.Formatter):
+    """[LEVEL] 메시지 key=value ... (INFO는 접두사 없음)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        fields = record_fields(record)
+        if fields:
+            message += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            message += '\n' + self.formatException(record.exc_info)
+        if record.levelno == logging.INFO:
+            return message
+        return f"[{LEVEL_PREFIXES.get(record.levelname, record.levelname)}] {message}"
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **record_fields(record),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class Sampler:
+    """level 이하 레코드는 rate 비율만 남깁니다."""
+
+    def __init__(self, rate: float, level: int = logging.DEBUG):
+        self.rate = rate
+        self.level = level
+        self.sampled_out = 0
+
+    def keep(self, level: int) -> bool:
+        if level > self.level or self.rate >= 1:
+            return True
+        if random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+_LIGHT_RECORD_DEFAULTS = {
+    'pathname': '', 'filename': '', 'module': '', 'lineno': 0, 'funcName': None, 'stack_info': None,
+    'exc_text': None, 'thread': None, 'threadName': None, 'process': None, 'processName': None, 'taskName': None,
+}
+
+
+class LightRecord(logging.LogRecord):
+    """호출 위치/스레드/프로세스 정보 없이 만드는 레코드 ('stock' 로거 전용, 포맷에 쓰는 값만 채움)"""
+
+    def __init__(self, name: str, level: int, msg, args, exc_info, extra: Optional[Mapping]):
+        # %(filename)s처럼 record.__dict__로 포맷하는 핸들러도 있으므로 인스턴스 속성으로 둠
+        self.__dict__.update(_LIGHT_RECORD_DEFAULTS)
+        self.created = now = time.time()
+        self.msecs = (now - int(now)) * 1000
+        self.relativeCreated = (now - _START_TIME) * 1000
+        self.name = name
+        self.levelno = level
+        self.levelname = logging.getLevelName(level)
+        self.msg = msg
+        # logging.LogRecord와 같이 log.debug("%(x)s", {"x": 1}) 형태 지원
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.exc_info = exc_info
+        if extra:
+            if not _RECORD_ATTRIBUTES.isdisjoint(extra):
+                raise KeyError(f"Attempt to overwrite {sorted(_RECORD_ATTRIBUTES.intersection(extra))} in LogRecord")
+            self.__dict__.update(extra)
+
+
+class StockLogger(logging.LoggerAdapter):
+    """
+    get_logger()가 돌려주는 모듈 로거
+
+    레벨과 DEBUG 샘플링을 레코드를 만들기 전에 판단하고, 남길 레코드만 LightRecord로 만들어
+    'stock' 로거로 넘깁니다. (다른 라이브러리 로거의 레코드 생성 방식은 그대로)
+    """
+
+    def log(self, level: int, msg, *args, exc_info=None, extra: Optional[Mapping] = None,
+            stack_info: bool = False, stacklevel: int = 1):
+        # 호출 위치를 찾지 않으므로 stack_info/stacklevel은 쓰지 않음
+        logger = self.logger
+        if not logger.isEnabledFor(level):
+            return
+        sampler = _state.get('sampler')
+        if sampler is not None and not sampler.keep(level):
+            return
+        if exc_info and not isinstance(exc_info, tuple):
+            exc_info = (type(exc_info), exc_info, exc_info.__traceback__) \
+                if isinstance(exc_info, BaseException) else sys.exc_info()
+        logger.handle(LightRecord(logger.name, level, msg, args, exc_info, extra))
+
+
+class StdoutHandler(logging.StreamHandler):
+    """쓸 때마다 현재 sys.stdout을 사용합니다. (테스트/리다이렉트로 바뀐 stdout을 따름)"""
+
+    def __init__(self):
+        super().__init__()
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    레코드를 포맷하지 않고 큐에 넣고, 큐가 가득 차면 기다리지 않고 버립니다.
+
+    queue.Queue 대신 락/조건 변수가 없는 SimpleQueue를 쓰고 크기 한도는 qsize()로 확인합니다.
+    (여러 스레드가 동시에 넣으면 한도를 조금 넘을 수 있음)
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.SimpleQueue())
+        self.maxsize = maxsize
+        self.dropped = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # 큐가 스레드 안전하므로 핸들러 락 없이 넣음
+        if self.filter(record):
+            self.enqueue(record)
+            return True
+        return False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스의 리스너 스레드가 받으므로 pickle용 사전 포맷이 필요 없음
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+        else:
+            self.queue.put(record)
+
+
+class FlushingQueueListener(QueueListener):
+    """큐에 넣은 threading.Event는 출력하지 않고 set()합니다. (flush() - 앞선 레코드를 모두 쓴 시점)"""
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+        else:
+            super().handle(record)
+
+
+_lock = threading.Lock()
+_state: Dict = {}
+
+
+def configure(level: str = LOG_LEVEL, sample_rate: float = LOG_SAMPLE_RATE, fmt: str = LOG_FORMAT,
+              queue_size: int = LOG_QUEUE_SIZE, handler: Optional[logging.Handler] = None,
+              use_queue: bool = True) -> logging.Logger:
+    """
+    'stock' 로거 출력을 (다시) 설정합니다. 처음 get_logger()를 부를 때 환경 변수 설정으로 호출됩니다.
+
+    Args:
+        level: 로그 레벨 이름 또는 숫자
+        sample_rate: 남길 DEBUG 레코드 비율 (0~1)
+        fmt: 'text' 또는 'json'
+        queue_size: 출력 대기 레코드 수 한도
+        handler: 실제로 쓰는 핸들러 (기본 stdout)
+        use_queue: False면 로그를 남긴 스레드에서 바로 포맷/출력 (벤치마크 비교용)
+
+    Returns:
+        'stock' 로거
+    """
+    with _lock:
+        _shutdown()
+        output = handler or StdoutHandler()
+        output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+        listener = None
+        if use_queue:
+            front = DroppingQueueHandler(queue_size)
+            listener = FlushingQueueListener(front.queue, output)
+            listener.start()
+        else:
+            front = output
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for existing in list(root.handlers):  # 다른 곳에서 붙인 핸들러도 정리 (출력은 여기서만)
+            root.removeHandler(existing)
+        root.setLevel(level)
+        root.propagate = False
+        root.addHandler(front)
+        _state.update(front=front, listener=listener, sampler=Sampler(sample_rate))
+        return root
+
+
+def get_logger(name: str) -> StockLogger:
+    """모듈 로거 ('stock.<name>'). 설정 전이면 환경 변수 설정으로 configure()합니다."""
+    if not _state:
+        configure()
+    return StockLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"))
+
+
+def flush():
+    """큐에 쌓인 레코드를 모두 출력할 때까지 기다립니다."""
+    front = _state.get('front')
+    if isinstance(front, DroppingQueueHandler):
+        done = threading.Event()
+        front.queue.put(done)
+        done.wait()
+    elif front is not None:
+        front.flush()
+
+
+def stats() -> Dict[str, int]:
+    """버린 레코드 수(큐 가득 참), 샘플링으로 거른 DEBUG 레코드 수, 대기 중인 레코드 수"""
+    front = _state.get('front')
+    queued = isinstance(front, DroppingQueueHandler)
+    return {
+        'dropped': front.dropped if queued else 0,
+        'sampled_out': _state['sampler'].sampled_out if _state else 0,
+        'queued': front.queue.qsize() if queued else 0,
+    }
+
+
+def metric_lines() -> List[str]:
+    """/api/metrics에 붙일 로깅 카운터"""
+    current = stats()
+    return [
+        "# TYPE log_records_dropped_total counter",
+        f"log_records_dropped_total {current['dropped']}",
+        "# TYPE log_records_sampled_out_total counter",
+        f"log_records_sampled_out_total {current['sampled_out']}",
+    ]
+
+
+def _shutdown():
+    listener = _state.get('listener')
+    if listener is not None:
+        listener.stop()  # 남은 레코드를 모두 출력한 뒤 종료
+    front = _state.get('front')
+    if front is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(front)
+    _state.clear()
+
+
+def shutdown():
+    """리스너 스레드를 멈춥니다. (종료 시 자동 호출)"""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown)
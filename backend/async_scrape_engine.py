@@ -0,0 +1,159 @@
+"""
+비동기 일괄 스크래핑 엔진
+
+asyncio 기반으로 여러 종목을 동시에 스크래핑합니다.
+동시 실행 수(concurrency)와 전역 초당 요청 수(토큰 버킷)를 함께 제한하여,
+요청 간 고정 대기 대신 정해진 요청 예산을 겹쳐진 요청들에 나누어 사용합니다.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_CONCURRENCY = 8
+# 기존 순차 스크래핑(종목마다 약 1초 대기)과 같은 요청 예산. 더 빠르게 하려면 호출하는 쪽에서 명시
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+
+
+class TokenBucket:
+    """초당 요청 수를 제한하는 토큰 버킷 (모든 작업자가 공유)"""
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 토큰 보충 속도 (None 또는 0 이하면 제한 없음)
+            capacity: 최대 토큰 수 (순간 허용 요청 수, 기본값 1)
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = capacity if capacity else 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기합니다."""
+        if self.rate is None:
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncScrapeEngine:
+    """동시 실행 수와 초당 요청 수를 제한하는 비동기 스크래핑 엔진"""
+
+    def __init__(
+        self,
+        worker: Callable[[Any], Dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            worker: 항목 하나를 받아 결과 딕셔너리를 반환하는 함수
+                    (블로킹 함수는 스레드에서, 코루틴 함수는 이벤트 루프에서 바로 실행)
+            concurrency: 동시에 진행할 최대 요청 수
+            requests_per_second: 전체 작업자가 공유하는 초당 요청 한도 (None이면 제한 없음)
+            bucket: 여러 실행이 함께 쓰는 토큰 버킷 (주면 requests_per_second 대신 사용)
+        """
+        self.worker = worker
+        self.concurrency = max(1, int(concurrency))
+        self.requests_per_second = requests_per_second
+        self.bucket = bucket
+
+    async def iter_results(self, items: Iterable[Any]) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        완료되는 순서대로 (입력 인덱스, 결과)를 반환합니다.
+
+        Args:
+            items: worker에 전달할 항목들
+        """
+        items = list(items)
+        if not items:
+            return
+
+        loop = asyncio.get_running_loop()
+        bucket = self.bucket or TokenBucket(self.requests_per_second)
+        pending: asyncio.Queue = asyncio.Queue()
+        done: asyncio.Queue = asyncio.Queue()
+        for pair in enumerate(items):
+            pending.put_nowait(pair)
+
+        worker_count = min(self.concurrency, len(items))
+        # 코루틴 작업자는 스레드 없이 동시 실행 수만큼 요청을 겹침
+        executor = None if inspect.iscoroutinefunction(self.worker) else ThreadPoolExecutor(max_workers=worker_count)
+
+        async def run_worker():
+            while True:
+                try:
+                    index, item = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                await bucket.acquire()
+                try:
+                    if executor is None:
+                        result = await self.worker(item)
+                    else:
+                        result = await loop.run_in_executor(executor, self.worker, item)
+                except Exception as e:
+                    result = {'error': str(e)}
+                done.put_nowait((index, result))
+
+        workers = [asyncio.create_task(run_worker()) for _ in range(worker_count)]
+        try:
+            for _ in range(len(items)):
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        on_result: Optional[Callable[[int, int, Any, Dict], None]] = None,
+    ) -> List[Dict]:
+        """
+        모든 항목을 처리하고 입력 순서대로 결과 리스트를 반환합니다.
+
+        Args:
+            items: worker에 전달할 항목들
+            on_result: 항목 하나가 끝날 때마다 호출되는 콜백 (완료 개수, 전체 개수, 항목, 결과)
+        """
+        items = list(items)
+        results: List[Optional[Dict]] = [None] * len(items)
+        completed = 0
+
+        async for index, result in self.iter_results(items):
+            results[index] = result
+            completed += 1
+            if on_result:
+                on_result(completed, len(items), items[index], result)
+
+        return results
+
+    def run_sync(
+        self,
+        items: Iterable[Any],
+        on_result: Optional[Callable[[int, int, Any, Dict], None]] = None,
+    ) -> List[Dict]:
+        """동기 코드에서 run()을 실행합니다."""
+        return asyncio.run(self.run(items, on_result=on_result))
@@ -0,0 +1,83 @@
+"""
+아카이브 조회 벤치마크: 날짜별 Excel 파일 vs Parquet 아카이브
+
+합성 분석 결과(종목 수 x 거래일 수)로 임시 아카이브를 만든 뒤, 여러 달에 걸친
+횡단면 조회(몇 개 컬럼, 기간 필터)에 걸리는 시간을 잽니다. 비교를 위해 같은 하루치를
+save_to_excel 형식의 xlsx로 저장하고 다시 읽는 시간도 재서 거래일 수만큼 곱해 보여줍니다.
+
+사용법:
+    python benchmark_archive.py [거래일 수] [종목 수]   (기본 250 2600)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import openpyxl
+
+from benchmark_scoring import make_scraped
+from market_archive import MarketArchive
+from stock_analysis_system import StockAnalysisSystem
+from stock_record import StockRecord
+from vector_scoring import score_stock_records
+
+
+def make_analyzed(count: int):
+    """analyze_all_stocks 결과와 같은 형식의 합성 데이터"""
+    records = [
+        StockRecord.from_scraped(data, data['ticker'], data['name'], 'KOSPI' if i % 2 else 'KOSDAQ',
+                                 '2026-10-16 15:30:00')
+        for i, data in enumerate(make_scraped(count))
+    ]
+    return [{**record.to_json(), **result} for record, result in zip(records, score_stock_records(records).results())]
+
+
+def trading_days(count: int, end: date = date(2026, 10, 16)):
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return sorted(days)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    day_count = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    stock_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2600
+
+    root = tempfile.mkdtemp()
+    try:
+        archive = MarketArchive(os.path.join(root, 'archive'))
+        analyzed = make_analyzed(stock_count)
+        days = trading_days(day_count)
+
+        elapsed, _ = timed(lambda: [archive.append(analyzed, day) for day in days])
+        print(f"아카이브 저장: {day_count}일 x {stock_count}종목 {elapsed:.1f}s ({elapsed / day_count * 1000:.0f}ms/일)")
+
+        quarter = days[-63:]
+        queries = [
+            ("3개월, 3개 컬럼", dict(columns=['ticker', 'score', 'per'], start=quarter[0], end=quarter[-1])),
+            ("3개월, KOSPI, 3개 컬럼", dict(columns=['ticker', 'score', 'per'], start=quarter[0], end=quarter[-1], markets=['KOSPI'])),
+            ("전체 기간, 3개 컬럼", dict(columns=['ticker', 'score', 'per'])),
+            ("전체 기간, 전체 컬럼", dict()),
+        ]
+        for label, query in queries:
+            elapsed, table = timed(lambda: archive.read(**query))
+            print(f"   {label:24} {table.num_rows:>9,}행 {elapsed * 1000:8.1f}ms")
+
+        excel_path = os.path.join(root, 'day.xlsx')
+        StockAnalysisSystem().save_to_excel(analyzed, excel_path)
+        elapsed, _ = timed(lambda: list(openpyxl.load_workbook(excel_path, read_only=True).active.values))
+        print(f"   비교: xlsx 하루치 읽기 {elapsed * 1000:.0f}ms -> 3개월({len(quarter)}일) 약 {elapsed * len(quarter):.1f}s")
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,88 @@
+"""
+내보내기 벤치마크: 메모리 내 워크북 (기존 /api/export) vs 스트리밍 내보내기
+
+/api/export와 같은 9개 컬럼의 합성 행으로 형식별 첫 조각까지의 시간, 전체 시간,
+최대 메모리 사용량(tracemalloc peak)을 비교합니다. 행 수를 늘려도 스트리밍 쪽의
+최대 메모리가 거의 일정한지 확인하는 용도입니다.
+
+사용법:
+    python benchmark_export.py [행 수 ...]   (기본 2600 26000)
+"""
+
+import gc
+import io
+import sys
+import time
+import tracemalloc
+
+import openpyxl
+
+from table_export import iter_table, parquet_available
+
+
+HEADERS = ["종목코드", "종목명", "현재가", "투자의견", "목표주가", "52주 최고", "52주 최저", "업종", "시장"]
+
+
+def make_rows(count: int):
+    """/api/export 행과 같은 형식의 합성 행 이터레이터"""
+    for i in range(count):
+        yield [f"{i:06d}", f"종목{i}", f"{1000 + i:,}", "매수 (4.00)", f"{2000 + i:,}",
+               f"{3000 + i:,}", f"{500 + i:,}", "반도체", "KOSPI" if i % 2 else "KOSDAQ"]
+
+
+def in_memory_xlsx(count: int):
+    """기존 방식: 일반 워크북을 BytesIO에 저장한 뒤 getvalue()로 복사"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for row in make_rows(count):
+        ws.append(row)
+    output = io.BytesIO()
+    wb.save(output)
+    yield output.getvalue()
+
+
+def timed(chunks):
+    """(첫 조각까지 초, 전체 초, 전체 바이트)"""
+    gc.collect()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def peak_memory(chunks) -> int:
+    """조각을 모두 소비하는 동안의 최대 메모리(바이트), tracemalloc이 느려서 시간과 따로 잽니다."""
+    gc.collect()
+    tracemalloc.start()
+    for _ in chunks:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(count: int):
+    cases = [('xlsx (in-memory)', lambda: in_memory_xlsx(count))]
+    formats = ['xlsx', 'csv'] + (['parquet'] if parquet_available() else [])
+    for export_format in formats:
+        cases.append((f"{export_format} (stream)",
+                      lambda export_format=export_format: iter_table(export_format, HEADERS, make_rows(count))))
+
+    print(f"\n{count:,}개 행")
+    for label, build in cases:
+        first, total, size = timed(build())
+        peak = peak_memory(build())
+        print(f"   {label:18} 첫 조각 {first * 1000:8.1f}ms | 전체 {total * 1000:8.1f}ms | "
+              f"최대 메모리 {peak / 1024 / 1024:6.2f}MB | 파일 {size / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [2600, 26000]
+    run(100)  # 라이브러리 초기화 비용 제외
+    for count in counts:
+        run(count)
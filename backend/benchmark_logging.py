@@ -0,0 +1,145 @@
+"""
+로깅 벤치마크: 분석 요청 하나가 남기는 로그의 요청당 비용 (네트워크 없음)
+
+/api/analyze와 /api/trading-analysis를 대역 서버(naver_standin.py)로 한 번씩 실행해 요청 하나가 남기는
+로그 호출(레벨, 메시지, 구조화 필드)을 모은 뒤, 같은 호출을 모드별로 반복해 요청 스레드가
+쓰는 시간을 잽니다. 출력은 임시 파일로 보냅니다. (터미널이면 print 쪽 비용이 더 커짐)
+
+    print    변경 전처럼 매번 print(..., flush=True)로 결과 딕셔너리까지 바로 출력
+    sync     LOG_LEVEL=DEBUG, 큐 없이 로그를 남긴 스레드에서 포맷/출력
+    queue    LOG_LEVEL=DEBUG, 큐 기반 (포맷/출력은 리스너 스레드)
+    sampled  LOG_LEVEL=DEBUG, LOG_SAMPLE_RATE=0.01, 큐 기반
+    info     기본 설정 (LOG_LEVEL=INFO, DEBUG 로그는 호출 즉시 끝남)
+
+큐 기반 모드는 요청 스레드 시간과 별도로 남은 레코드를 모두 쓰는 데 걸린 시간(drain)도 보여줍니다.
+
+사용법:
+    python benchmark_logging.py [--requests 2000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# main을 가져올 때 이력 DB 파일을 만들지 않도록
+os.environ.setdefault('STOCK_HISTORY_DB', '')
+
+from fastapi.testclient import TestClient
+
+import app_logging
+import http_session
+import main
+from naver_standin import StandinServer
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def capture_request_logs(ticker: str = '005935') -> List[logging.LogRecord]:
+    """분석 요청 두 개(analyze, trading)가 DEBUG 레벨에서 남기는 로그 레코드 (대역 서버 사용)"""
+    capture = CaptureHandler()
+    app_logging.configure(level='DEBUG', handler=capture, use_queue=False)
+
+    server = StandinServer(port=0).start()
+    original = http_session.NAVER_BASE_URL
+    http_session.NAVER_BASE_URL = server.url
+    main.response_cache.clear()
+    try:
+        with TestClient(main.app) as client:
+            client.get(f'/api/analyze/{ticker}')
+            client.get(f'/api/trading-analysis/{ticker}')
+    finally:
+        http_session.NAVER_BASE_URL = original
+        main.response_cache.clear()
+        server.stop()
+    return capture.records
+
+
+def legacy_replay(records: List[logging.LogRecord]) -> Callable[[], None]:
+    """변경 전 코드처럼 레코드마다 print(..., flush=True)"""
+    calls = [(record.levelname, record.msg, record.args, app_logging.record_fields(record)) for record in records]
+
+    def replay():
+        for level, msg, args, fields in calls:
+            message = msg % args if args else msg
+            print(f"[{level}] {message}: {' '.join(f'{key}={value}' for key, value in fields.items())}", flush=True)
+
+    return replay
+
+
+def logging_replay(records: List[logging.LogRecord]) -> Callable[[], None]:
+    """같은 모듈 로거(get_logger)로 같은 레벨/메시지/extra의 로그를 다시 남깁니다."""
+    calls = [(app_logging.get_logger(record.name.split('.', 1)[1]), record.levelno, record.msg, record.args,
+              app_logging.record_fields(record)) for record in records]
+
+    def replay():
+        for logger, level, msg, args, fields in calls:
+            logger.log(level, msg, *args, extra=fields)
+
+    return replay
+
+
+MODES: Dict[str, Dict] = {
+    'print': {},
+    'sync': {'level': 'DEBUG', 'use_queue': False},
+    'queue': {'level': 'DEBUG'},
+    'sampled': {'level': 'DEBUG', 'sample_rate': 0.01},
+    'info': {'level': 'INFO'},
+}
+
+
+def time_mode(mode: str, records: List[logging.LogRecord], requests: int, repeat: int, output) -> Dict[str, float]:
+    """요청당 요청 스레드 시간(us)의 최솟값과 그때의 drain 시간(ms)"""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(output):
+            if mode == 'print':
+                replay = legacy_replay(records)
+            else:
+                app_logging.configure(**MODES[mode], queue_size=requests * len(records) + 1)
+                replay = logging_replay(records)
+            start = time.perf_counter()
+            for _ in range(requests):
+                replay()
+            elapsed = time.perf_counter() - start
+            app_logging.flush()
+            drain = time.perf_counter() - start - elapsed
+            output.flush()
+        result = {'us_per_request': elapsed / requests * 1e6, 'drain_ms': drain * 1000}
+        if best is None or result['us_per_request'] < best['us_per_request']:
+            best = result
+    return best
+
+
+def run(requests: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    records = capture_request_logs()
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as output:
+        results = {mode: time_mode(mode, records, requests, repeat, output) for mode in MODES}
+        results['_records'] = {'per_request': len(records), 'bytes': output.tell() / (requests * repeat * len(MODES))}
+    app_logging.configure()
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="요청당 로깅 비용 벤치마크")
+    arg_parser.add_argument('--requests', type=int, default=2000, help="모드별 반복할 요청 수")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="모드별 측정 횟수 (최솟값 사용)")
+    args = arg_parser.parse_args()
+
+    results = run(args.requests, args.repeat)
+    info = results.pop('_records')
+    print(f"요청당 로그 {info['per_request']}개, 요청 {args.requests}개 x {args.repeat}회")
+    print(f"{'모드':8} {'요청당(us)':>12} {'drain(ms)':>10} {'print 대비':>10}")
+    legacy = results['print']['us_per_request']
+    for mode, r in results.items():
+        print(f"{mode:8} {r['us_per_request']:12.1f} {r['drain_ms']:10.1f} {r['us_per_request'] / legacy:9.1%}")
@@ -0,0 +1,123 @@
+"""
+점수 계산 벤치마크: analyze_stock_ai (종목별 반복) vs vector_scoring (배열 연산)
+
+실제 스크래핑 결과와 비슷한 형식의 합성 데이터(쉼표 숫자, "N/A", 누락 필드)를
+만들어 두 방식의 실행 시간을 비교하고 결과가 같은지 확인합니다.
+StockRecord(숫자로 미리 변환한 레코드)에서 바로 점수를 계산하는 시간과
+종목당 메모리 사용량도 함께 출력합니다.
+
+사용법:
+    python benchmark_scoring.py [행 수 ...]   (기본 2600 26000)
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from stock_analysis_system import StockAnalysisSystem
+from stock_record import NUMBER_FIELDS, TEXT_FIELDS, StockRecord
+from vector_scoring import ScoreColumns, score_columns
+
+
+def make_records(count: int, seed: int = 0) -> List[Dict]:
+    """합성 종목 데이터를 만듭니다."""
+    rng = random.Random(seed)
+
+    def number(low, high, digits=2, missing=0.05):
+        if rng.random() < missing:
+            return 'N/A'
+        return f"{rng.uniform(low, high):,.{digits}f}"
+
+    records = []
+    for i in range(count):
+        low = rng.randint(1000, 200000)
+        high = low if rng.random() < 0.01 else low + rng.randint(0, 100000)
+        record = {
+            'ticker': f"{i:06d}",
+            'name': f"종목{i}",
+            'per': number(-20, 60),
+            'pbr': number(0.1, 6),
+            'roe': number(-10, 30),
+            'debt_ratio': number(5, 300),
+            'current_price': f"{rng.randint(low, high):,}",
+            'high_52w': f"{high:,}",
+            'low_52w': f"{low:,}",
+            'opinion_score': number(1, 4, missing=0.4),
+            'dividend_yield': number(0, 6),
+        }
+        # 일부 필드가 아예 없는 종목
+        for field in ('opinion_score', 'dividend_yield', 'debt_ratio'):
+            if rng.random() < 0.05:
+                del record[field]
+        records.append(record)
+    return records
+
+
+def make_scraped(count: int, seed: int = 0) -> List[Dict]:
+    """스크래퍼 응답처럼 모든 필드가 있는 문자열 딕셔너리 (값이 없으면 "N/A")"""
+    base = dict.fromkeys(NUMBER_FIELDS + TEXT_FIELDS, 'N/A')
+    return [{**base, **data} for data in make_records(count, seed)]
+
+
+def allocated(build) -> int:
+    """build()가 만든 객체가 차지하는 메모리(바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def best_of(repeat: int, func, *args):
+    """repeat번 실행해 가장 빠른 시간(초)과 마지막 결과를 반환합니다."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(count: int, system: StockAnalysisSystem, repeat: int = 3):
+    records = make_scraped(count)
+
+    scalar_time, expected = best_of(repeat, lambda: [system.analyze_stock_ai(data) for data in records])
+    load_time, columns = best_of(repeat, ScoreColumns.from_records, records)
+    score_time, batch = best_of(repeat, score_columns, columns)
+    results_time, actual = best_of(repeat, batch.results)
+    vector_time = load_time + score_time + results_time
+    assert actual == expected, "vector_scoring results differ from analyze_stock_ai"
+
+    # 미리 숫자로 변환해 둔 StockRecord에서 바로 점수 계산 (문자열 변환 없음)
+    stock_records = [StockRecord.from_scraped(data, data['ticker']) for data in records]
+    record_load_time, record_columns = best_of(repeat, ScoreColumns.from_stock_records, stock_records)
+    assert score_columns(record_columns).results() == expected, "StockRecord scores differ from analyze_stock_ai"
+
+    print(f"{count:>7,}행 | analyze_stock_ai 반복 {scalar_time * 1000:7.1f}ms | "
+          f"열 변환 {load_time * 1000:6.1f}ms + 배열 점수 {score_time * 1000:5.1f}ms + "
+          f"결과 딕셔너리 {results_time * 1000:6.1f}ms = {vector_time * 1000:7.1f}ms | "
+          f"StockRecord 열 {record_load_time * 1000:6.1f}ms")
+
+
+def report_memory(count: int = 2600):
+    """종목당 메모리: 스크래퍼 문자열 딕셔너리 vs StockRecord"""
+    dict_bytes = allocated(lambda: make_scraped(count))
+    scraped = make_scraped(count)
+    record_bytes = allocated(lambda: [StockRecord.from_scraped(data, data['ticker'], data['name']) for data in scraped])
+    print(f"종목당 메모리 | 문자열 딕셔너리 {dict_bytes / count:6.0f}B | StockRecord {record_bytes / count:6.0f}B")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [2600, 26000]
+    system = StockAnalysisSystem()
+    for count in counts:
+        run(count, system)
+    report_memory()
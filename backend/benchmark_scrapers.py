@@ -0,0 +1,198 @@
+"""
+스크래퍼 벤치마크: 저장된 네이버 종목 페이지로 파싱/추출 시간 측정 (네트워크 없음)
+
+fixtures/naver/*.html (코스피, 코스닥, ETF, 일부 섹션이 없는 페이지, 실제 크기의 전체 페이지)을
+사용 가능한 파서 백엔드마다 읽어 다음 세 경로의 페이지당 시간을 잽니다.
+
+    trading   TradingStrategyScraper.get_complete_trading_info (fetch_page만 픽스처로 대체)
+    enhanced  NaverFinanceScraper.get_stock_info (fetch_page만 픽스처로 대체)
+    analyze   main.analyze_stock이 사용하는 parse_stock_analysis
+
+페이지마다 파싱(parse_html)과 추출 시간을 따로 보여주고, 전체 픽스처를 반복 처리한
+CPU 시간으로 코어당 초당 처리 페이지 수를 계산합니다.
+
+결과는 기준 파일(기본 benchmark_results/scrapers.json)과 비교해 경로별 파싱/추출 시간 합계나
+코어당 처리량이 threshold보다 나빠진 항목을 표시하며, --save로 현재 결과를 새 기준으로 저장합니다.
+(기준 파일은 측정한 기기에서만 의미가 있으므로 저장소에 넣지 않습니다.)
+
+사용법:
+    python benchmark_scrapers.py [--repeat 7] [--save] [--baseline 경로]
+                                 [--threshold 0.15] [--fail-on-regression]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+# main을 가져올 때 이력 DB 파일을 만들지 않도록
+os.environ.setdefault('STOCK_HISTORY_DB', '')
+
+from naver_scraper_enhanced import NaverFinanceScraper
+from naver_scraper_trading import TradingStrategyScraper
+from parser_backend import available_parsers, parse_html
+from test_parser_parity import load_fixtures
+import main
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results', 'scrapers.json')
+
+
+def scraper_paths(parser: str) -> Dict[str, Callable]:
+    """경로 이름 -> soup을 받아 추출 결과를 반환하는 함수"""
+    trading = TradingStrategyScraper(parser=parser)
+    enhanced = NaverFinanceScraper(parser=parser)
+
+    def run_trading(soup):
+        trading.fetch_page = lambda ticker: soup
+        return trading.get_complete_trading_info('000000')
+
+    def run_enhanced(soup):
+        enhanced.fetch_page = lambda ticker: soup
+        return enhanced.get_stock_info('000000')
+
+    def run_analyze(soup):
+        try:
+            return main.parse_stock_analysis(soup)
+        except Exception as e:
+            return {'error': str(e)}
+
+    return {'trading': run_trading, 'enhanced': run_enhanced, 'analyze': run_analyze}
+
+
+def time_page(html: str, parser: str, extract: Callable, repeat: int) -> Tuple[float, float]:
+    """페이지 하나의 (파싱 ms, 추출 ms), 각각 repeat번 중 최솟값"""
+    parse_best = extract_best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        soup = parse_html(html, parser)
+        parsed = time.perf_counter()
+        extract(soup)
+        done = time.perf_counter()
+        parse_best = parsed - start if parse_best is None else min(parse_best, parsed - start)
+        extract_best = done - parsed if extract_best is None else min(extract_best, done - parsed)
+    return parse_best * 1000, extract_best * 1000
+
+
+def pages_per_core_second(fixtures: List[Tuple[str, str]], parser: str, extract: Callable,
+                          min_seconds: float = 0.5) -> float:
+    """전체 픽스처를 min_seconds 이상 반복 처리한 CPU 시간 기준 초당 페이지 수 (파싱 + 추출)"""
+    pages = 0
+    start = time.process_time()
+    while True:
+        for name, html in fixtures:
+            extract(parse_html(html, parser))
+        pages += len(fixtures)
+        elapsed = time.process_time() - start
+        if elapsed >= min_seconds:
+            return pages / elapsed
+
+
+def run(repeat: int) -> Dict:
+    fixtures = load_fixtures()
+    results = {}
+    for parser in available_parsers():
+        for path, extract in scraper_paths(parser).items():
+            pages = {}
+            for name, html in fixtures:
+                parse_ms, extract_ms = time_page(html, parser, extract, repeat)
+                pages[name] = {'bytes': len(html.encode('utf-8')), 'parse_ms': round(parse_ms, 4),
+                               'extract_ms': round(extract_ms, 4)}
+            results[f"{path}/{parser}"] = {
+                'pages_per_core_sec': round(pages_per_core_second(fixtures, parser, extract), 1),
+                'pages': pages,
+            }
+    return {
+        'meta': {
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'fixtures': [name for name, html in fixtures],
+        },
+        'results': results,
+    }
+
+
+def totals(result: Dict) -> Dict[str, float]:
+    """경로 하나의 비교 지표 (페이지별 값은 짧아서 흔들리므로 합계로 비교)"""
+    return {
+        'pages_per_core_sec': result['pages_per_core_sec'],
+        'parse_ms': sum(page['parse_ms'] for page in result['pages'].values()),
+        'extract_ms': sum(page['extract_ms'] for page in result['pages'].values()),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    기준 결과보다 threshold 비율 넘게 느려진 항목을 반환합니다.
+    픽스처 목록이 같은 경로만 비교합니다.
+
+    Returns:
+        ["trading/lxml extract_ms 12.000 -> 15.000 (+25%)", ...]
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if base is None or set(base['pages']) != set(result['pages']):
+            continue
+        old_totals, new_totals = totals(base), totals(result)
+        for metric, old in old_totals.items():
+            new = new_totals[metric]
+            if not old:
+                continue
+            slower = new < old / (1 + threshold) if metric == 'pages_per_core_sec' else new > old * (1 + threshold)
+            if slower:
+                regressions.append(f"{key} {metric} {old:.3f} -> {new:.3f} ({new / old - 1:+.0%})")
+    return regressions
+
+
+def report(current: Dict, baseline: Dict = None):
+    for key, result in current['results'].items():
+        base = (baseline or {}).get('results', {}).get(key)
+        speed = f"{result['pages_per_core_sec']:8.1f} 페이지/초/코어"
+        if base:
+            speed += f" (기준 {base['pages_per_core_sec']:.1f}, {result['pages_per_core_sec'] / base['pages_per_core_sec'] - 1:+.0%})"
+        print(f"{key:20} {speed}")
+        for name, page in result['pages'].items():
+            print(f"   {name:28} {page['bytes'] / 1024:7.1f}KB  파싱 {page['parse_ms']:8.3f}ms  추출 {page['extract_ms']:8.3f}ms")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="저장된 네이버 페이지로 스크래퍼 파싱/추출 속도를 측정합니다.")
+    arg_parser.add_argument('--repeat', type=int, default=7, help="페이지별 반복 횟수 (최솟값 사용)")
+    arg_parser.add_argument('--baseline', default=BASELINE_PATH, help="비교/저장할 기준 결과 JSON 경로")
+    arg_parser.add_argument('--save', action='store_true', help="현재 결과를 기준으로 저장")
+    arg_parser.add_argument('--threshold', type=float, default=0.15, help="느려짐으로 볼 비율 (기본 0.15 = 15%%)")
+    arg_parser.add_argument('--fail-on-regression', action='store_true', help="느려진 항목이 있으면 종료 코드 1")
+    args = arg_parser.parse_args()
+
+    current = run(args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"파서: {available_parsers()} | 픽스처 {len(current['meta']['fixtures'])}개 | 반복 {args.repeat}회")
+    report(current, baseline)
+
+    regressions = compare(current, baseline, args.threshold) if baseline else []
+    if baseline:
+        print(f"\n기준 ({baseline['meta']['created_at']}) 대비 {args.threshold:.0%} 넘게 느려진 항목: {len(regressions)}개")
+        for line in regressions:
+            print(f"   [WARN] {line}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 결과 저장: {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
@@ -0,0 +1,126 @@
+"""
+테스트 공용 픽스처
+
+    standin         naver_standin.py 대역 서버를 띄우고 NAVER_BASE_URL을 바꾸는 함수
+                    standin(**옵션) -> StandinServer (테스트가 끝나면 서버를 멈추고 주소 복원)
+    cache           디스크 계층 없는 메모리 ResponseCache
+    make_analyzer   메모리 캐시를 쓰는 GeminiAnalyzer를 만드는 함수
+    mock_transport  현재 이벤트 루프의 Gemini 공유 클라이언트를 httpx.MockTransport로 바꾸는 코루틴 함수
+    app_state       main 모듈 - 응답 캐시를 비우고 이력 없이 새 스크래퍼/종목 목록으로 동작 (끝나면 복원)
+
+테스트 파일의 __main__ 실행부는 pytest 없이 같은 값을 쓰도록 standin_servers(), memory_cache(),
+new_analyzer(), use_mock_transport(), fresh_app_state()를 직접 가져다 씁니다.
+"""
+
+import contextlib
+from typing import Callable, Optional
+
+import httpx
+import pytest
+
+import gemini_analyzer
+import http_session
+from gemini_analyzer import GEMINI_MODEL, GeminiAnalyzer
+from http_session import create_session
+from naver_scraper_trading import TradingStrategyScraper
+from naver_standin import StandinServer
+from response_cache import ResponseCache
+from stock_universe import StockUniverse
+
+
+@contextlib.contextmanager
+def standin_servers():
+    """standin(**옵션)으로 대역 서버를 띄우고, 블록이 끝나면 모두 멈춘 뒤 NAVER_BASE_URL을 복원합니다."""
+    original = http_session.NAVER_BASE_URL
+    servers = []
+
+    def start(**options) -> StandinServer:
+        server = StandinServer(port=0, **options).start()
+        servers.append(server)
+        http_session.NAVER_BASE_URL = server.url
+        return server
+
+    try:
+        yield start
+    finally:
+        http_session.NAVER_BASE_URL = original
+        for server in servers:
+            server.stop()
+
+
+def memory_cache(max_entries: int = 64) -> ResponseCache:
+    """필드별 TTL 없이 60초 동안 유지하는 메모리 전용 캐시"""
+    return ResponseCache(max_entries=max_entries, field_ttls={}, default_ttl=60, disk_path=None)
+
+
+def new_analyzer(key: str = 'test-key', model: str = GEMINI_MODEL, cache: Optional[ResponseCache] = None,
+                 generate_json: Optional[Callable] = None) -> GeminiAnalyzer:
+    """
+    Args:
+        key: API 키 (키별 동시 실행 제한 확인용)
+        model: 모델 이름
+        cache: 결과 캐시 (None이면 새 메모리 캐시)
+        generate_json: API 호출 대신 쓸 함수 (prompt, timeout) -> 응답
+    """
+    analyzer = GeminiAnalyzer(key, model=model, cache=cache if cache is not None else memory_cache())
+    if generate_json is not None:
+        analyzer.generate_json = generate_json
+    return analyzer
+
+
+async def use_mock_transport(handler, concurrency: int = 2):
+    """현재 이벤트 루프의 공유 클라이언트를 MockTransport로 바꾸고 키별 제한을 concurrency개, 초당 제한 없음으로 초기화합니다."""
+    state = gemini_analyzer._async_state()
+    await state.client.aclose()
+    state.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    state.limiters.clear()
+    state.concurrency = concurrency
+    state.requests_per_second = 0
+    return state
+
+
+@contextlib.contextmanager
+def fresh_app_state():
+    """
+    main의 응답 캐시를 비우고, 이력 저장 없이 새 스크래퍼와 종목 목록으로 매번 스크래핑하게 합니다.
+    (다른 테스트가 바꿔 둔 fetch_page나 이력에 남은 결과의 영향을 받지 않음)
+    """
+    import main
+
+    original = (main.history_store, main.trading_scraper, main.stock_universe)
+    main.history_store = None
+    main.trading_scraper = TradingStrategyScraper(session=create_session(max_retries=0))
+    main.stock_universe = StockUniverse(requests_per_second=None, session=create_session(max_retries=0))
+    main.response_cache.clear()
+    try:
+        yield main
+    finally:
+        main.history_store, main.trading_scraper, main.stock_universe = original
+        main.response_cache.clear()
+
+
+@pytest.fixture
+def standin():
+    with standin_servers() as start:
+        yield start
+
+
+@pytest.fixture
+def cache():
+    return memory_cache()
+
+
+@pytest.fixture
+def make_analyzer():
+    return new_analyzer
+
+
+@pytest.fixture
+def mock_transport():
+    return use_mock_transport
+
+
+@pytest.fixture
+def app_state():
+    with fresh_app_state() as main:
+        yield main
@@ -0,0 +1,199 @@
+"""
+종목 페이지 필드 정규식 레지스트리와 스캐너
+
+TradingStrategyScraper의 extract_* 메서드와 SinglePassExtractor가 쓰는 필드 정규식을
+한곳에 모아 미리 컴파일해 둡니다. 텍스트 블록 하나(예: 시세 dd.blind, 52주 최고/최저 블록)에
+필요한 필드 패턴들을 묶음(PatternGroup)으로 등록하고, PatternScanner.scan()이 묶음 전체를
+한 번에 적용합니다.
+
+- 블록 키워드가 없으면 정규식을 실행하지 않음 (예: '52주최고'와 '최저')
+- 패턴마다 리터럴 키워드가 텍스트에 없으면 검색 생략
+- 필드별 검사/일치 횟수와 정규식 실행 시간을 누적 (stats())
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class FieldPattern:
+    """필드 하나(또는 캡처 그룹 여러 개)를 추출하는 컴파일된 정규식"""
+
+    __slots__ = ('fields', 'regex', 'keyword', 'requires')
+
+    def __init__(self, fields: Union[str, Sequence[str]], pattern: str,
+                 keyword: Optional[str] = None, requires: Optional[str] = None):
+        """
+        Args:
+            fields: 캡처 그룹 1, 2, ...에 대응하는 필드 이름
+            pattern: 정규식
+            keyword: 텍스트에 있어야 검색하는 리터럴 (없으면 항상 검색)
+            requires: 같은 묶음에서 이 필드가 먼저 일치해야 검색
+        """
+        self.fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        self.regex = re.compile(pattern)
+        self.keyword = keyword
+        self.requires = requires
+
+
+class PatternGroup:
+    """같은 텍스트 블록에 함께 적용하는 필드 패턴 묶음"""
+
+    __slots__ = ('name', 'patterns', 'keywords', 'normalize')
+
+    def __init__(self, name: str, patterns: Sequence[FieldPattern],
+                 keywords: Sequence[str] = (), normalize: bool = False):
+        """
+        Args:
+            name: 묶음 이름
+            patterns: 적용 순서대로의 필드 패턴
+            keywords: 텍스트에 모두 있어야 스캔하는 키워드
+            normalize: 스캔 전에 연속 공백을 공백 하나로 바꿀지 여부
+        """
+        self.name = name
+        self.patterns = tuple(patterns)
+        self.keywords = tuple(keywords)
+        self.normalize = normalize
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(field for pattern in self.patterns for field in pattern.fields)
+
+
+def _price(field: str, label: str) -> FieldPattern:
+    return FieldPattern(field, label + r'\s*([\d,]+)', keyword=label)
+
+
+PATTERN_GROUPS = {group.name: group for group in (
+    # 시세 영역 dd.blind 텍스트
+    PatternGroup('blind_price', (
+        _price('prev_close', '전일가'),
+        _price('opening_price', '시가'),
+        _price('high_price', '고가'),
+        _price('low_price', '저가'),
+        _price('upper_limit', '상한가'),
+        _price('lower_limit', '하한가'),
+    )),
+    PatternGroup('blind_trading', (
+        _price('volume', '거래량'),
+        _price('trading_value', '거래대금'),
+    )),
+    # "52주최고 l 최저 168,500l52,500"
+    PatternGroup('week52', (
+        FieldPattern(('high_52w', 'low_52w'), r'52주최고\s*[l|]\s*최저\s*([\d,]+)[l|]([\d,]+)'),
+    ), keywords=('52주최고', '최저'), normalize=True),
+    # "투자의견 4.00매수 목표주가 214,125원" - 점수/의견은 목표주가가 있을 때만
+    PatternGroup('opinion', (
+        FieldPattern('target_price', r'투자의견\s*[\d.가-힣]*\s*목표주가\s*([\d,]+)원?'),
+        FieldPattern(('opinion_score', 'opinion'), r'([\d.]+)\s*([가-힣]+)', requires='target_price'),
+    ), keywords=('투자의견', '목표주가'), normalize=True),
+    # 투자지표 표의 첫 번째 td ("34.84배4,816원", "1.23%")
+    PatternGroup('per_cell', (
+        FieldPattern('per', r'([\d.]+)배', keyword='배'),
+        FieldPattern('eps', r'([\d,]+)원', keyword='원'),
+    )),
+    PatternGroup('per_industry_cell', (
+        FieldPattern('per_industry', r'([\d.]+)배', keyword='배'),
+    )),
+    PatternGroup('pbr_cell', (
+        FieldPattern('pbr', r'([\d.]+)배', keyword='배'),
+        FieldPattern('bps', r'([\d,]+)원', keyword='원'),
+    )),
+    PatternGroup('dividend_cell', (
+        FieldPattern('dividend_yield', r'([\d.]+)%', keyword='%'),
+    )),
+)}
+
+
+class PatternScanner:
+    """등록된 패턴 묶음을 텍스트 블록에 적용하고 필드별 통계를 누적합니다."""
+
+    def __init__(self, groups: Dict[str, PatternGroup] = PATTERN_GROUPS):
+        self.groups = groups
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def has_keywords(self, group_name: str, text: str) -> bool:
+        """묶음 키워드가 텍스트에 모두 있는지 확인합니다."""
+        return all(keyword in text for keyword in self.groups[group_name].keywords)
+
+    def scan(self, group_name: str, text: str) -> Dict[str, str]:
+        """
+        묶음의 모든 필드 패턴을 텍스트에 적용합니다.
+
+        Args:
+            group_name: PATTERN_GROUPS의 묶음 이름
+            text: 텍스트 블록
+
+        Returns:
+            일치한 필드 -> 값 (키워드가 없거나 일치하는 필드가 없으면 빈 딕셔너리)
+        """
+        group = self.groups[group_name]
+        if not all(keyword in text for keyword in group.keywords):
+            return {}
+        if group.normalize:
+            text = _WHITESPACE.sub(' ', text)
+
+        found: Dict[str, str] = {}
+        timings = []
+        for pattern in group.patterns:
+            if pattern.requires and pattern.requires not in found:
+                continue
+            if pattern.keyword and pattern.keyword not in text:
+                timings.append((pattern, 0, False))
+                continue
+            start = time.perf_counter_ns()
+            match = pattern.regex.search(text)
+            timings.append((pattern, time.perf_counter_ns() - start, match is not None))
+            if match:
+                for index, field in enumerate(pattern.fields, 1):
+                    found[field] = match.group(index)
+
+        self._record(group_name, timings)
+        return found
+
+    def stats(self) -> Dict:
+        """필드별/묶음별 누적 통계"""
+        with self._lock:
+            fields = {
+                field: {
+                    'scans': scans,
+                    'matches': matches,
+                    'match_rate': round(matches / scans, 4) if scans else 0.0,
+                    'total_ms': round(elapsed / 1e6, 3),
+                    'avg_us': round(elapsed / scans / 1e3, 2) if scans else 0.0,
+                }
+                for field, (scans, matches, elapsed) in self._field_stats.items()
+            }
+            groups = {
+                name: {'scans': scans, 'total_ms': round(elapsed / 1e6, 3)}
+                for name, (scans, elapsed) in self._group_stats.items()
+            }
+        return {'fields': fields, 'groups': groups}
+
+    def reset_stats(self):
+        with self._lock:
+            self._field_stats = {
+                field: [0, 0, 0] for group in self.groups.values() for field in group.fields
+            }
+            self._group_stats = {name: [0, 0] for name in self.groups}
+
+    def _record(self, group_name: str, timings: Iterable[Tuple[FieldPattern, int, bool]]):
+        with self._lock:
+            group_stats = self._group_stats[group_name]
+            group_stats[0] += 1
+            for pattern, elapsed, matched in timings:
+                group_stats[1] += elapsed
+                for field in pattern.fields:
+                    field_stats = self._field_stats[field]
+                    field_stats[0] += 1
+                    field_stats[1] += matched
+                    field_stats[2] += elapsed
+
+
+# 모든 스크래퍼가 공유하는 기본 스캐너
+scanner = PatternScanner()
@@ -1,10 +1,185 @@
 import requests
+import asyncio
+import hashlib
 import json
+import os
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import httpx
+from async_scrape_engine import TokenBucket
+from response_cache import ResponseCache
+from stock_record import StockRecord
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+# Gemini 모델 이름 (API URL과 캐시 키에 사용)
+GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash')
+
+# 전략 분석 결과 캐시 설정 (같은 입력이면 API를 다시 호출하지 않음)
+#   GEMINI_CACHE_TTL          결과 유지 시간 초 (기본 3600)
+#   GEMINI_CACHE_MAX_ENTRIES  메모리 캐시 최대 항목 수 (기본 512)
+#   GEMINI_CACHE_DB           디스크 계층 SQLite 파일 경로 (없으면 사용 안 함)
+GEMINI_CACHE_TTL = float(os.environ.get('GEMINI_CACHE_TTL', '3600'))
+GEMINI_CACHE_MAX_ENTRIES = int(os.environ.get('GEMINI_CACHE_MAX_ENTRIES', '512'))
+GEMINI_CACHE_DB = os.environ.get('GEMINI_CACHE_DB') or None
+
+# 여러 종목 일괄 분석 시 프롬프트 하나에 넣을 종목 수
+GEMINI_BATCH_SIZE = int(os.environ.get('GEMINI_BATCH_SIZE', '10'))
+
+# 전략 분석 응답에 반드시 있어야 하는 필드
+STRATEGY_FIELDS = ('strategic_recommendation', 'strategic_solution')
+
+# 분석 실패 시 돌려주는 안내 문구 (캐시하지 않음)
+FALLBACK_STRATEGY = {
+    "strategic_recommendation": "분석 오류가 발생했습니다.",
+    "strategic_solution": "API 키를 확인하거나 나중에 다시 시도해주세요."
+}
+
+# 비동기 클라이언트 설정 (API 키마다 따로 적용)
+#   GEMINI_KEY_CONCURRENCY          키당 동시 요청 수 (기본 4)
+#   GEMINI_KEY_REQUESTS_PER_SECOND  키당 초당 요청 수 (기본 2, 0이면 제한 없음)
+#   GEMINI_DEADLINE                 대기 시간을 포함한 요청 하나의 최대 시간 초 (기본 30)
+#   GEMINI_MAX_CONNECTIONS          공유 연결 풀 크기 (기본 20)
+#   GEMINI_MAX_KEY_LIMITERS         이벤트 루프당 보관할 키별 제한 수 (기본 256, 오래 안 쓴 키부터 버림)
+GEMINI_KEY_CONCURRENCY = int(os.environ.get('GEMINI_KEY_CONCURRENCY', '4'))
+GEMINI_KEY_REQUESTS_PER_SECOND = float(os.environ.get('GEMINI_KEY_REQUESTS_PER_SECOND', '2'))
+GEMINI_DEADLINE = float(os.environ.get('GEMINI_DEADLINE', '30'))
+GEMINI_MAX_CONNECTIONS = int(os.environ.get('GEMINI_MAX_CONNECTIONS', '20'))
+GEMINI_MAX_KEY_LIMITERS = int(os.environ.get('GEMINI_MAX_KEY_LIMITERS', '256'))
+
+# 프롬프트에 들어가는 종목 필드 (이 값들이 같으면 같은 분석 결과를 재사용)
+PROMPT_FIELDS = (
+    'name', 'ticker', 'current_price', 'per', 'per_industry', 'pbr', 'roe', 'debt_ratio',
+    'opinion', 'target_price', 'high_52w', 'low_52w', 'market_cap', 'sector',
+)
+
+# 모든 GeminiAnalyzer 인스턴스가 공유하는 결과 캐시 (필드별 TTL 없이 전체 TTL 하나)
+strategy_cache = ResponseCache(
+    max_entries=GEMINI_CACHE_MAX_ENTRIES,
+    field_ttls={},
+    default_ttl=GEMINI_CACHE_TTL,
+    disk_path=GEMINI_CACHE_DB,
+)
+
+
+def prompt_fingerprint(stock_info: Dict, model: str = GEMINI_MODEL) -> str:
+    """프롬프트에 쓰이는 필드와 모델 이름의 해시 (결과 캐시 키)"""
+    payload = {
+        'model': model,
+        'fields': {field: str(stock_info.get(field)) for field in PROMPT_FIELDS},
+    }
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return f"gemini:{digest}"
+
+
+def generation_text(result: Dict) -> str:
+    """
+    generateContent 응답(또는 스트리밍 조각 하나)에서 텍스트를 꺼냅니다.
+
+    Raises:
+        Exception: 응답 형식 오류
+    """
+    try:
+        return result['candidates'][0]['content']['parts'][0]['text']
+    except (KeyError, IndexError, TypeError):
+        raise Exception("Invalid API response format")
+
+
+def parse_answer(content: str):
+    """응답 텍스트를 JSON으로 파싱합니다. (```json 코드 블록 허용)"""
+    content = content.strip()
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+
+    return json.loads(content)
+
+
+def parse_generation(result: Dict):
+    """
+    generateContent 응답에서 텍스트를 꺼내 JSON으로 파싱합니다.
+
+    Raises:
+        Exception: 응답 형식 오류, JSON 파싱 실패
+    """
+    return parse_answer(generation_text(result))
+
+
+class GeminiAPIError(Exception):
+    """API 호출 자체의 실패 (오류 상태 코드, 연결 실패, 기한 초과) - 응답 형식 오류와 구분"""
+
+
+class KeyLimiter:
+    """API 키 하나의 동시 요청 수와 초당 요청 수 제한"""
+
+    def __init__(self, concurrency: int = GEMINI_KEY_CONCURRENCY,
+                 requests_per_second: float = GEMINI_KEY_REQUESTS_PER_SECOND):
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.bucket = TokenBucket(requests_per_second)
+
+
+class _AsyncState:
+    """이벤트 루프 하나에서 공유하는 HTTP 연결 풀과 키별 제한"""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(GEMINI_DEADLINE),
+            limits=httpx.Limits(max_connections=GEMINI_MAX_CONNECTIONS,
+                                max_keepalive_connections=GEMINI_MAX_CONNECTIONS),
+            headers={'Content-Type': 'application/json'},
+        )
+        self.concurrency = GEMINI_KEY_CONCURRENCY
+        self.requests_per_second = GEMINI_KEY_REQUESTS_PER_SECOND
+        # 키 원문 대신 해시로 보관 (요청마다 다른 키가 와도 GEMINI_MAX_KEY_LIMITERS개까지만, LRU)
+        self.limiters: 'OrderedDict[str, KeyLimiter]' = OrderedDict()
+
+    def limiter_for(self, api_key: str) -> KeyLimiter:
+        key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limiter = self.limiters[key] = KeyLimiter(self.concurrency, self.requests_per_second)
+            while len(self.limiters) > max(1, GEMINI_MAX_KEY_LIMITERS):
+                self.limiters.popitem(last=False)
+        else:
+            self.limiters.move_to_end(key)
+        return limiter
+
+
+# asyncio 객체는 이벤트 루프에 묶이므로 루프마다 따로 보관
+_async_states: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncState]' = weakref.WeakKeyDictionary()
+
+
+def _async_state() -> _AsyncState:
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is None:
+        state = _async_states[loop] = _AsyncState()
+    return state
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 연결 풀을 닫습니다. (서버 종료 시)"""
+    state = _async_states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state.client.aclose()
+
 
 class GeminiAnalyzer:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, model: str = GEMINI_MODEL, cache: Optional[ResponseCache] = strategy_cache):
+        """
+        Args:
+            api_key: Gemini API 키
+            model: 모델 이름
+            cache: 전략 분석 결과 캐시 (None이면 매번 API 호출)
+        """
         self.api_key = api_key
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}"
+        self.model = model
+        self.cache = cache
+        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
 
     def test_connection(self):
         """테스트를 위해 간단한 요청을 보냅니다."""
@@ -22,25 +197,15 @@ class GeminiAnalyzer:
                 return True if result.get('candidates') else False
             return False
         except Exception as e:
-            print(f"[ERROR] Gemini API Test failed: {e}")
+            log.error("Gemini API test failed", extra={"error": e})
             return False
 
-    def get_strategy(self, stock_info: dict):
-        """종목 정보를 바탕으로 매매 전략과 솔루션을 제안합니다."""
-        prompt = f"""
+    def build_prompt(self, stock_info: Dict) -> str:
+        """종목 정보로 전략 분석 프롬프트를 만듭니다."""
+        return f"""
         당신은 전문 주식 분석가입니다. 다음 주식 데이터를 분석하여 투자자에게 도움이 되는 매매 전략과 솔루션을 제안해주세요.
 
-        [주식 정보]
-        종목명: {stock_info.get('name')} ({stock_info.get('ticker')})
-        현재가: {stock_info.get('current_price')}
-        PER: {stock_info.get('per')} (업종: {stock_info.get('per_industry')})
-        PBR: {stock_info.get('pbr')}
-        ROE: {stock_info.get('roe')}%
-        부채비율: {stock_info.get('debt_ratio')}%
-        투자의견: {stock_info.get('opinion')} (목표가: {stock_info.get('target_price')})
-        52주 최고/최저: {stock_info.get('high_52w')} / {stock_info.get('low_52w')}
-        시가총액: {stock_info.get('market_cap')}
-        업종: {stock_info.get('sector')}
+        [주식 정보]{stock_info_lines(stock_info)}
 
         위 데이터를 바탕으로 다음 형식의 JSON으로만 답변해주세요:
         {{
@@ -49,39 +214,369 @@ class GeminiAnalyzer:
         }}
         답변은 반드시 한국어로 작성해주세요.
         """
-        
+
+    def build_batch_prompt(self, stocks: List[Dict]) -> str:
+        """여러 종목 정보를 한 프롬프트에 넣고 종목 코드별 JSON 배열 답변을 요청합니다."""
+        blocks = [f"\n        [{stock_info.get('ticker')}]{stock_info_lines(stock_info)}" for stock_info in stocks]
+
+        return f"""
+        당신은 전문 주식 분석가입니다. 다음 {len(stocks)}개 주식 데이터를 종목별로 각각 분석하여 투자자에게 도움이 되는 매매 전략과 솔루션을 제안해주세요.
+
+        [주식 정보]{''.join(blocks)}
+
+        위 데이터를 바탕으로 종목마다 항목 하나씩, 다음 형식의 JSON 배열로만 답변해주세요:
+        [
+            {{
+                "ticker": "종목 코드",
+                "strategic_recommendation": "현재 상황에 대한 핵심 요약 및 매매 권고 (예: 분할 매수, 관망, 매도 등)",
+                "strategic_solution": "구체적인 대응 전략 (예: 손절가, 익절가 제안 또는 리스크 관리 방법)"
+            }}
+        ]
+        답변은 반드시 한국어로 작성해주세요.
+        """
+
+    def request_body(self, prompt: str) -> Dict:
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }]
+        }
+
+    def generate_json(self, prompt: str, timeout: float = 30):
+        """
+        프롬프트를 보내고 응답 텍스트를 JSON으로 파싱해 반환합니다.
+
+        Raises:
+            GeminiAPIError: API 오류 (429, 할당량 초과, 잘못된 키 등), 연결 실패, 시간 초과
+            Exception: 응답 형식 오류, JSON 파싱 실패
+        """
+        headers = {'Content-Type': 'application/json'}
         try:
-            headers = {'Content-Type': 'application/json'}
-            data = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }]
-            }
-            
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
-            
+            response = requests.post(self.api_url, headers=headers, json=self.request_body(prompt), timeout=timeout)
+        except requests.RequestException as e:
+            raise GeminiAPIError(f"API request failed: {e}") from e
+
+        if response.status_code != 200:
+            log.error("Gemini API error", extra={"status": response.status_code, "body": response.text})
+            raise GeminiAPIError(f"API Error: {response.status_code}")
+
+        return parse_generation(response.json())
+
+    async def agenerate_json(self, prompt: str, deadline: float = GEMINI_DEADLINE):
+        """
+        generate_json의 비동기 버전 (공유 연결 풀, API 키별 동시 요청/초당 요청 제한)
+
+        키 제한을 기다리는 시간까지 포함해 deadline초가 지나면 요청을 취소합니다.
+        호출한 쪽이 취소되면(클라이언트 연결 끊김 등) 진행 중인 HTTP 요청도 함께 취소됩니다.
+
+        Raises:
+            GeminiAPIError: API 오류, 연결 실패, 기한 초과
+            Exception: 응답 형식 오류, JSON 파싱 실패
+        """
+        state = _async_state()
+        limiter = state.limiter_for(self.api_key)
+
+        async def call():
+            async with limiter.semaphore:
+                await limiter.bucket.acquire()
+                try:
+                    response = await state.client.post(self.api_url, json=self.request_body(prompt))
+                except httpx.HTTPError as e:
+                    raise GeminiAPIError(f"API request failed: {e}") from e
             if response.status_code != 200:
-                print(f"[ERROR] API Error: {response.text}")
-                raise Exception(f"API Error: {response.status_code}")
-                
-            result = response.json()
-            # 텍스트 추출
+                log.error("Gemini API error", extra={"status": response.status_code, "body": response.text})
+                raise GeminiAPIError(f"API Error: {response.status_code}")
+            return parse_generation(response.json())
+
+        try:
+            return await asyncio.wait_for(call(), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise GeminiAPIError(f"Gemini request exceeded the {deadline:g}s deadline")
+
+    async def astream_text(self, prompt: str, deadline: float = GEMINI_DEADLINE) -> AsyncIterator[str]:
+        """
+        streamGenerateContent(SSE)로 생성되는 텍스트 조각을 받는 대로 내보냅니다.
+
+        agenerate_json과 같은 API 키별 제한을 따르며, 스트림이 끝날 때까지 동시 요청 한 자리를
+        차지합니다. 대기 시간을 포함해 deadline초가 지나면 요청을 취소합니다.
+
+        Raises:
+            GeminiAPIError: API 오류, 기한 초과
+        """
+        state = _async_state()
+        limiter = state.limiter_for(self.api_key)
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline
+
+        def remaining():
+            return max(0.0, expires - loop.time())
+
+        try:
+            await asyncio.wait_for(limiter.semaphore.acquire(), remaining())
             try:
-                content = result['candidates'][0]['content']['parts'][0]['text'].strip()
-            exceptKeyError:
-                raise Exception("Invalid API response format")
-
-            # JSON 파싱
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(content)
-            
+                await asyncio.wait_for(limiter.bucket.acquire(), remaining())
+                async with state.client.stream('POST', self.stream_url, json=self.request_body(prompt)) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode('utf-8', 'replace')
+                        log.error("Gemini API error", extra={"status": response.status_code, "body": body})
+                        raise GeminiAPIError(f"API Error: {response.status_code}")
+
+                    lines = response.aiter_lines()
+                    while True:
+                        try:
+                            line = await asyncio.wait_for(lines.__anext__(), remaining())
+                        except StopAsyncIteration:
+                            break
+                        if not line.startswith('data:'):
+                            continue
+                        # 마지막 조각은 텍스트 없이 finishReason만 있을 수 있음
+                        try:
+                            text = generation_text(json.loads(line[5:]))
+                        except Exception:
+                            continue
+                        if text:
+                            yield text
+            finally:
+                limiter.semaphore.release()
+        except asyncio.TimeoutError:
+            raise GeminiAPIError(f"Gemini request exceeded the {deadline:g}s deadline")
+
+    async def astream_strategy(self, stock_info, deadline: float = GEMINI_DEADLINE) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        전략 분석을 스트리밍합니다.
+
+        Returns:
+            (이벤트, 데이터)를 차례로 내보내는 비동기 반복자
+                ('delta', {'text': 조각})   생성 중인 텍스트
+                ('error', {'error': 메시지}) 실패 (이후 안내 문구 result)
+                ('result', 전략 분석 결과)   마지막에 한 번, 전체 텍스트를 JSON으로 파싱한 결과
+            캐시에 있으면 result만 내보냅니다.
+        """
+        if isinstance(stock_info, StockRecord):
+            stock_info = stock_info.to_dict()
+
+        cached = self.cached_strategy(stock_info)
+        if cached is not None:
+            yield 'result', cached
+            return
+
+        parts = []
+        try:
+            async for text in self.astream_text(self.build_prompt(stock_info), deadline=deadline):
+                parts.append(text)
+                yield 'delta', {'text': text}
+            strategy = parse_answer(''.join(parts))
         except Exception as e:
-            print(f"[ERROR] Gemini Analysis failed: {e}")
-            return {
-                "strategic_recommendation": "분석 오류가 발생했습니다.",
-                "strategic_solution": "API 키를 확인하거나 나중에 다시 시도해주세요."
-            }
+            log.error("Gemini analysis failed", extra={"ticker": stock_info.get('ticker'), "error": e})
+            yield 'error', {'error': str(e)}
+            yield 'result', dict(FALLBACK_STRATEGY)
+            return
+
+        self.remember_strategy(stock_info, strategy)
+        yield 'result', strategy
+
+    def cached_strategy(self, stock_info: Dict) -> Optional[Dict]:
+        if self.cache is None:
+            return None
+        return self.cache.get(prompt_fingerprint(stock_info, self.model))
+
+    def remember_strategy(self, stock_info: Dict, strategy) -> None:
+        # 오류 안내 문구는 저장하지 않고, 정상 응답만 캐시
+        if self.cache is not None and isinstance(strategy, dict):
+            self.cache.set(prompt_fingerprint(stock_info, self.model), strategy)
+
+    def get_strategy(self, stock_info):
+        """
+        종목 정보(딕셔너리 또는 StockRecord)를 바탕으로 매매 전략과 솔루션을 제안합니다.
+        프롬프트 필드와 모델이 같은 이전 결과가 캐시에 있으면 API를 호출하지 않습니다.
+        """
+        if isinstance(stock_info, StockRecord):
+            stock_info = stock_info.to_dict()
+
+        cached = self.cached_strategy(stock_info)
+        if cached is not None:
+            return cached
+
+        try:
+            strategy = self.generate_json(self.build_prompt(stock_info))
+        except Exception as e:
+            log.error("Gemini analysis failed", extra={"ticker": stock_info.get('ticker'), "error": e})
+            return dict(FALLBACK_STRATEGY)
+
+        self.remember_strategy(stock_info, strategy)
+        return strategy
+
+    async def aget_strategy(self, stock_info, deadline: float = GEMINI_DEADLINE):
+        """get_strategy의 비동기 버전 (작업자 스레드를 점유하지 않음)"""
+        if isinstance(stock_info, StockRecord):
+            stock_info = stock_info.to_dict()
+
+        cached = self.cached_strategy(stock_info)
+        if cached is not None:
+            return cached
+
+        try:
+            strategy = await self.agenerate_json(self.build_prompt(stock_info), deadline=deadline)
+        except Exception as e:
+            log.error("Gemini analysis failed", extra={"ticker": stock_info.get('ticker'), "error": e})
+            return dict(FALLBACK_STRATEGY)
+
+        self.remember_strategy(stock_info, strategy)
+        return strategy
+
+    def plan_batches(self, stocks: Iterable, batch_size: int) -> Tuple[Dict[str, Dict], Dict[str, Dict], List[List[str]]]:
+        """
+        일괄 분석할 종목을 정리합니다.
+
+        Returns:
+            (종목 코드 -> 종목 정보, 캐시에 있던 결과, batch_size개씩 나눈 나머지 종목 코드)
+        """
+        infos = {}
+        for stock_info in stocks:
+            if isinstance(stock_info, StockRecord):
+                stock_info = stock_info.to_dict()
+            infos.setdefault(str(stock_info.get('ticker')), stock_info)
+
+        results: Dict[str, Dict] = {}
+        pending = []
+        for ticker, stock_info in infos.items():
+            cached = self.cached_strategy(stock_info)
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                pending.append(ticker)
+
+        batch_size = max(1, int(batch_size))
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        return infos, results, chunks
+
+    def accept_batch(self, chunk: List[str], answer, infos: Dict[str, Dict], results: Dict[str, Dict]) -> List[str]:
+        """일괄 응답의 올바른 항목을 결과와 캐시에 넣고, 다시 분석할 종목 코드를 반환합니다."""
+        valid = parse_batch_answer(answer, chunk)
+        fallback = []
+        for ticker in chunk:
+            if ticker in valid:
+                results[ticker] = valid[ticker]
+                self.remember_strategy(infos[ticker], valid[ticker])
+            else:
+                fallback.append(ticker)
+        return fallback
+
+    def reject_batch(self, chunk: List[str], error: Exception, results: Dict[str, Dict]) -> List[str]:
+        """
+        API 호출이 실패한 묶음(429, 할당량 초과, 잘못된 키, 기한 초과 등)은 종목별로 다시 보내도
+        같은 오류가 나므로 전체를 안내 문구로 채웁니다. (다시 분석할 종목 없음)
+        """
+        log.error("Gemini batch request failed", extra={"stocks": len(chunk), "error": error})
+        for ticker in chunk:
+            results[ticker] = dict(FALLBACK_STRATEGY)
+        return []
+
+    def get_strategies(self, stocks: Iterable, batch_size: int = GEMINI_BATCH_SIZE) -> Dict[str, Dict]:
+        """
+        여러 종목의 매매 전략을 batch_size개씩 한 번의 API 호출로 분석합니다.
+
+        캐시에 있는 종목은 호출하지 않고, 일괄 응답을 읽을 수 없거나 응답에서 빠졌거나 형식이
+        잘못된 종목만 get_strategy()로 하나씩 다시 분석합니다. API 호출이 실패한 묶음은
+        다시 요청하지 않고 안내 문구(FALLBACK_STRATEGY)로 채웁니다.
+
+        Args:
+            stocks: 종목 정보(딕셔너리 또는 StockRecord) 목록, 각각 'ticker' 필요
+            batch_size: 프롬프트 하나에 넣을 종목 수
+
+        Returns:
+            종목 코드 -> 전략 분석 결과 (입력 순서)
+        """
+        infos, results, chunks = self.plan_batches(stocks, batch_size)
+
+        fallback = []
+        for chunk in chunks:
+            try:
+                answer = self.generate_json(self.build_batch_prompt([infos[ticker] for ticker in chunk]), timeout=60)
+            except GeminiAPIError as e:
+                fallback += self.reject_batch(chunk, e, results)
+                continue
+            except Exception as e:
+                log.error("Gemini batch answer unreadable", extra={"stocks": len(chunk), "error": e})
+                answer = []
+            fallback += self.accept_batch(chunk, answer, infos, results)
+
+        if fallback:
+            log.warning("Gemini batch entries malformed, analyzing one by one", extra={"stocks": len(fallback)})
+        for ticker in fallback:
+            results[ticker] = self.get_strategy(infos[ticker])
+
+        return {ticker: results[ticker] for ticker in infos}
+
+    async def aget_strategies(self, stocks: Iterable, batch_size: int = GEMINI_BATCH_SIZE,
+                              deadline: float = 2 * GEMINI_DEADLINE) -> Dict[str, Dict]:
+        """
+        get_strategies의 비동기 버전
+
+        묶음 요청과 재분석 요청을 동시에 보내고, 동시 실행 수는 API 키별 제한을 따릅니다.
+        """
+        infos, results, chunks = self.plan_batches(stocks, batch_size)
+
+        async def run_chunk(chunk):
+            try:
+                answer = await self.agenerate_json(self.build_batch_prompt([infos[ticker] for ticker in chunk]),
+                                                   deadline=deadline)
+            except GeminiAPIError as e:
+                return self.reject_batch(chunk, e, results)
+            except Exception as e:
+                log.error("Gemini batch answer unreadable", extra={"stocks": len(chunk), "error": e})
+                answer = []
+            return self.accept_batch(chunk, answer, infos, results)
+
+        fallback = [ticker for tickers in await asyncio.gather(*(run_chunk(c) for c in chunks)) for ticker in tickers]
+
+        if fallback:
+            log.warning("Gemini batch entries malformed, analyzing one by one", extra={"stocks": len(fallback)})
+        retried = await asyncio.gather(*(self.aget_strategy(infos[ticker]) for ticker in fallback))
+        results.update(zip(fallback, retried))
+
+        return {ticker: results[ticker] for ticker in infos}
+
+
+def stock_info_lines(stock_info: Dict) -> str:
+    """프롬프트의 종목 정보 줄 (build_prompt와 build_batch_prompt가 함께 사용, PROMPT_FIELDS와 맞춰 둘 것)"""
+    return f"""
+        종목명: {stock_info.get('name')} ({stock_info.get('ticker')})
+        현재가: {stock_info.get('current_price')}
+        PER: {stock_info.get('per')} (업종: {stock_info.get('per_industry')})
+        PBR: {stock_info.get('pbr')}
+        ROE: {stock_info.get('roe')}%
+        부채비율: {stock_info.get('debt_ratio')}%
+        투자의견: {stock_info.get('opinion')} (목표가: {stock_info.get('target_price')})
+        52주 최고/최저: {stock_info.get('high_52w')} / {stock_info.get('low_52w')}
+        시가총액: {stock_info.get('market_cap')}
+        업종: {stock_info.get('sector')}"""
+
+
+def parse_batch_answer(answer, tickers: List[str]) -> Dict[str, Dict]:
+    """
+    일괄 분석 응답에서 형식이 올바른 종목 결과만 골라냅니다.
+
+    Args:
+        answer: 파싱된 응답 (종목별 객체의 배열, 또는 종목 코드 -> 객체)
+        tickers: 요청한 종목 코드
+
+    Returns:
+        종목 코드 -> {'strategic_recommendation', 'strategic_solution'}
+    """
+    if isinstance(answer, dict):
+        answer = [dict(entry, ticker=ticker) for ticker, entry in answer.items() if isinstance(entry, dict)]
+    if not isinstance(answer, list):
+        return {}
+
+    wanted = set(tickers)
+    valid = {}
+    for entry in answer:
+        if not isinstance(entry, dict):
+            continue
+        ticker = str(entry.get('ticker', '')).strip()
+        if ticker not in wanted or ticker in valid:
+            continue
+        if all(isinstance(entry.get(field), str) and entry[field].strip() for field in STRATEGY_FIELDS):
+            valid[ticker] = {field: entry[field] for field in STRATEGY_FIELDS}
+    return valid
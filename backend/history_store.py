@@ -0,0 +1,173 @@
+"""
+종목별 스크래핑 이력 저장소
+
+TradingStrategyScraper.get_complete_trading_info가 성공할 때마다 결과를 SQLite에
+(ticker, scraped_at) 인덱스로 쌓아 두고, /api/history/{ticker}가 종목 하나의 시계열을
+인덱스 범위 조회로 바로 돌려줍니다. 서버를 다시 시작해도 최근 결과가 남아 있어
+같은 종목을 다시 볼 때 네이버에 요청하지 않아도 됩니다.
+
+- 오류 응답은 저장하지 않음
+- WAL 모드 (조회가 쓰기를 기다리지 않음)
+- 파일을 열 수 없는 환경(읽기 전용 파일 시스템 등)에서는 경고 후 저장하지 않음
+
+환경 변수:
+    STOCK_HISTORY_DB        이력 SQLite 파일 경로 (없으면 사용 안 함)
+    STOCK_HISTORY_LIMIT     /api/history 기본 최대 행 수 (기본 500)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app_logging import get_logger
+
+
+log = get_logger(__name__)
+
+
+HISTORY_PATH = os.environ.get('STOCK_HISTORY_DB') or None
+HISTORY_LIMIT = int(os.environ.get('STOCK_HISTORY_LIMIT', '500'))
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def to_epoch(value: Union[str, float, datetime, None], end_of_day: bool = False) -> Optional[float]:
+    """
+    시각을 epoch 초로 바꿉니다.
+
+    Args:
+        value: 날짜 문자열 (예: "2026-10-16", "2026-10-16 09:00:00"), datetime 또는 epoch 초
+        end_of_day: 날짜만 있는 문자열이면 그날의 마지막 시각으로 해석
+
+    Raises:
+        ValueError: 날짜 형식이 아닌 경우
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    text = value.strip()
+    moment = datetime.fromisoformat(text)
+    if end_of_day and len(text) == 10:
+        moment = moment.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return moment.timestamp()
+
+
+class HistoryStore:
+    """(ticker, scraped_at) 인덱스의 스크래핑 결과 이력 (SQLite)"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:" 가능)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS trading_history ('
+            'ticker TEXT NOT NULL, scraped_at REAL NOT NULL, data TEXT NOT NULL, '
+            'PRIMARY KEY (ticker, scraped_at)) WITHOUT ROWID'
+        )
+        self._db.commit()
+
+    @classmethod
+    def open(cls, path: Optional[str] = HISTORY_PATH) -> Optional['HistoryStore']:
+        """저장소를 엽니다. 경로가 비어 있거나 열 수 없으면 None."""
+        if not path:
+            return None
+        try:
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            return cls(path)
+        except (OSError, sqlite3.Error) as e:
+            log.warning("Scrape history disabled", extra={"path": path, "error": e})
+            return None
+
+    def record(self, ticker: str, data: Dict, scraped_at: Optional[float] = None):
+        """스크래핑 결과 하나를 저장합니다. 오류 응답은 저장하지 않습니다."""
+        if not isinstance(data, dict) or 'error' in data:
+            return
+        scraped_at = time.time() if scraped_at is None else scraped_at
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO trading_history (ticker, scraped_at, data) VALUES (?, ?, ?)',
+                (ticker, scraped_at, json.dumps(data, ensure_ascii=False))
+            )
+            self._db.commit()
+
+    def latest(self, ticker: str, max_age: Optional[float] = None) -> Optional[Tuple[float, Dict]]:
+        """
+        가장 최근 결과를 반환합니다.
+
+        Args:
+            ticker: 종목 코드
+            max_age: 이 시간(초)보다 오래된 결과는 무시
+
+        Returns:
+            (scraped_at epoch 초, 결과 딕셔너리), 없으면 None
+        """
+        since = time.time() - max_age if max_age is not None else float('-inf')
+        with self._lock:
+            row = self._db.execute(
+                'SELECT scraped_at, data FROM trading_history '
+                'WHERE ticker = ? AND scraped_at >= ? ORDER BY scraped_at DESC LIMIT 1',
+                (ticker, since)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def series(self, ticker: str, fields: Optional[Iterable[str]] = None,
+               since: Union[str, float, datetime, None] = None,
+               until: Union[str, float, datetime, None] = None,
+               limit: int = HISTORY_LIMIT) -> List[Dict]:
+        """
+        종목 하나의 시계열을 시간 순서로 반환합니다.
+
+        Args:
+            ticker: 종목 코드
+            fields: 포함할 필드 (None이면 전체)
+            since: 시작 시각 (포함)
+            until: 끝 시각 (포함)
+            limit: 최대 행 수 (범위 안에서 가장 최근 것부터)
+
+        Returns:
+            [{'scraped_at': "%Y-%m-%d %H:%M:%S", 필드...}, ...]
+        """
+        since = to_epoch(since)
+        until = to_epoch(until, end_of_day=True)
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT scraped_at, data FROM trading_history '
+                'WHERE ticker = ? AND scraped_at >= ? AND scraped_at <= ? '
+                'ORDER BY scraped_at DESC LIMIT ?',
+                (ticker,
+                 since if since is not None else float('-inf'),
+                 until if until is not None else float('inf'),
+                 max(1, int(limit)))
+            ).fetchall()
+
+        fields = list(fields) if fields is not None else None
+        items = []
+        for scraped_at, text in reversed(rows):
+            data = json.loads(text)
+            if fields is not None:
+                data = {field: data.get(field, 'N/A') for field in fields}
+            items.append({'scraped_at': datetime.fromtimestamp(scraped_at).strftime(TIMESTAMP_FORMAT), **data})
+        return items
+
+    def count(self, ticker: Optional[str] = None) -> int:
+        """저장된 행 수 (ticker를 주면 그 종목만)"""
+        with self._lock:
+            if ticker is None:
+                return self._db.execute('SELECT COUNT(*) FROM trading_history').fetchone()[0]
+            return self._db.execute(
+                'SELECT COUNT(*) FROM trading_history WHERE ticker = ?', (ticker,)
+            ).fetchone()[0]
@@ -0,0 +1,160 @@
+"""
+네이버 금융 요청용 공유 HTTP 세션
+
+모든 스크래퍼와 API 엔드포인트가 하나의 requests.Session을 공유하여
+종목마다 새 TCP/TLS 연결을 맺지 않고 keep-alive 연결을 재사용합니다.
+비동기 엔드포인트는 이벤트 루프마다 하나의 httpx.AsyncClient를 공유합니다. (get_async_client)
+
+- 연결 풀 크기 제한 (스레드가 많아도 풀 크기 이상 연결하지 않음)
+- 5xx 응답, 연결 오류, 읽기 타임아웃 시 지수 백오프 재시도
+- gzip/deflate (brotli 설치 시 br 포함) 압축 응답 요청
+
+환경 변수로 설정을 바꿀 수 있습니다.
+    NAVER_HTTP_POOL_SIZE    연결 풀 크기 (기본 16)
+    NAVER_HTTP_MAX_RETRIES  최대 재시도 횟수 (기본 3)
+    NAVER_HTTP_BACKOFF      백오프 계수(초) (기본 0.5)
+    NAVER_ASYNC_MAX_CONNECTIONS  비동기 클라이언트의 최대 동시 연결 수 (기본 200)
+    NAVER_BASE_URL          네이버 금융 주소 (기본 https://finance.naver.com,
+                            부하 테스트 시 naver_standin.py 주소로 바꿔 사용)
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+
+POOL_SIZE = int(os.environ.get('NAVER_HTTP_POOL_SIZE', '16'))
+MAX_RETRIES = int(os.environ.get('NAVER_HTTP_MAX_RETRIES', '3'))
+BACKOFF_FACTOR = float(os.environ.get('NAVER_HTTP_BACKOFF', '0.5'))
+NAVER_BASE_URL = os.environ.get('NAVER_BASE_URL', 'https://finance.naver.com').rstrip('/')
+ASYNC_MAX_CONNECTIONS = int(os.environ.get('NAVER_ASYNC_MAX_CONNECTIONS', '200'))
+REQUEST_TIMEOUT = 10
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# urllib3가 디코딩할 수 있는 압축 방식만 요청 (brotli 패키지가 있으면 br 포함)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(
+    pool_size: int = POOL_SIZE,
+    max_retries: int = MAX_RETRIES,
+    backoff_factor: float = BACKOFF_FACTOR,
+) -> requests.Session:
+    """
+    연결 풀과 재시도 정책이 설정된 새 세션을 만듭니다.
+
+    Args:
+        pool_size: 호스트당 최대 연결 수
+        max_retries: 5xx/연결 오류/타임아웃 시 최대 재시도 횟수
+        backoff_factor: 재시도 간 대기 시간 계수 (backoff_factor * 2^(n-1) 초)
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+        pool_block=True,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def naver_url(path: str) -> str:
+    """네이버 금융 경로(예: "/item/main.naver?code=005930")를 NAVER_BASE_URL 기준 주소로 바꿉니다."""
+    return NAVER_BASE_URL + path
+
+
+def get_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 세션을 반환합니다. (처음 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def create_async_client(max_connections: int = ASYNC_MAX_CONNECTIONS) -> httpx.AsyncClient:
+    """
+    네이버 요청용 비동기 클라이언트를 만듭니다. (연결 수 한도까지 요청을 동시에 진행)
+    재시도는 async_get 한 곳에서만 하므로 전송 계층 재시도는 쓰지 않습니다.
+
+    Args:
+        max_connections: 최대 동시 연결 수 (keep-alive 연결도 같은 수까지 유지)
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(limits=limits),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT),
+    )
+
+
+# httpx 연결 풀은 이벤트 루프에 묶이므로 루프마다 따로 보관
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 공유하는 비동기 클라이언트를 반환합니다. (처음 호출 시 생성)"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = create_async_client()
+    return client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 비동기 클라이언트를 닫습니다. (서버 종료 시)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def async_get(url: str, client: Optional[httpx.AsyncClient] = None, max_retries: int = MAX_RETRIES,
+                    backoff_factor: float = BACKOFF_FACTOR, **kwargs) -> httpx.Response:
+    """
+    동기 세션과 같은 정책으로 GET 요청을 보냅니다.
+    5xx 응답, 연결 오류, 타임아웃이면 backoff_factor * 2^n초 기다린 뒤 재시도하고,
+    재시도를 모두 쓰면 마지막 응답을 반환하거나 마지막 예외를 다시 발생시킵니다.
+
+    Args:
+        url: 요청 주소
+        client: 비동기 클라이언트 (None이면 현재 루프의 공유 클라이언트)
+        kwargs: httpx.AsyncClient.get 인자 (headers, params, ...)
+    """
+    client = client or get_async_client()
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                return response
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+        await asyncio.sleep(backoff_factor * 2 ** attempt)
@@ -0,0 +1,189 @@
+"""
+API 부하 테스트: 엔드포인트별 p50/p95/p99 지연 시간과 초당 요청 수
+
+동시 클라이언트 N개가 각 엔드포인트에 정해진 수만큼 요청을 보내고 결과를 표로 출력합니다.
+
+    stocks    GET /api/stocks?page=...        (첫 요청의 목록 크롤링은 측정 전에 미리 수행)
+    analyze   GET /api/analyze/{ticker}
+    trading   GET /api/trading-analysis/{ticker}
+
+종목 코드는 기본적으로 요청마다 새 코드를 사용해 응답 캐시를 거치지 않는 경로를 재고,
+--ticker-pool N을 주면 N개 코드를 돌려 써서 캐시 적중 경로를 잽니다.
+
+--spawn을 주면 naver_standin.py 대역 서버와 API 서버(uvicorn)를 직접 띄워 측정하므로
+finance.naver.com에 요청하지 않습니다. (--latency/--error-rate는 대역 서버 설정)
+
+사용법:
+    python loadtest_api.py --spawn [--clients 16] [--requests 200] [--latency 0.05] [--error-rate 0.01]
+    python loadtest_api.py --base-url http://127.0.0.1:8000 [--endpoints stocks,trading]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from naver_standin import StandinServer
+
+
+ENDPOINTS: Dict[str, Callable[[int, str], str]] = {
+    'stocks': lambda i, ticker: f"/api/stocks?page={i % 20 + 1}&page_size=100",
+    'analyze': lambda i, ticker: f"/api/analyze/{ticker}",
+    'trading': lambda i, ticker: f"/api/trading-analysis/{ticker}",
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """정렬된 값의 q 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return float('nan')
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """지연 시간(초) 목록을 요약합니다. 지연 시간은 ms로 반환합니다."""
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': len(ordered) / elapsed if elapsed > 0 else 0.0,
+        'p50': percentile(ordered, 50) * 1000,
+        'p95': percentile(ordered, 95) * 1000,
+        'p99': percentile(ordered, 99) * 1000,
+        'max': (ordered[-1] if ordered else float('nan')) * 1000,
+    }
+
+
+def ticker_for(i: int, ticker_pool: int) -> str:
+    """i번째 요청의 종목 코드 (ticker_pool이 0이면 요청마다 새 코드)"""
+    return f"{900000 + (i % ticker_pool if ticker_pool else i):06d}"
+
+
+async def load_endpoint(client: httpx.AsyncClient, make_path: Callable[[int, str], str],
+                        clients: int, total: int, ticker_pool: int = 0) -> Dict[str, float]:
+    """
+    clients개 작업자가 total개 요청을 나눠 보내고 결과를 요약합니다.
+    HTTP 오류, 연결 실패, {"error": ...} 응답은 오류로 셉니다.
+    """
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(make_path(i, ticker_for(i, ticker_pool)))
+                body = response.json()
+                failed = response.status_code != 200 or (isinstance(body, dict) and 'error' in body)
+            except (httpx.HTTPError, ValueError):
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, clients))))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run(base_url: str, endpoints: List[str], clients: int, total: int, ticker_pool: int,
+              timeout: float = 60.0) -> Dict[str, Dict[str, float]]:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        if 'stocks' in endpoints:
+            start = time.perf_counter()
+            await client.get('/api/stocks?page=1')
+            print(f"목록 스냅샷 준비 (첫 /api/stocks): {time.perf_counter() - start:.2f}s")
+        return {name: await load_endpoint(client, ENDPOINTS[name], clients, total, ticker_pool)
+                for name in endpoints}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def spawn_api(naver_base_url: str, port: int) -> subprocess.Popen:
+    """대역 서버를 바라보는 API 서버를 띄우고 응답할 때까지 기다립니다."""
+    env = dict(os.environ, NAVER_BASE_URL=naver_base_url, STOCK_HISTORY_DB='')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {process.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API server did not start within 30s")
+
+
+def report(results: Dict[str, Dict[str, float]], clients: int):
+    print(f"\n동시 클라이언트 {clients}개")
+    print(f"{'엔드포인트':10} {'요청':>6} {'오류':>5} {'요청/초':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'최대':>9}")
+    for name, r in results.items():
+        print(f"{name:10} {r['requests']:6d} {r['errors']:5d} {r['rps']:9.1f} "
+              f"{r['p50']:7.1f}ms {r['p95']:7.1f}ms {r['p99']:7.1f}ms {r['max']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="API 엔드포인트 부하 테스트")
+    arg_parser.add_argument('--base-url', default='http://127.0.0.1:8000', help="API 서버 주소 (--spawn이면 무시)")
+    arg_parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help=f"측정할 엔드포인트 ({','.join(ENDPOINTS)})")
+    arg_parser.add_argument('--clients', type=int, default=16, help="동시 클라이언트 수")
+    arg_parser.add_argument('--requests', type=int, default=200, help="엔드포인트별 요청 수")
+    arg_parser.add_argument('--ticker-pool', type=int, default=0, help="돌려 쓸 종목 코드 수 (0이면 요청마다 새 코드)")
+    arg_parser.add_argument('--spawn', action='store_true', help="대역 서버와 API 서버를 직접 띄워 측정")
+    arg_parser.add_argument('--latency', type=float, default=0.05, help="대역 서버 평균 지연 (초)")
+    arg_parser.add_argument('--jitter', type=float, default=0.02, help="대역 서버 지연 변동 폭 (초)")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="대역 서버 오류 응답 비율")
+    arg_parser.add_argument('--list-size', type=int, default=2600, help="대역 서버 목록 종목 수")
+    args = arg_parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        arg_parser.error(f"unknown endpoints: {unknown}")
+
+    standin: Optional[StandinServer] = None
+    api: Optional[subprocess.Popen] = None
+    base_url = args.base_url
+    try:
+        if args.spawn:
+            standin = StandinServer(port=0, latency=args.latency, jitter=args.jitter,
+                                    error_rate=args.error_rate, list_size=args.list_size).start()
+            port = free_port()
+            api = spawn_api(standin.url, port)
+            base_url = f"http://127.0.0.1:{port}"
+            print(f"대역 서버 {standin.url} (지연 {args.latency * 1000:.0f}±{args.jitter * 1000:.0f}ms, "
+                  f"오류 {args.error_rate:.1%}) / API 서버 {base_url}")
+
+        results = asyncio.run(run(base_url, endpoints, args.clients, args.requests, args.ticker_pool))
+        report(results, args.clients)
+        if standin is not None:
+            print(f"\n대역 서버가 받은 요청: {standin.stats()}")
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait(timeout=10)
+        if standin is not None:
+            standin.stop()
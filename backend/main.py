@@ -1,16 +1,52 @@
-from fastapi import FastAPI, Response
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import io
-import requests
-from bs4 import BeautifulSoup
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import json
+import os
 import re
-import openpyxl
+import time
 from naver_scraper_trading import TradingStrategyScraper
-from gemini_analyzer import GeminiAnalyzer
+from gemini_analyzer import GEMINI_BATCH_SIZE, GeminiAnalyzer, close_async_client, strategy_cache
+from parser_backend import parse_html, resolve_parser
+from http_session import async_get, close_async_client as close_naver_client, get_session, naver_url
+from response_cache import ResponseCache
+from history_store import HISTORY_LIMIT, HistoryStore
+from pipeline_metrics import cache_metric_lines, metrics
+from request_profiler import request_profiler
+from app_logging import get_logger, metric_lines as logging_metric_lines
+from async_scrape_engine import AsyncScrapeEngine, TokenBucket
+from stock_universe import StockUniverse, filter_stocks
+from field_patterns import scanner as field_scanner
+from stock_record import NUMBER_FIELDS, TEXT_FIELDS
+from table_export import EXPORT_FORMATS, MEDIA_TYPES, iter_table, parquet_available
 from fastapi import Header
-from typing import Optional
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 서버 종료 시 Gemini, 네이버 공유 연결 풀 닫기
+    await close_async_client()
+    await close_naver_client()
+
+app = FastAPI(lifespan=lifespan)
+
+# 요청 경로 로그 (LOG_LEVEL, LOG_SAMPLE_RATE, LOG_FORMAT - app_logging.py)
+log = get_logger(__name__)
+
+# HTML 파서 백엔드 (lxml 우선, 없으면 html.parser)
+HTML_PARSER = resolve_parser()
 
-app = FastAPI()
+# 스크래핑 결과 캐시 (필드별 TTL, LRU)
+response_cache = ResponseCache()
+
+# KOSPI + KOSDAQ 전체 종목 스냅샷 (오래되면 요청 시 백그라운드에서 갱신)
+stock_universe = StockUniverse()
 
 # Enable CORS for React frontend
 app.add_middleware(
@@ -21,37 +57,59 @@ app.add_middleware(
 )
 
 @app.get("/api/stocks")
-def get_stocks():
+async def get_stocks(request: Request, market: Optional[str] = None, q: Optional[str] = None,
+                     page: Optional[int] = None, page_size: int = 100):
     """
-    Fetches stock list from Naver Finance directly (lightweight alternative to pykrx)
+    Returns the full KOSPI + KOSDAQ stock list from the cached market-cap snapshot.
+
+    - market: KOSPI / KOSDAQ / ALL, q: name or ticker search
+    - Without `page` the whole (filtered) list is returned as before;
+      with `page` a paged envelope {total, page, page_size, items} is returned.
+    - Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    - The first snapshot is crawled with the shared async client; filtering and
+      JSON rendering run in a worker thread so the event loop stays free.
     """
     try:
-        # Fetch from Naver Finance stock list page
-        url = "https://finance.naver.com/sise/sise_market_sum.naver"
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        data = []
-        # Parse top stocks from the page
-        for row in soup.select('table.type_2 tr')[:100]:  # Limit to top 100 for performance
-            cells = row.select('td')
-            if len(cells) > 1:
-                link = cells[1].select_one('a')
-                if link:
-                    name = link.get_text(strip=True)
-                    href = link.get('href', '')
-                    ticker_match = re.search(r'code=(\d+)', href)
-                    if ticker_match:
-                        ticker = ticker_match.group(1)
-                        data.append({
-                            "ticker": ticker,
-                            "name": name,
-                            "market": "KOSPI"  # Default to KOSPI, can be refined
-                        })
-        
-        return data if data else [{"ticker": "005930", "name": "삼성전자", "market": "KOSPI"}]
+        snapshot = await stock_universe.aget_snapshot()
+    except Exception as e:
+        return {"error": str(e)}
+
+    query_key = json.dumps([market, q, page, page_size])
+    etag = f'"{snapshot.etag.strip(chr(34))}-{hashlib.sha1(query_key.encode()).hexdigest()[:8]}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=cache_headers)
+
+    return await asyncio.to_thread(stocks_response, snapshot, market, q, page, page_size, cache_headers)
+
+def stocks_response(snapshot, market, q, page, page_size, cache_headers):
+    """Filters the snapshot and renders the /api/stocks JSON body."""
+    stocks = filter_stocks(snapshot.stocks, market=market, query=q)
+    if page is None:
+        body = stocks
+    else:
+        page_size = max(1, min(page_size, 1000))
+        page = max(1, page)
+        start = (page - 1) * page_size
+        body = {
+            "total": len(stocks),
+            "page": page,
+            "page_size": page_size,
+            "items": stocks[start:start + page_size]
+        }
+
+    return JSONResponse(content=body, headers=cache_headers)
+
+@app.get("/api/stocks/meta")
+def get_stocks_meta():
+    """Snapshot metadata: build time, ETag and per-market counts."""
+    try:
+        snapshot = stock_universe.get_snapshot()
     except Exception as e:
         return {"error": str(e)}
+    return {"built_at": snapshot.built_at, "etag": snapshot.etag, "total": len(snapshot.stocks), "markets": snapshot.counts()}
 
 def clean_vb_text(text):
     """
@@ -64,120 +122,356 @@ def clean_vb_text(text):
     # Remove commas from numbers
     return text.strip()
 
+def parse_stock_analysis(soup):
+    """
+    Extracts the analysis fields from a parsed Naver item page (VB string-splitting logic).
+    """
+    # Initialize result with defaults
+    result = {
+        "opinion": "N/A",
+        "opinion_score": "N/A",
+        "target_price": "N/S",
+        "high_52w": "N/A",
+        "low_52w": "N/A",
+        "current_price": "N/A",
+        "sector": "N/A"
+    }
+
+    # 1. VB Logic: Find table by summary="투자의견"
+    invest_table = None
+    all_tables = soup.find_all('table')
+    log.debug("Found tables", extra={"tables": len(all_tables)})
+    for table in all_tables:
+        summary = table.get('summary', '')
+        # Match "투자의견", "목표주가", or the specific summary from our findings
+        if "투자의견" in summary or "목표주가" in table.get_text():
+            invest_table = table
+            break
+    
+    if invest_table:
+        log.debug("Found invest table", extra={"summary": invest_table.get('summary')})
+        table_html = str(invest_table)
+        chunks = table_html.split("<em>")[1:] 
+        
+        cleaned_vals = [clean_vb_text(chunk[:30]).replace(',', '') for chunk in chunks]
+        log.debug("VB-style cleaned values", extra={"values": cleaned_vals})
+
+        if len(cleaned_vals) >= 4:
+            result["opinion_score"] = cleaned_vals[0]
+            full_val0 = clean_vb_text(chunks[0][:20])
+            opinion_match = re.search(r'([가-힣]+)', full_val0)
+            if opinion_match: result["opinion"] = opinion_match.group(1)
+            
+            if len(cleaned_vals) >= 2: result["target_price"] = f"{int(cleaned_vals[1]):,}" if cleaned_vals[1].isdigit() else cleaned_vals[1]
+            if len(cleaned_vals) >= 3: result["high_52w"] = f"{int(cleaned_vals[2]):,}" if cleaned_vals[2].isdigit() else cleaned_vals[2]
+            if len(cleaned_vals) >= 4: result["low_52w"] = f"{int(cleaned_vals[3]):,}" if cleaned_vals[3].isdigit() else cleaned_vals[3]
+        elif len(cleaned_vals) >= 2:
+            result.update({
+                "high_52w": f"{int(cleaned_vals[0]):,}" if cleaned_vals[0].isdigit() else cleaned_vals[0],
+                "low_52w": f"{int(cleaned_vals[1]):,}" if cleaned_vals[1].isdigit() else cleaned_vals[1]
+            })
+
+    # 2. Extract Current Price
+    today_div = soup.find('div', class_='no_today')
+    if today_div:
+        blind = today_div.find('span', class_='blind')
+        if blind:
+            result["current_price"] = blind.get_text(strip=True)
+            log.debug("Found current price", extra={"current_price": result['current_price']})
+
+    # 3. Sector
+    sector_th = soup.find('th', string=re.compile(r'업종'))
+    if sector_th:
+        result["sector"] = sector_th.find_next('td').get_text(strip=True)
+        log.debug("Found sector", extra={"sector": result['sector']})
+    else:
+        sector_h4 = soup.find('h4', string=re.compile(r'업종명'))
+        if sector_h4:
+            result["sector"] = sector_h4.find_next('a').get_text(strip=True)
+            log.debug("Found sector (h4)", extra={"sector": result['sector']})
+    return result
+
+def profile_requested(request: Request) -> bool:
+    return request.query_params.get("profile") == "1" or request.headers.get("x-profile") == "1"
+
+def profiled(request: Request, handler, profile: Optional[bool] = None):
+    """
+    분석 엔드포인트 하나를 request_profiler로 측정합니다.
+    ?profile=1 또는 X-Profile: 1 요청은 X-Profile-Token이 맞을 때만 cProfile을 켜고
+    {"result": 원래 응답, "profile": {단계별 시간, 함수별 누적 시간}}으로 응답합니다.
+    """
+    wants = profile_requested(request)
+    if wants and not request_profiler.authorized(request.headers.get("x-profile-token")):
+        return JSONResponse({"error": "Profiling requires a valid X-Profile-Token"}, status_code=403)
+    with request_profiler.run(request.url.path, profile=True if wants else profile) as run:
+        result = handler()
+    return {"result": result, "profile": run.report()} if wants else result
+
+async def aprofiled(request: Request, handler, sync_handler):
+    """
+    비동기 엔드포인트용 profiled입니다. cProfile은 스레드 하나만 보므로 프로파일할 요청
+    (?profile=1 또는 STOCK_PROFILE_SAMPLE_RATE 표본)은 sync_handler로 스레드에서 처리하고,
+    나머지는 단계별 시간만 재면서 handler()를 이벤트 루프에서 기다립니다.
+    """
+    if profile_requested(request) or request_profiler.sampled():
+        return await run_in_threadpool(profiled, request, sync_handler, True)
+    with request_profiler.run(request.url.path, profile=False):
+        return await handler()
+
 @app.get("/api/analyze/{ticker}")
-def analyze_stock(ticker: str):
+async def analyze_stock(ticker: str, request: Request):
     """
     Scrapes detailed stock info from Naver Finance using the exact string-splitting logic from VB.
+    Results are served from the response cache while every field is within its TTL.
+    """
+    key = f"analyze:{ticker}"
+    return await aprofiled(
+        request,
+        lambda: response_cache.aget_or_fetch(key, lambda: afetch_stock_analysis(ticker)),
+        lambda: response_cache.get_or_fetch(key, lambda: fetch_stock_analysis(ticker)),
+    )
+
+ANALYZE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+}
+
+def fetch_stock_analysis(ticker: str):
+    """
+    Fetches and parses the Naver item page for /api/analyze (bypasses the cache).
     """
-    print(f"\n[DEBUG] Starting analysis for: {ticker}", flush=True)
+    log.debug("Starting analysis", extra={"ticker": ticker})
     try:
-        url = f"https://finance.naver.com/item/main.nhn?code={ticker}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
-        }
-        print(f"[DEBUG] Fetching URL: {url}", flush=True)
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        # Naver seems to be returning UTF-8 now in many cases
+        url = naver_url(f"/item/main.nhn?code={ticker}")
+        log.debug("Fetching URL", extra={"url": url})
+        with metrics.stage('analyze', 'fetch'):
+            response = get_session().get(url, headers=ANALYZE_HEADERS, timeout=10)
+        metrics.record_response('analyze', response.status_code, len(response.content))
+        response.raise_for_status()
+        return analysis_from_page(ticker, response.content)
+    except Exception as e:
+        metrics.record_failure('analyze', e)
+        log.warning("Analysis failed", extra={"ticker": ticker, "error": e})
+        return {"error": str(e)}
+
+async def afetch_stock_analysis(ticker: str):
+    """
+    Async fetch_stock_analysis: the request goes through the shared async client and
+    decoding/parsing/extraction run in a worker thread.
+    """
+    log.debug("Starting analysis", extra={"ticker": ticker})
+    try:
+        url = naver_url(f"/item/main.nhn?code={ticker}")
+        log.debug("Fetching URL", extra={"url": url})
+        with metrics.stage('analyze', 'fetch'):
+            response = await async_get(url, headers=ANALYZE_HEADERS)
+        metrics.record_response('analyze', response.status_code, len(response.content))
+        response.raise_for_status()
+        return await asyncio.to_thread(analysis_from_page, ticker, response.content)
+    except Exception as e:
+        metrics.record_failure('analyze', e)
+        log.warning("Analysis failed", extra={"ticker": ticker, "error": e})
+        return {"error": str(e)}
+
+def analysis_from_page(ticker: str, body: bytes):
+    """
+    Decodes, parses and extracts the /api/analyze fields from a fetched item page.
+    """
+    # Naver seems to be returning UTF-8 now in many cases
+    with metrics.stage('analyze', 'decode'):
         try:
-            content = response.content.decode('utf-8')
-            print("[DEBUG] Decoded using UTF-8")
+            content = body.decode('utf-8')
+            encoding = 'utf-8'
         except:
-            content = response.content.decode('euc-kr', errors='replace')
-            print("[DEBUG] Decoded using EUC-KR (fallback)")
+            content = body.decode('euc-kr', errors='replace')
+            encoding = 'euc-kr'
+    log.debug("Decoded page", extra={"encoding": encoding, "length": len(content)})
 
-        print(f"[DEBUG] Content length: {len(content)}")
-        # print(f"[DEBUG] Content snippet: {repr(content[:500])}")
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Initialize result with defaults
-        result = {
-            "opinion": "N/A",
-            "opinion_score": "N/A",
-            "target_price": "N/S",
-            "high_52w": "N/A",
-            "low_52w": "N/A",
-            "current_price": "N/A",
-            "sector": "N/A"
-        }
+    with metrics.stage('analyze', 'parse'):
+        soup = parse_html(content, HTML_PARSER)
+    with metrics.stage('analyze', 'extract'):
+        result = parse_stock_analysis(soup)
+    metrics.record_fields('analyze', result)
 
-        # 1. VB Logic: Find table by summary="투자의견"
-        invest_table = None
-        all_tables = soup.find_all('table')
-        print(f"[DEBUG] Found {len(all_tables)} tables total.")
-        for table in all_tables:
-            summary = table.get('summary', '')
-            # Match "투자의견", "목표주가", or the specific summary from our findings
-            if "투자의견" in summary or "목표주가" in table.get_text():
-                invest_table = table
-                break
-        
-        if invest_table:
-            print(f"[DEBUG] Found Invest Table with summary: {repr(invest_table.get('summary'))}")
-            table_html = str(invest_table)
-            chunks = table_html.split("<em>")[1:] 
-            
-            cleaned_vals = [clean_vb_text(chunk[:30]).replace(',', '') for chunk in chunks]
-            print(f"[DEBUG] VB-style cleaned values: {cleaned_vals}")
-
-            if len(cleaned_vals) >= 4:
-                result["opinion_score"] = cleaned_vals[0]
-                full_val0 = clean_vb_text(chunks[0][:20])
-                opinion_match = re.search(r'([가-힣]+)', full_val0)
-                if opinion_match: result["opinion"] = opinion_match.group(1)
-                
-                if len(cleaned_vals) >= 2: result["target_price"] = f"{int(cleaned_vals[1]):,}" if cleaned_vals[1].isdigit() else cleaned_vals[1]
-                if len(cleaned_vals) >= 3: result["high_52w"] = f"{int(cleaned_vals[2]):,}" if cleaned_vals[2].isdigit() else cleaned_vals[2]
-                if len(cleaned_vals) >= 4: result["low_52w"] = f"{int(cleaned_vals[3]):,}" if cleaned_vals[3].isdigit() else cleaned_vals[3]
-            elif len(cleaned_vals) >= 2:
-                result.update({
-                    "high_52w": f"{int(cleaned_vals[0]):,}" if cleaned_vals[0].isdigit() else cleaned_vals[0],
-                    "low_52w": f"{int(cleaned_vals[1]):,}" if cleaned_vals[1].isdigit() else cleaned_vals[1]
-                })
-
-        # 2. Extract Current Price
-        today_div = soup.find('div', class_='no_today')
-        if today_div:
-            blind = today_div.find('span', class_='blind')
-            if blind:
-                result["current_price"] = blind.get_text(strip=True)
-                print(f"[DEBUG] Found current price: {result['current_price']}")
-
-        # 3. Sector
-        sector_th = soup.find('th', string=re.compile(r'업종'))
-        if sector_th:
-            result["sector"] = sector_th.find_next('td').get_text(strip=True)
-            print(f"[DEBUG] Found sector: {result['sector']}")
-        else:
-            sector_h4 = soup.find('h4', string=re.compile(r'업종명'))
-            if sector_h4:
-                result["sector"] = sector_h4.find_next('a').get_text(strip=True)
-                print(f"[DEBUG] Found sector (h4): {result['sector']}")
+    log.debug("Final result", extra={"ticker": ticker, "result": result})
+    return result
 
-        print(f"[DEBUG] Final Result for {ticker}: {result}\n", flush=True)
-        return result
-    except Exception as e:
-        print(f"[DEBUG] Error for {ticker}: {e}")
-        return {"error": str(e)}
+# 스크래핑 결과 이력 (종목별 시계열, 재시작 후에도 유지 - STOCK_HISTORY_DB를 설정했을 때만)
+history_store = HistoryStore.open()
+
+# 매매 전략용 스크래퍼 인스턴스 (성공한 결과는 이력에 저장)
+trading_scraper = TradingStrategyScraper(history=history_store)
 
-# 매매 전략용 스크래퍼 인스턴스
-trading_scraper = TradingStrategyScraper()
+def get_trading_info(ticker: str):
+    """
+    매매 전략 분석 정보를 응답 캐시 -> 이력 저장소 -> 네이버 순서로 가져옵니다.
+    이력의 최근 결과가 필드 TTL 안이면 네이버에 요청하지 않고 캐시에 다시 올립니다.
+    새로 가져온 결과는 모든 필드를 새 값과 새 저장 시각으로 캐시에 반영합니다.
+    """
+    key = f"trading:{ticker}"
+    cached = response_cache.get(key) or cached_from_history(key, ticker)
+    if cached is not None:
+        return cached
+
+    return response_cache.merge(key, trading_scraper.get_complete_trading_info(ticker))
+
+async def aget_trading_info(ticker: str):
+    """
+    get_trading_info의 비동기 버전입니다. 이력 조회(SQLite)는 작업 스레드에서,
+    네이버 요청은 공유 비동기 클라이언트로 처리합니다.
+    """
+    key = f"trading:{ticker}"
+    cached = await response_cache.aget(key)
+    if cached is None and history_store is not None:
+        cached = await asyncio.to_thread(cached_from_history, key, ticker)
+    if cached is not None:
+        return cached
+
+    return await response_cache.amerge(key, await trading_scraper.aget_complete_trading_info(ticker))
+
+def cached_from_history(key: str, ticker: str):
+    """이력의 최근 결과가 필드 TTL 안이면 응답 캐시에 다시 올리고 반환합니다."""
+    if history_store is None:
+        return None
+    recent = history_store.latest(ticker)
+    if recent is None:
+        return None
+    scraped_at, data = recent
+    if time.time() - scraped_at >= response_cache.ttl_for(data):
+        return None
+    response_cache.set(key, data, stored_at=scraped_at)
+    return data
 
 @app.get("/api/trading-analysis/{ticker}")
-def trading_analysis(ticker: str):
+async def trading_analysis(ticker: str, request: Request):
     """
     매매 전략 수립을 위한 종합 분석 정보를 제공합니다.
     가격, 거래, 투자지표, 수급, 재무 정보를 모두 포함합니다.
+    ?profile=1 (X-Profile-Token 필요)이면 요청 프로파일을 함께 반환합니다.
     """
-    print(f"\n[DEBUG] Trading analysis for: {ticker}", flush=True)
+    def analyze():
+        log.debug("Trading analysis", extra={"ticker": ticker})
+        try:
+            result = get_trading_info(ticker)
+            log.debug("Trading analysis result", extra={"ticker": ticker, "result": result})
+            return result
+        except Exception as e:
+            log.warning("Trading analysis failed", extra={"ticker": ticker, "error": e})
+            return {"error": str(e)}
+
+    async def aanalyze():
+        log.debug("Trading analysis", extra={"ticker": ticker})
+        try:
+            result = await aget_trading_info(ticker)
+            log.debug("Trading analysis result", extra={"ticker": ticker, "result": result})
+            return result
+        except Exception as e:
+            log.warning("Trading analysis failed", extra={"ticker": ticker, "error": e})
+            return {"error": str(e)}
+
+    return await aprofiled(request, aanalyze, analyze)
+
+# 일괄 분석 설정 (서버가 정하는 동시 실행 수와 전역 초당 요청 한도)
+BATCH_MAX_TICKERS = int(os.environ.get('BATCH_MAX_TICKERS', '500'))
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '8'))
+BATCH_REQUESTS_PER_SECOND = float(os.environ.get('BATCH_REQUESTS_PER_SECOND', '5'))
+
+# 모든 일괄 분석 요청이 함께 쓰는 토큰 버킷
+batch_bucket = TokenBucket(BATCH_REQUESTS_PER_SECOND)
+
+class BatchAnalysisRequest(BaseModel):
+    tickers: List[str]
+
+@app.post("/api/trading-analysis/batch")
+async def trading_analysis_batch(request: BatchAnalysisRequest, format: str = "ndjson"):
+    """
+    여러 종목의 매매 전략 분석을 한 번의 요청으로 처리합니다.
+    캐시에 있는 종목은 즉시, 나머지는 서버의 속도 제한 안에서 동시에 가져오며
+    완료되는 순서대로 NDJSON(기본) 또는 SSE(format=sse)로 스트리밍합니다.
+
+    각 줄: {"ticker": "005930", "data": {...}}
+    """
+    tickers = list(dict.fromkeys(t.strip() for t in request.tickers if t.strip()))
+    if len(tickers) > BATCH_MAX_TICKERS:
+        return {"error": f"Too many tickers (max {BATCH_MAX_TICKERS})"}
+
+    sse = format == "sse"
+
+    def encode(ticker, data):
+        line = json.dumps({"ticker": ticker, "data": data}, ensure_ascii=False)
+        return f"data: {line}\n\n" if sse else line + "\n"
+
+    async def stream():
+        missing = []
+        for ticker in tickers:
+            cached = await response_cache.aget(f"trading:{ticker}")
+            if cached is not None:
+                yield encode(ticker, cached)
+            else:
+                missing.append(ticker)
+
+        engine = AsyncScrapeEngine(get_trading_info, concurrency=BATCH_CONCURRENCY, bucket=batch_bucket)
+        async for index, data in engine.iter_results(missing):
+            yield encode(missing[index], data)
+
+        if sse:
+            yield "event: done\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    """응답 캐시 적중/미스 통계"""
+    return response_cache.stats()
+
+@app.get("/api/history/{ticker}")
+def trading_history(ticker: str, fields: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, limit: int = HISTORY_LIMIT):
+    """
+    종목 하나의 스크래핑 이력을 시간 순서로 반환합니다. (네이버에 요청하지 않음)
+
+    - fields: 쉼표로 구분한 필드 (예: current_price,per), 없으면 전체
+    - since / until: "2026-10-01" 또는 "2026-10-01 09:00:00" (날짜만 주면 until은 그날 끝까지)
+    - limit: 최대 행 수 (범위 안에서 가장 최근 것부터, 최대 10000)
+    """
+    if history_store is None:
+        return {"error": "Scrape history is disabled"}
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
     try:
-        result = trading_scraper.get_complete_trading_info(ticker)
-        print(f"[DEBUG] Trading analysis result: {result}\n", flush=True)
-        return result
-    except Exception as e:
-        print(f"[DEBUG] Error in trading analysis for {ticker}: {e}")
-        return {"error": str(e)}
+        items = history_store.series(ticker, field_list, since, until, max(1, min(limit, 10000)))
+    except ValueError as e:
+        return {"error": f"Invalid time range: {e}"}
+    return {"ticker": ticker, "count": len(items), "items": items}
+
+@app.get("/api/patterns/stats")
+def pattern_stats():
+    """필드 정규식별 검사/일치 횟수와 누적 실행 시간"""
+    return field_scanner.stats()
+
+# /api/metrics에 캐시 적중률, 로그 버림/샘플링 횟수 포함
+metrics.add_collector(lambda: cache_metric_lines({
+    "response": response_cache.stats(),
+    "gemini": strategy_cache.stats(),
+}))
+metrics.add_collector(logging_metric_lines)
+
+@app.get("/api/metrics")
+def pipeline_metrics():
+    """
+    스크래핑 단계별/추출기별 소요 시간 히스토그램, 네이버 응답 상태와 크기,
+    필드별 추출 실패(N/A) 횟수, 캐시 적중률 (Prometheus 텍스트 형식)
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/profile/slowest")
+def slowest_requests(x_profile_token: Optional[str] = Header(None)):
+    """
+    분석 엔드포인트에서 가장 느렸던 요청들의 단계별 시간 (프로파일된 요청은 함수별 누적 시간 포함)
+    X-Profile-Token 헤더가 STOCK_PROFILE_TOKEN과 같아야 합니다.
+    """
+    if not request_profiler.authorized(x_profile_token):
+        return JSONResponse({"error": "Profiling requires a valid X-Profile-Token"}, status_code=403)
+    return {"slowest": request_profiler.slowest()}
 
 @app.get("/api/gemini-test")
 def test_gemini_connection(x_gemini_api_key: Optional[str] = Header(None)):
@@ -189,18 +483,73 @@ def test_gemini_connection(x_gemini_api_key: Optional[str] = Header(None)):
     success = analyzer.test_connection()
     return {"success": success}
 
+@app.get("/api/gemini-cache/stats")
+def gemini_cache_stats():
+    """Gemini 전략 분석 결과 캐시 적중/미스 통계"""
+    return strategy_cache.stats()
+
+# 일괄 AI 분석 최대 종목 수
+GEMINI_BATCH_MAX_STOCKS = int(os.environ.get('GEMINI_BATCH_MAX_STOCKS', '100'))
+
+class GeminiBatchRequest(BaseModel):
+    stocks: List[dict]
+    batch_size: Optional[int] = None
+
+@app.post("/api/gemini-analyze/batch")
+async def gemini_analyze_batch(request: GeminiBatchRequest, x_gemini_api_key: Optional[str] = Header(None)):
+    """
+    여러 종목의 AI 전략 분석을 batch_size개씩 한 번의 Gemini 호출로 처리합니다.
+    형식이 잘못된 종목만 하나씩 다시 분석하며, 결과는 {"results": {ticker: {...}}} 입니다.
+    """
+    if not x_gemini_api_key:
+        return {"error": "API Key is missing"}
+    if len(request.stocks) > GEMINI_BATCH_MAX_STOCKS:
+        return {"error": f"Too many stocks (max {GEMINI_BATCH_MAX_STOCKS})"}
+    if any(not stock.get("ticker") for stock in request.stocks):
+        return {"error": "Every stock needs a ticker"}
+
+    analyzer = GeminiAnalyzer(x_gemini_api_key)
+    batch_size = request.batch_size or GEMINI_BATCH_SIZE
+    return {"results": await analyzer.aget_strategies(request.stocks, batch_size=batch_size)}
+
 @app.post("/api/gemini-analyze/{ticker}")
-def gemini_analyze(ticker: str, stock_data: dict, x_gemini_api_key: Optional[str] = Header(None)):
-    """Gemini AI를 이용한 종목 전략 분석"""
+async def gemini_analyze(ticker: str, stock_data: dict, x_gemini_api_key: Optional[str] = Header(None)):
+    """
+    Gemini AI를 이용한 종목 전략 분석
+    작업자 스레드를 점유하지 않고 기다리며, API 키별 동시 요청/초당 요청 제한을 따릅니다.
+    """
     if not x_gemini_api_key:
         return {"error": "API Key is missing"}
     
     analyzer = GeminiAnalyzer(x_gemini_api_key)
-    analysis = analyzer.get_strategy(stock_data)
+    analysis = await analyzer.aget_strategy(stock_data)
     return analysis
 
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+def sse_event(event: str, data: dict) -> str:
+    """server-sent events 형식의 이벤트 하나"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/api/gemini-analyze/{ticker}/stream")
+async def gemini_analyze_stream(ticker: str, stock_data: dict, x_gemini_api_key: Optional[str] = Header(None)):
+    """
+    Gemini AI 전략 분석을 server-sent events로 스트리밍합니다.
+    생성되는 텍스트를 delta 이벤트로 바로 보내고, 끝나면 전체를 JSON으로 파싱해 result 이벤트로 보냅니다.
+    (캐시에 있으면 result만, 실패하면 error 뒤에 안내 문구 result)
+    """
+    if not x_gemini_api_key:
+        return {"error": "API Key is missing"}
+
+    analyzer = GeminiAnalyzer(x_gemini_api_key)
+
+    async def events():
+        async for event, data in analyzer.astream_strategy(stock_data):
+            yield sse_event(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 class StockItem(BaseModel):
     ticker: str
@@ -220,51 +569,165 @@ class ExportRequest(BaseModel):
     stocks: List[StockItem]
     analysis: Dict[str, AnalysisData]
 
+# 내보내기 컬럼 키 -> 헤더 (columns를 주지 않으면 이 순서대로)
+EXPORT_COLUMNS = {
+    "ticker": "종목코드",
+    "name": "종목명",
+    "current_price": "현재가",
+    "opinion": "투자의견",
+    "target_price": "목표주가",
+    "high_52w": "52주 최고",
+    "low_52w": "52주 최저",
+    "sector": "업종",
+    "market": "시장",
+}
+# 기본 컬럼 외에 고를 수 있는 스크래핑 필드 (헤더는 필드 이름)
+EXTRA_EXPORT_FIELDS = tuple(field for field in NUMBER_FIELDS + TEXT_FIELDS if field not in EXPORT_COLUMNS)
+
+# 종목 코드 내보내기 설정 (최대 종목 수, 캐시에 없어 새로 가져올 최대 종목 수, 재사용할 캐시 최대 경과 시간)
+EXPORT_MAX_TICKERS = int(os.environ.get('EXPORT_MAX_TICKERS', '5000'))
+EXPORT_MAX_FETCH = int(os.environ.get('EXPORT_MAX_FETCH', str(BATCH_MAX_TICKERS)))
+EXPORT_CACHE_MAX_AGE = float(os.environ.get('EXPORT_CACHE_MAX_AGE', '3600'))
+
+def export_value(column: str, stock: dict, data: Optional[dict]):
+    """내보내기 셀 값 (분석 데이터가 없거나 오류면 "-")"""
+    if column in ("ticker", "name", "market"):
+        return stock.get(column, "")
+    if not data or "error" in data:
+        return "-"
+    if column == "opinion":
+        opinion = data.get("opinion", "N/A")
+        return f"{opinion} ({data.get('opinion_score')})" if opinion != "N/A" else "-"
+    return data.get(column, "N/A")
+
+def export_format_error(format: str) -> Optional[dict]:
+    if format not in EXPORT_FORMATS:
+        return {"error": f"Unsupported format: {format} (choose from {', '.join(EXPORT_FORMATS)})"}
+    if format == "parquet" and not parquet_available():
+        return {"error": "Parquet export requires pyarrow"}
+    return None
+
+def export_response(format: str, headers: List[str], rows, extra_headers: Optional[dict] = None):
+    response_headers = {
+        'Content-Disposition': f'attachment; filename="stock_analysis.{format}"',
+        **(extra_headers or {})
+    }
+    return StreamingResponse(
+        iter_table(format, headers, rows, sheet_title="Stock Analysis"),
+        media_type=MEDIA_TYPES[format],
+        headers=response_headers
+    )
+
+def export_rows(request: ExportRequest):
+    """내보내기 요청을 한 행씩 만듭니다."""
+    for s in request.stocks:
+        a = request.analysis.get(s.ticker)
+        stock, data = s.model_dump(), a.model_dump() if a else None
+        yield [export_value(column, stock, data) for column in EXPORT_COLUMNS]
+
 @app.post("/api/export")
-def export_stocks(request: ExportRequest):
+def export_stocks(request: ExportRequest, format: str = "xlsx"):
     """
-    Generates and returns an Excel file of stocks including analysis data.
+    Streams an export file of stocks including analysis data.
+
+    - format: xlsx (default, write-only workbook), csv or parquet (requires pyarrow)
+    - Rows are written in chunks, so a full-market export never holds the whole file in memory.
     """
+    error = export_format_error(format)
+    if error:
+        return error
+    return export_response(format, list(EXPORT_COLUMNS.values()), export_rows(request))
+
+class TickerExportRequest(BaseModel):
+    tickers: List[str]
+    columns: Optional[List[str]] = None
+    fetch_missing: bool = True
+    # 클라이언트가 이미 가진 분석 결과 (서버 캐시/이력에 없는 종목에만 사용)
+    analysis: Dict[str, AnalysisData] = {}
+
+def universe_by_ticker() -> Dict[str, dict]:
+    """종목 코드 -> 종목 정보 (종목명/시장), 스냅샷을 만들 수 없으면 빈 딕셔너리"""
     try:
-        # Create a new workbook and select the active sheet
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Stock Analysis"
-        
-        # Define headers
-        headers_list = ["종목코드", "종목명", "현재가", "투자의견", "목표주가", "52주 최고", "52주 최저", "업종", "시장"]
-        ws.append(headers_list)
-        
-        # Add data rows
-        for s in request.stocks:
-            a = request.analysis.get(s.ticker)
-            row = [
-                s.ticker,
-                s.name,
-                a.current_price if a else "-",
-                f"{a.opinion} ({a.opinion_score})" if a and a.opinion != "N/A" else "-",
-                a.target_price if a else "-",
-                a.high_52w if a else "-",
-                a.low_52w if a else "-",
-                a.sector if a else "-",
-                s.market
-            ]
-            ws.append(row)
-            
-        output = io.BytesIO()
-        wb.save(output)
-        
-        headers = {
-            'Content-Disposition': 'attachment; filename="stock_analysis.xlsx"'
-        }
-        return Response(
-            content=output.getvalue(), 
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", 
-            headers=headers
-        )
+        return {stock["ticker"]: stock for stock in stock_universe.get_snapshot().stocks}
     except Exception as e:
-        print(f"Export error: {e}")
-        return {"error": str(e)}
+        log.warning("Export without stock names", extra={"error": e})
+        return {}
+
+def export_from_history(tickers: List[str]) -> Dict[str, dict]:
+    """응답 캐시에 없는 종목 중 이력에 EXPORT_CACHE_MAX_AGE초 안의 결과가 있는 것"""
+    if history_store is None:
+        return {}
+    found = {}
+    for ticker in tickers:
+        recent = history_store.latest(ticker, max_age=EXPORT_CACHE_MAX_AGE)
+        if recent is not None:
+            found[ticker] = recent[1]
+    return found
+
+@app.post("/api/export/tickers")
+async def export_tickers(request: TickerExportRequest, format: str = "xlsx"):
+    """
+    종목 코드와 컬럼만 받아 서버의 캐시된 스크래핑 결과로 내보내기 파일을 만듭니다.
+
+    - columns: EXPORT_COLUMNS 키 또는 스크래핑 필드 이름 (기본: /api/export와 같은 9개 컬럼)
+    - 응답 캐시와 이력 저장소 모두에 EXPORT_CACHE_MAX_AGE초 안의 결과가 없는 종목은 analysis로 받은
+      클라이언트의 결과를 쓰고, 그것도 없으면 fetch_missing일 때 일괄 분석과 같은 속도 제한으로 가져오고,
+      아니면 "-"로 채웁니다.
+    - X-Export-Cached / X-Export-Client / X-Export-Fetched 헤더로 캐시(이력 포함) 사용 / 클라이언트 결과 사용 /
+      새로 가져오는 데 성공한 종목 수를 알려줍니다.
+    """
+    error = export_format_error(format)
+    if error:
+        return error
+
+    tickers = list(dict.fromkeys(t.strip() for t in request.tickers if t.strip()))
+    if len(tickers) > EXPORT_MAX_TICKERS:
+        return {"error": f"Too many tickers (max {EXPORT_MAX_TICKERS})"}
+
+    columns = request.columns or list(EXPORT_COLUMNS)
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS and column not in EXTRA_EXPORT_FIELDS]
+    if unknown:
+        return {"error": f"Unknown columns: {', '.join(unknown)}"}
+
+    data = {}
+    missing = []
+    for ticker in tickers:
+        cached = await response_cache.aget(f"trading:{ticker}", max_age=EXPORT_CACHE_MAX_AGE)
+        if cached is not None:
+            data[ticker] = cached
+        else:
+            missing.append(ticker)
+    if missing:
+        data.update(await run_in_threadpool(export_from_history, missing))
+        missing = [ticker for ticker in missing if ticker not in data]
+    cached_count = len(data)
+
+    for ticker in missing:
+        if ticker in request.analysis:
+            data[ticker] = request.analysis[ticker].model_dump()
+    client_count = len(data) - cached_count
+    missing = [ticker for ticker in missing if ticker not in data]
+
+    fetched_count = 0
+    if request.fetch_missing and missing:
+        if len(missing) > EXPORT_MAX_FETCH:
+            return {"error": f"{len(missing)} tickers are not cached (max {EXPORT_MAX_FETCH} fetched per export)"}
+        engine = AsyncScrapeEngine(get_trading_info, concurrency=BATCH_CONCURRENCY, bucket=batch_bucket)
+        async for index, result in engine.iter_results(missing):
+            data[missing[index]] = result
+            fetched_count += "error" not in result
+
+    stocks = await run_in_threadpool(universe_by_ticker) if any(c in ("name", "market") for c in columns) else {}
+    rows = (
+        [export_value(column, stocks.get(ticker) or {"ticker": ticker}, data.get(ticker)) for column in columns]
+        for ticker in tickers
+    )
+    headers = [EXPORT_COLUMNS.get(column, column) for column in columns]
+    return export_response(format, headers, rows, {
+        "X-Export-Cached": str(cached_count),
+        "X-Export-Client": str(client_count),
+        "X-Export-Fetched": str(fetched_count),
+    })
 
 if __name__ == "__main__":
     import uvicorn
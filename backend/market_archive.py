@@ -0,0 +1,181 @@
+"""
+일별 전체 시장 분석 결과 Parquet 아카이브
+
+run_full_analysis의 analyze_all_stocks 결과를 날짜/시장별로 나눈 Parquet 데이터셋에
+쌓아 두고, 필요한 컬럼과 기간만 읽어 여러 날에 걸친 분석을 할 수 있게 합니다.
+
+    market_archive/
+        date=2026-10-16/market=KOSPI/part-0.parquet
+        date=2026-10-16/market=KOSDAQ/part-0.parquet
+        ...
+
+- 숫자 필드는 float64, 점수는 int16, 시그널은 문자열 리스트, scraped_at은 timestamp
+- 같은 날짜/시장을 다시 저장하면 그 파티션만 교체 (하루에 스냅샷 하나)
+- 읽을 때는 파티션 필터로 기간/시장 밖의 파일을 열지 않고, 요청한 컬럼만 메모리 맵으로 읽음
+
+pyarrow가 필요합니다. (설치되어 있지 않으면 MarketArchive 생성 시 ImportError)
+
+환경 변수:
+    STOCK_ARCHIVE_DIR   아카이브 디렉터리 (기본 market_archive)
+"""
+
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from analysis_state import parse_timestamp
+from stock_record import NUMBER_FIELDS, TEXT_FIELDS
+
+
+ARCHIVE_DIR = os.environ.get('STOCK_ARCHIVE_DIR', 'market_archive')
+
+PARTITION_COLUMNS = ('date', 'market')
+
+# 분석 결과 컬럼 (파티션 컬럼 제외)
+TEXT_COLUMNS = ('ticker', 'name') + TEXT_FIELDS + ('grade', 'recommendation', 'strategy')
+NUMBER_COLUMNS = NUMBER_FIELDS
+
+
+def _to_date(value: Union[str, date, datetime, None]) -> Optional[date]:
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(value)
+
+
+class MarketArchive:
+    """날짜/시장별로 나눈 분석 결과 Parquet 데이터셋"""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        """
+        Args:
+            root: 아카이브 디렉터리
+
+        Raises:
+            ImportError: pyarrow가 설치되어 있지 않은 경우
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        self.root = root
+        self.pa = pa
+        self.schema = pa.schema(
+            [(name, pa.string()) for name in TEXT_COLUMNS[:2]]
+            + [(name, pa.float64()) for name in NUMBER_COLUMNS]
+            + [(name, pa.string()) for name in TEXT_COLUMNS[2:]]
+            + [
+                ('score', pa.int16()),
+                ('signals', pa.list_(pa.string())),
+                ('scraped_at', pa.timestamp('s')),
+            ]
+        )
+        partition_schema = pa.schema([('date', pa.date32()), ('market', pa.string())])
+        self.partitioning = ds.partitioning(partition_schema, flavor='hive')
+        # 읽을 때의 전체 스키마 (파티션 컬럼 포함)
+        self.dataset_schema = pa.unify_schemas([self.schema, partition_schema])
+
+    def to_table(self, analyzed: Sequence[Dict], snapshot_date: date):
+        """분석 결과 리스트를 아카이브 스키마의 Arrow 테이블로 바꿉니다."""
+        pa = self.pa
+        columns = {}
+        for field in self.schema:
+            name = field.name
+            if name == 'scraped_at':
+                values = [parse_timestamp(stock.get(name)) for stock in analyzed]
+            elif name == 'signals':
+                values = [list(stock.get(name) or ()) for stock in analyzed]
+            else:
+                values = [stock.get(name) for stock in analyzed]
+            columns[name] = pa.array(values, type=field.type)
+        columns['date'] = pa.array([snapshot_date] * len(analyzed), type=pa.date32())
+        columns['market'] = pa.array([stock.get('market') or 'UNKNOWN' for stock in analyzed], type=pa.string())
+        return pa.table(columns)
+
+    def append(self, analyzed: Sequence[Dict], snapshot_date: Union[str, date, datetime, None] = None) -> int:
+        """
+        하루치 분석 결과를 저장합니다. 같은 날짜/시장 파티션이 이미 있으면 교체합니다.
+
+        Args:
+            analyzed: analyze_all_stocks 결과
+            snapshot_date: 스냅샷 날짜 (기본 오늘)
+
+        Returns:
+            저장한 행 수
+        """
+        import pyarrow.parquet as pq
+
+        if not analyzed:
+            return 0
+        snapshot_date = _to_date(snapshot_date) or date.today()
+        table = self.to_table(analyzed, snapshot_date)
+        pq.write_to_dataset(
+            table, self.root,
+            partitioning=self.partitioning,
+            existing_data_behavior='delete_matching',
+            basename_template='part-{i}.parquet',
+        )
+        return table.num_rows
+
+    def dates(self) -> List[date]:
+        """아카이브에 있는 스냅샷 날짜 (오름차순)"""
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for entry in os.listdir(self.root):
+            if entry.startswith('date='):
+                try:
+                    found.append(date.fromisoformat(entry[len('date='):]))
+                except ValueError:
+                    continue
+        return sorted(found)
+
+    def read(self, columns: Optional[Iterable[str]] = None,
+             start: Union[str, date, datetime, None] = None,
+             end: Union[str, date, datetime, None] = None,
+             markets: Optional[Iterable[str]] = None):
+        """
+        필요한 컬럼과 기간만 읽습니다.
+
+        Args:
+            columns: 읽을 컬럼 (None이면 전체, date/market은 항상 포함)
+            start: 시작 날짜 (포함, None이면 처음부터)
+            end: 끝 날짜 (포함, None이면 끝까지)
+            markets: 시장 목록 (예: ["KOSPI"], None이면 전체)
+
+        Returns:
+            pyarrow.Table (to_pandas()로 DataFrame 변환)
+        """
+        import pyarrow.parquet as pq
+
+        filters = []
+        start, end = _to_date(start), _to_date(end)
+        if start:
+            filters.append(('date', '>=', start))
+        if end:
+            filters.append(('date', '<=', end))
+        if markets:
+            filters.append(('market', 'in', list(markets)))
+
+        if columns is not None:
+            columns = list(dict.fromkeys(list(PARTITION_COLUMNS) + list(columns)))
+            unknown = [name for name in columns if name not in self.dataset_schema.names]
+            if unknown:
+                raise ValueError(f"Unknown archive columns: {', '.join(unknown)}")
+
+        if not os.path.isdir(self.root):
+            table = self.dataset_schema.empty_table()
+            return table.select(columns) if columns is not None else table
+
+        return pq.read_table(
+            self.root,
+            columns=columns,
+            filters=filters or None,
+            schema=self.dataset_schema,
+            partitioning=self.partitioning,
+            memory_map=True,
+        )
+
+    def read_frame(self, columns: Optional[Iterable[str]] = None, **kwargs):
+        """read() 결과를 pandas DataFrame으로 반환합니다."""
+        return self.read(columns, **kwargs).to_pandas()
@@ -5,16 +5,34 @@ Enhanced Naver Finance Scraper
 Based on DOM structure analysis from finance.naver.com/item/main.naver
 """
 
+import asyncio
 import re
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
+from parser_backend import parse_html, resolve_parser
+from http_session import async_get, get_session, naver_url
+from app_logging import get_logger
+
+
+log = get_logger(__name__)
 
 
 class NaverFinanceScraper:
     """네이버 금융 데이터 스크래퍼"""
     
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None, session: Optional[requests.Session] = None,
+                 async_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            parser: HTML 파서 백엔드 ("auto", "lxml", "html.parser", None이면 기본 설정)
+            session: HTTP 세션 (None이면 연결 풀을 공유하는 기본 세션)
+            async_client: 비동기 경로의 HTTP 클라이언트 (None이면 이벤트 루프마다 공유하는 기본 클라이언트)
+        """
+        self.parser = resolve_parser(parser)
+        self.session = session or get_session()
+        self.async_client = async_client
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
         }
@@ -30,20 +48,43 @@ class NaverFinanceScraper:
             BeautifulSoup 객체 또는 None
         """
         try:
-            url = f"https://finance.naver.com/item/main.naver?code={ticker}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            # Try UTF-8 first, fallback to EUC-KR
-            try:
-                content = response.content.decode('utf-8')
-            except:
-                content = response.content.decode('euc-kr', errors='replace')
+            url = naver_url(f"/item/main.naver?code={ticker}")
+            response = self.session.get(url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+            return self.parse_page(response.content)
+        except Exception as e:
+            log.error("Failed to fetch page", extra={"ticker": ticker, "error": e})
+            return None
+    
+    async def afetch_page(self, ticker: str) -> Optional[BeautifulSoup]:
+        """
+        fetch_page의 비동기 버전 (공유 비동기 클라이언트로 요청, 파싱은 스레드에서 실행)
+        
+        Args:
+            ticker: 종목 코드 (예: "005930")
             
-            return BeautifulSoup(content, 'html.parser')
+        Returns:
+            BeautifulSoup 객체 또는 None
+        """
+        try:
+            url = naver_url(f"/item/main.naver?code={ticker}")
+            response = await async_get(url, client=self.async_client, headers=self.headers)
+            response.raise_for_status()
+            return await asyncio.to_thread(self.parse_page, response.content)
         except Exception as e:
-            print(f"[ERROR] Failed to fetch page for {ticker}: {e}")
+            log.error("Failed to fetch page", extra={"ticker": ticker, "error": e})
             return None
     
+    def parse_page(self, body: bytes) -> BeautifulSoup:
+        """응답 본문을 디코딩해 파싱합니다."""
+        # Try UTF-8 first, fallback to EUC-KR
+        try:
+            content = body.decode('utf-8')
+        except:
+            content = body.decode('euc-kr', errors='replace')
+        
+        return parse_html(content, self.parser)
+    
     def extract_current_price(self, soup: BeautifulSoup) -> str:
         """
         현재가 추출
@@ -71,7 +112,7 @@ class NaverFinanceScraper:
                         price_text = cells[1].get_text(strip=True)
                         return price_text.replace(',', '')
         except Exception as e:
-            print(f"[ERROR] Failed to extract current price: {e}")
+            log.error("Failed to extract current price", extra={"error": e})
         
         return "N/A"
     
@@ -131,7 +172,7 @@ class NaverFinanceScraper:
                         break
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract investment opinion: {e}")
+            log.error("Failed to extract investment opinion", extra={"error": e})
         
         return result
     
@@ -185,7 +226,7 @@ class NaverFinanceScraper:
                         break
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract 52-week range: {e}")
+            log.error("Failed to extract 52-week range", extra={"error": e})
         
         return result
     
@@ -212,7 +253,7 @@ class NaverFinanceScraper:
                     return sector_a.get_text(strip=True)
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract sector: {e}")
+            log.error("Failed to extract sector", extra={"error": e})
         
         return "N/A"
     
@@ -234,8 +275,15 @@ class NaverFinanceScraper:
                 'sector': 업종
             }
         """
-        soup = self.fetch_page(ticker)
-        
+        return self.extract_info(self.fetch_page(ticker))
+    
+    async def aget_stock_info(self, ticker: str) -> Dict[str, str]:
+        """get_stock_info의 비동기 버전 (추출은 스레드에서 실행)"""
+        soup = await self.afetch_page(ticker)
+        return await asyncio.to_thread(self.extract_info, soup)
+    
+    def extract_info(self, soup: Optional[BeautifulSoup]) -> Dict[str, str]:
+        """파싱된 페이지에서 get_stock_info 결과를 만듭니다. (페이지가 없으면 모두 N/A)"""
         if not soup:
             return {
                 'current_price': 'N/A',
@@ -5,36 +5,89 @@
 모든 핵심 지표를 추출합니다.
 """
 
+import asyncio
 import re
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
+from parser_backend import parse_html, resolve_parser
+from http_session import async_get, get_session, naver_url
+from pipeline_metrics import metrics
+from page_extractor import SinglePassExtractor
+from field_patterns import scanner
+from history_store import HistoryStore
+from app_logging import get_logger
+
+
+log = get_logger(__name__)
 
 
 class TradingStrategyScraper:
     """매매 전략 수립을 위한 확장된 스크래퍼"""
     
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None, session: Optional[requests.Session] = None,
+                 history: Optional[HistoryStore] = None, async_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            parser: HTML 파서 백엔드 ("auto", "lxml", "html.parser", None이면 기본 설정)
+            session: HTTP 세션 (None이면 연결 풀을 공유하는 기본 세션)
+            history: 스크래핑 결과를 쌓아 둘 이력 저장소 (None이면 저장하지 않음)
+            async_client: 비동기 경로의 HTTP 클라이언트 (None이면 이벤트 루프마다 공유하는 기본 클라이언트)
+        """
+        self.parser = resolve_parser(parser)
+        self.session = session or get_session()
+        self.async_client = async_client
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
         }
+        self.scanner = scanner
+        self.extractor = SinglePassExtractor(self.scanner)
+        self.history = history
     
     def fetch_page(self, ticker: str) -> Optional[BeautifulSoup]:
         """종목 코드로 네이버 금융 페이지를 가져옵니다."""
         try:
-            url = f"https://finance.naver.com/item/main.naver?code={ticker}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            try:
-                content = response.content.decode('utf-8')
-            except:
-                content = response.content.decode('euc-kr', errors='replace')
-            
-            return BeautifulSoup(content, 'html.parser')
+            url = naver_url(f"/item/main.naver?code={ticker}")
+            with metrics.stage('trading', 'fetch'):
+                response = self.session.get(url, headers=self.headers, timeout=10)
+            metrics.record_response('trading', response.status_code, len(response.content))
+            # 재시도를 다 쓴 뒤의 5xx/오류 페이지는 N/A 결과로 캐시되지 않도록 실패로 처리
+            response.raise_for_status()
+            return self.parse_page(response.content)
         except Exception as e:
-            print(f"[ERROR] Failed to fetch page for {ticker}: {e}")
+            metrics.record_failure('trading', e)
+            log.error("Failed to fetch page", extra={"ticker": ticker, "error": e})
             return None
     
+    async def afetch_page(self, ticker: str) -> Optional[BeautifulSoup]:
+        """
+        fetch_page의 비동기 버전입니다.
+        요청은 공유 비동기 클라이언트로 보내고, 디코딩/파싱은 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        try:
+            url = naver_url(f"/item/main.naver?code={ticker}")
+            with metrics.stage('trading', 'fetch'):
+                response = await async_get(url, client=self.async_client, headers=self.headers)
+            metrics.record_response('trading', response.status_code, len(response.content))
+            response.raise_for_status()
+            return await asyncio.to_thread(self.parse_page, response.content)
+        except Exception as e:
+            metrics.record_failure('trading', e)
+            log.error("Failed to fetch page", extra={"ticker": ticker, "error": e})
+            return None
+    
+    def parse_page(self, body: bytes) -> BeautifulSoup:
+        """응답 본문을 디코딩(UTF-8, 실패하면 EUC-KR)해 파싱합니다."""
+        with metrics.stage('trading', 'decode'):
+            try:
+                content = body.decode('utf-8')
+            except:
+                content = body.decode('euc-kr', errors='replace')
+        
+        with metrics.stage('trading', 'parse'):
+            return parse_html(content, self.parser)
+    
     def _clean_number(self, text: str) -> str:
         """숫자 텍스트를 정리합니다 (쉼표 제거 등)."""
         if not text:
@@ -96,52 +149,19 @@ class TradingStrategyScraper:
             # blind 클래스에서 가격 정보 추출
             blind_dd = soup.find('dd', class_='blind')
             if blind_dd:
-                text = blind_dd.get_text()
-                
-                # 전일종가
-                prev_match = re.search(r'전일가\s*([\d,]+)', text)
-                if prev_match:
-                    result['prev_close'] = prev_match.group(1)
-                
-                # 시가
-                open_match = re.search(r'시가\s*([\d,]+)', text)
-                if open_match:
-                    result['opening_price'] = open_match.group(1)
-                
-                # 고가
-                high_match = re.search(r'고가\s*([\d,]+)', text)
-                if high_match:
-                    result['high_price'] = high_match.group(1)
-                
-                # 저가
-                low_match = re.search(r'저가\s*([\d,]+)', text)
-                if low_match:
-                    result['low_price'] = low_match.group(1)
-                
-                # 상한가
-                upper_match = re.search(r'상한가\s*([\d,]+)', text)
-                if upper_match:
-                    result['upper_limit'] = upper_match.group(1)
-                
-                # 하한가
-                lower_match = re.search(r'하한가\s*([\d,]+)', text)
-                if lower_match:
-                    result['lower_limit'] = lower_match.group(1)
+                # 전일가/시가/고가/저가/상한가/하한가
+                result.update(self.scanner.scan('blind_price', blind_dd.get_text()))
             
             # 52주 최고/최저
             all_elements = soup.find_all(['div', 'td', 'p', 'em'])
             for elem in all_elements:
-                text = elem.get_text(strip=True)
-                if '52주최고' in text and '최저' in text:
-                    normalized = re.sub(r'\s+', ' ', text)
-                    match = re.search(r'52주최고\s*[l|]\s*최저\s*([\d,]+)[l|]([\d,]+)', normalized)
-                    if match:
-                        result['high_52w'] = match.group(1)
-                        result['low_52w'] = match.group(2)
-                        break
+                found = self.scanner.scan('week52', elem.get_text(strip=True))
+                if found:
+                    result.update(found)
+                    break
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract price data: {e}")
+            log.error("Failed to extract price data", extra={"error": e})
         
         return result
     
@@ -166,17 +186,8 @@ class TradingStrategyScraper:
             # blind 클래스에서 거래 정보 추출
             blind_dd = soup.find('dd', class_='blind')
             if blind_dd:
-                text = blind_dd.get_text()
-                
-                # 거래량
-                volume_match = re.search(r'거래량\s*([\d,]+)', text)
-                if volume_match:
-                    result['volume'] = volume_match.group(1)
-                
-                # 거래대금
-                value_match = re.search(r'거래대금\s*([\d,]+)', text)
-                if value_match:
-                    result['trading_value'] = value_match.group(1)
+                # 거래량/거래대금
+                result.update(self.scanner.scan('blind_trading', blind_dd.get_text()))
             
             # 시가총액 (테이블에서 찾기)
             tables = soup.find_all('table')
@@ -192,7 +203,7 @@ class TradingStrategyScraper:
                             break
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract trading data: {e}")
+            log.error("Failed to extract trading data", extra={"error": e})
         
         return result
     
@@ -235,76 +246,40 @@ class TradingStrategyScraper:
                 for row in rows:
                     text = row.get_text(strip=True)
                     
-                    # PER
+                    # PER ("34.84배4,816원" 형태에서 PER과 EPS 분리)
                     if 'PER' in text and 'EPS' in text and '업종PER' not in text:
                         cells = row.find_all('td')
                         if cells:
-                            per_text = cells[0].get_text(strip=True)
-                            # "34.84배4,816원" 형태에서 분리
-                            per_match = re.search(r'([\d.]+)배', per_text)
-                            eps_match = re.search(r'([\d,]+)원', per_text)
-                            if per_match:
-                                result['per'] = per_match.group(1)
-                            if eps_match:
-                                result['eps'] = eps_match.group(1)
+                            result.update(self.scanner.scan('per_cell', cells[0].get_text(strip=True)))
                     
                     # 업종 PER
                     if '업종PER' in text:
                         cells = row.find_all('td')
                         if cells:
-                            per_text = cells[0].get_text(strip=True)
-                            per_match = re.search(r'([\d.]+)배', per_text)
-                            if per_match:
-                                result['per_industry'] = per_match.group(1)
+                            result.update(self.scanner.scan('per_industry_cell', cells[0].get_text(strip=True)))
                     
                     # PBR
                     if 'PBR' in text and 'BPS' in text:
                         cells = row.find_all('td')
                         if cells:
-                            pbr_text = cells[0].get_text(strip=True)
-                            pbr_match = re.search(r'([\d.]+)배', pbr_text)
-                            bps_match = re.search(r'([\d,]+)원', pbr_text)
-                            if pbr_match:
-                                result['pbr'] = pbr_match.group(1)
-                            if bps_match:
-                                result['bps'] = bps_match.group(1)
+                            result.update(self.scanner.scan('pbr_cell', cells[0].get_text(strip=True)))
                     
                     # 배당수익률
                     if '배당' in text or '수익률' in text:
                         cells = row.find_all('td')
                         if cells:
-                            div_text = cells[0].get_text(strip=True)
-                            div_match = re.search(r'([\d.]+)%', div_text)
-                            if div_match:
-                                result['dividend_yield'] = div_match.group(1)
+                            result.update(self.scanner.scan('dividend_cell', cells[0].get_text(strip=True)))
             
-            # 투자의견 및 목표주가
+            # 투자의견 및 목표주가 (점수와 의견은 목표주가가 일치한 블록에서만 추출)
             all_elements = soup.find_all(['div', 'td', 'p', 'em'])
             for elem in all_elements:
-                text = elem.get_text(strip=True)
-                if '투자의견' in text and '목표주가' in text:
-                    normalized = re.sub(r'\s+', ' ', text)
-                    #目标的正则优化: 쉼표 포함 숫자만 정확히 캡처하고 무의미한 텍스트 배제
-                    match = re.search(
-                        r'투자의견\s*[\d.가-힣]*\s*목표주가\s*([\d,]+)원?',
-                        normalized
-                    )
-                    if match:
-                        result['target_price'] = match.group(1)
-                        # 점수와 의견은 별도로 재추출하여 정확도 향상
-                        score_match = re.search(r'([\d.]+)\s*([가-힣]+)', normalized)
-                        if score_match:
-                            result['opinion_score'] = score_match.group(1)
-                            result['opinion'] = score_match.group(2)
-                        break
-                    if match:
-                        result['opinion_score'] = match.group(1)
-                        result['opinion'] = match.group(2)
-                        result['target_price'] = match.group(3)
-                        break
+                found = self.scanner.scan('opinion', elem.get_text(strip=True))
+                if found:
+                    result.update(found)
+                    break
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract valuation metrics: {e}")
+            log.error("Failed to extract valuation metrics", extra={"error": e})
         
         return result
     
@@ -365,7 +340,7 @@ class TradingStrategyScraper:
                                     result['individual_net_buy'] = value
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract supply/demand data: {e}")
+            log.error("Failed to extract supply/demand data", extra={"error": e})
         
         return result
     
@@ -412,7 +387,7 @@ class TradingStrategyScraper:
                                 result['operating_margin'] = value
         
         except Exception as e:
-            print(f"[ERROR] Failed to extract financial data: {e}")
+            log.error("Failed to extract financial data", extra={"error": e})
         
         return result
     
@@ -431,7 +406,7 @@ class TradingStrategyScraper:
                 if sector_a:
                     return sector_a.get_text(strip=True)
         except Exception as e:
-            print(f"[ERROR] Failed to extract sector: {e}")
+            log.error("Failed to extract sector", extra={"error": e})
         
         return "N/A"
     
@@ -450,23 +425,27 @@ class TradingStrategyScraper:
         if not soup:
             return {'error': 'Failed to fetch page'}
         
-        # 모든 정보 추출
-        price_data = self.extract_price_data(soup)
-        trading_data = self.extract_trading_data(soup)
-        valuation_data = self.extract_valuation_metrics(soup)
-        supply_demand_data = self.extract_supply_demand(soup)
-        financial_data = self.extract_financial_data(soup)
-        sector = self.extract_sector(soup)
+        return self.extract_info(ticker, soup)
+    
+    async def aget_complete_trading_info(self, ticker: str) -> Dict[str, str]:
+        """get_complete_trading_info의 비동기 버전 (추출과 이력 저장은 스레드에서 실행)"""
+        soup = await self.afetch_page(ticker)
         
-        # 모든 데이터 병합
-        complete_info = {
-            **price_data,
-            **trading_data,
-            **valuation_data,
-            **supply_demand_data,
-            **financial_data,
-            'sector': sector
-        }
+        if not soup:
+            return {'error': 'Failed to fetch page'}
+        
+        return await asyncio.to_thread(self.extract_info, ticker, soup)
+    
+    def extract_info(self, ticker: str, soup: BeautifulSoup) -> Dict[str, str]:
+        """파싱된 페이지에서 모든 트레이딩 정보를 추출하고 이력에 저장합니다."""
+        # 트리를 한 번만 순회하여 모든 정보 추출
+        # (개별 extract_* 메서드와 동일한 결과)
+        with metrics.stage('trading', 'extract'):
+            complete_info = self.extractor.extract(soup)
+        metrics.record_fields('trading', complete_info)
+        
+        if self.history is not None:
+            self.history.record(ticker, complete_info)
         
         return complete_info
 
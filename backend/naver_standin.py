@@ -0,0 +1,263 @@
+"""
+로컬 네이버 금융 대역 서버 (부하 테스트용)
+
+fixtures/naver/의 저장된 종목 페이지와 합성 시가총액 목록 페이지를 실제 네이버와 같은 경로로
+제공합니다. 스크래퍼와 API 서버는 NAVER_BASE_URL을 이 서버 주소로 바꾸면 finance.naver.com에
+요청하지 않고 그대로 동작합니다.
+
+    /item/main.naver?code=...            종목 페이지 (main.nhn도 동일)
+    /sise/sise_market_sum.naver?sosok=&page=   시가총액 목록 (페이지당 50종목)
+    /__stats                             받은 요청 수 / 일부러 낸 오류 수 / 최대 동시 요청 수 (JSON)
+
+- 픽스처에 없는 종목 코드는 기본 페이지(kospi_005930_full.html)로 응답
+- 목록에는 픽스처 종목 뒤에 합성 종목 코드(900000~)를 채워 list_size개를 만듦
+- 응답마다 latency ± jitter 초 지연, error_rate 비율로 error_status 응답
+
+사용법:
+    python naver_standin.py [--port 8765] [--latency 0.05] [--jitter 0.02]
+                            [--error-rate 0.01] [--error-status 503] [--list-size 2600]
+    NAVER_BASE_URL=http://127.0.0.1:8765 uvicorn main:app
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'naver')
+DEFAULT_ITEM = 'kospi_005930_full.html'
+
+ITEM_PATHS = ('/item/main.naver', '/item/main.nhn')
+LIST_PATH = '/sise/sise_market_sum.naver'
+LIST_ROWS = 50
+
+# 파일명 접두어 -> 시장 (ETF는 코스피 목록에 포함)
+FIXTURE_MARKETS = {'kospi': 'KOSPI', 'kosdaq': 'KOSDAQ', 'etf': 'KOSPI'}
+MARKET_SOSOK = {'KOSPI': 0, 'KOSDAQ': 1}
+
+_FIXTURE_NAME = re.compile(r'^(kospi|kosdaq|etf)_(\d{6})(_full)?\.html$')
+_TITLE = re.compile(r'<title>(.*?) : ', re.S)
+
+
+def fixture_pages(fixture_dir: str = FIXTURE_DIR) -> List[Tuple[str, str]]:
+    """저장된 종목 페이지 전체를 파일명 순서로 읽습니다. [(파일명, HTML), ...]"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def load_item_pages(fixture_dir: str = FIXTURE_DIR) -> Tuple[Dict[str, bytes], List[Tuple[str, str, str]]]:
+    """
+    종목 페이지 픽스처를 읽습니다. 같은 종목의 _full 페이지가 있으면 그것을 사용합니다.
+
+    Returns:
+        (종목 코드 -> 페이지 바이트, [(시장, 종목 코드, 종목명), ...])
+    """
+    pages: Dict[str, bytes] = {}
+    listed: Dict[str, Tuple[str, str, str]] = {}
+    for name, html in fixture_pages(fixture_dir):
+        match = _FIXTURE_NAME.match(name)
+        if not match:
+            continue
+        prefix, code, full = match.groups()
+        if full or code not in pages:
+            pages[code] = html.encode('utf-8')
+        title = _TITLE.search(html)
+        listed[code] = (FIXTURE_MARKETS[prefix], code, title.group(1).strip() if title else code)
+    return pages, list(listed.values())
+
+
+def render_list_page(stocks: List[Tuple[str, str, str]], page: int, rows: int = LIST_ROWS) -> str:
+    """sise_market_sum.naver와 같은 구조의 목록 페이지 (table.type_2, td.pgRR)"""
+    last_page = max(1, (len(stocks) + rows - 1) // rows)
+    page = min(max(1, page), last_page)
+    start = (page - 1) * rows
+    lines = [
+        '<html><head><meta charset="utf-8"><title>시가총액 : Npay 증권</title></head><body>',
+        '<table class="type_2" summary="코스피/코스닥 시가총액 목록">',
+        '<thead><tr><th>N</th><th>종목명</th><th>현재가</th><th>전일비</th><th>등락률</th><th>액면가</th>'
+        '<th>시가총액</th><th>상장주식수</th><th>외국인비율</th><th>거래량</th><th>PER</th><th>ROE</th></tr></thead>',
+        '<tbody>',
+    ]
+    for number, (market, code, name) in enumerate(stocks[start:start + rows], start + 1):
+        seed = int(code)
+        lines.append(
+            f'<tr><td class="no">{number}</td>'
+            f'<td><a href="/item/main.naver?code={code}" class="tltle">{name}</a></td>'
+            f'<td class="number">{1000 + seed % 90000:,}</td><td class="number">{seed % 900:,}</td>'
+            f'<td class="number">{(seed % 600 - 300) / 100:+.2f}%</td><td class="number">100</td>'
+            f'<td class="number">{5000 + seed % 400000:,}</td><td class="number">{seed % 100000 * 1000:,}</td>'
+            f'<td class="number">{seed % 5000 / 100:.2f}</td><td class="number">{seed % 3000000:,}</td>'
+            f'<td class="number">{seed % 4000 / 100:.2f}</td><td class="number">{(seed % 3000 - 1000) / 100:.2f}</td></tr>'
+        )
+    lines.append('</tbody></table>')
+    lines.append(f'<table class="Nnavi"><tr><td class="pgRR"><a href="{LIST_PATH}?sosok=0&amp;page={last_page}">맨뒤</a></td></tr></table>')
+    lines.append('</body></html>')
+    return '\n'.join(lines)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server: 'StandinServer'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+
+        server.count('requests')
+        if url.path == '/__stats':
+            return self.reply(200, json.dumps(server.stats()).encode('utf-8'), 'application/json')
+
+        with server.in_flight():
+            self.respond(server, url, query)
+
+    def respond(self, server: 'StandinServer', url, query):
+        delay = server.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        if server.should_fail():
+            server.count('errors')
+            return self.reply(server.error_status, b'<html><body>temporarily unavailable</body></html>')
+
+        if url.path in ITEM_PATHS:
+            code = query.get('code', [''])[0]
+            return self.reply(200, server.item_pages.get(code, server.default_page))
+        if url.path == LIST_PATH:
+            market = 'KOSDAQ' if query.get('sosok', ['0'])[0] == '1' else 'KOSPI'
+            page = int(query.get('page', ['1'])[0] or 1)
+            return self.reply(200, render_list_page(server.markets[market], page).encode('utf-8'))
+        return self.reply(404, b'<html><body>not found</body></html>')
+
+    def reply(self, status: int, body: bytes, content_type: str = 'text/html; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandinServer(ThreadingHTTPServer):
+    """지연/오류를 설정할 수 있는 네이버 금융 대역 서버"""
+
+    daemon_threads = True
+    # 비동기 클라이언트가 연결 수백 개를 한꺼번에 열어도 거절하지 않도록 (기본 5)
+    request_queue_size = 1024
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, list_size: int = 2600,
+                 fixture_dir: str = FIXTURE_DIR, seed: Optional[int] = None):
+        """
+        Args:
+            host, port: 주소 (port=0이면 빈 포트 자동 선택)
+            latency: 응답마다 기다릴 평균 시간 (초)
+            jitter: 지연 시간 변동 폭 (초, latency ± jitter 균등 분포)
+            error_rate: error_status로 응답할 비율 (0~1)
+            error_status: 오류 응답 상태 코드
+            list_size: 두 시장 목록의 전체 종목 수 (픽스처 종목 포함)
+            fixture_dir: 종목 페이지 픽스처 폴더
+            seed: 지연/오류 난수 시드
+        """
+        super().__init__((host, port), StandinHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self.item_pages, listed = load_item_pages(fixture_dir)
+        with open(os.path.join(fixture_dir, DEFAULT_ITEM), 'rb') as f:
+            self.default_page = f.read()
+
+        stocks = list(listed)
+        for i in range(max(0, list_size - len(stocks))):
+            market = 'KOSPI' if i % 2 == 0 else 'KOSDAQ'
+            stocks.append((market, f"{900000 + i:06d}", f"합성종목{i}"))
+        self.markets = {market: [s for s in stocks if s[0] == market] for market in MARKET_SOSOK}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'errors': 0}
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def count(self, key: str):
+        with self._lock:
+            self._counts[key] += 1
+
+    @contextlib.contextmanager
+    def in_flight(self):
+        """처리 중인 요청 수를 세고 최대 동시 요청 수를 기록합니다."""
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """요청 수, 오류 응답 수, 최대 동시 요청 수"""
+        with self._lock:
+            return dict(self._counts, max_in_flight=self._max_in_flight)
+
+    def start(self) -> 'StandinServer':
+        """백그라운드 스레드에서 요청을 받기 시작합니다."""
+        self._thread = threading.Thread(target=self.serve_forever, name='naver-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="저장된 페이지를 제공하는 로컬 네이버 금융 대역 서버")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--latency', type=float, default=0.05, help="평균 응답 지연 (초)")
+    arg_parser.add_argument('--jitter', type=float, default=0.02, help="지연 변동 폭 (초)")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    arg_parser.add_argument('--error-status', type=int, default=503, help="오류 응답 상태 코드")
+    arg_parser.add_argument('--list-size', type=int, default=2600, help="목록 전체 종목 수")
+    args = arg_parser.parse_args()
+
+    server = StandinServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, error_status=args.error_status, list_size=args.list_size)
+    print(f"네이버 대역 서버: {server.url} (종목 페이지 {len(server.item_pages)}개, 목록 {args.list_size}종목)")
+    print(f"   NAVER_BASE_URL={server.url} 로 API 서버를 실행하세요.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,507 @@
+"""
+네이버 금융 종목 페이지 단일 순회 추출기
+
+TradingStrategyScraper의 extract_* 메서드들은 각자 전체 트리를 다시 훑습니다.
+(find_all('table') 반복, 모든 div/td/p/em 요소의 get_text() 등)
+이 모듈은 파싱된 트리를 한 번만 순회하면서 각 노드를 관심 있는 필드 핸들러에
+전달하고, 요소별 텍스트는 문서 전체 텍스트의 구간으로만 기록합니다.
+결과 딕셔너리는 get_complete_trading_info의 기존 출력과 동일합니다.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from app_logging import get_logger
+from field_patterns import PatternScanner, scanner as default_scanner
+from pipeline_metrics import metrics
+
+
+log = get_logger(__name__)
+
+
+# get_text()가 기본으로 포함하는 문자열 타입 (주석, 스크립트 등 제외)
+_MAIN_STRING_TYPES = (NavigableString, CData)
+
+# 텍스트 구간을 기록할 태그들
+_TRACKED_TAGS = {'div', 'td', 'p', 'em', 'span', 'dd', 'th', 'tr', 'table', 'a', 'h4'}
+
+# 기존 find_all(['div', 'td', 'p', 'em']) 대상 태그
+_BLOCK_TAGS = {'div', 'td', 'p', 'em'}
+
+_TODAY_CLASS = re.compile(r'(today|no_today)')
+_PER_SUMMARY = re.compile(r'PER.*EPS')
+_SECTOR_TH = re.compile(r'업종')
+_SECTOR_H4 = re.compile(r'업종명')
+
+
+class _Node:
+    """순회 중 기록한 요소 정보 (문서 순서, 텍스트 구간, 하위 요소 참조)"""
+
+    __slots__ = (
+        'tag', 'order', 'last_order', 'start', 'end', 'raw_start', 'raw_end',
+        'rows', 'first_th', 'first_td', 'cells', 'first_table',
+    )
+
+    def __init__(self, tag: Tag, order: int, start: int, raw_start: int):
+        self.tag = tag
+        self.order = order
+        self.last_order = order
+        self.start = start
+        self.end = start
+        self.raw_start = raw_start
+        self.raw_end = raw_start
+        self.rows = None
+        self.first_th = None
+        self.first_td = None
+        self.cells = None
+        self.first_table = None
+
+
+class SinglePassExtractor:
+    """파싱된 종목 페이지를 한 번만 순회하여 모든 트레이딩 지표를 추출합니다."""
+
+    def __init__(self, scanner: PatternScanner = default_scanner):
+        """
+        Args:
+            scanner: 필드 정규식 스캐너 (기본값은 모든 스크래퍼가 공유하는 스캐너)
+        """
+        self.scanner = scanner
+
+    def extract(self, soup: BeautifulSoup) -> Dict[str, str]:
+        """
+        종목 페이지에서 모든 트레이딩 지표를 추출합니다.
+
+        Args:
+            soup: 파싱된 네이버 금융 종목 페이지
+
+        Returns:
+            get_complete_trading_info와 같은 키 순서의 딕셔너리
+        """
+        state = _PageState()
+        with metrics.extractor('walk'):
+            state.walk(soup)
+
+        # 추출기별 시간은 /api/metrics의 scrape_extractor_seconds로 확인
+        with metrics.extractor('price_data'):
+            price_data = self._price_data(state)
+        with metrics.extractor('trading_data'):
+            trading_data = self._trading_data(state)
+        with metrics.extractor('valuation_metrics'):
+            valuation_metrics = self._valuation_metrics(state)
+        with metrics.extractor('supply_demand'):
+            supply_demand = self._supply_demand(state)
+        with metrics.extractor('financial_data'):
+            financial_data = self._financial_data(state)
+        with metrics.extractor('sector'):
+            sector = self._sector(state)
+
+        return {
+            **price_data,
+            **trading_data,
+            **valuation_metrics,
+            **supply_demand,
+            **financial_data,
+            'sector': sector,
+        }
+
+    def _price_data(self, state: '_PageState') -> Dict[str, str]:
+        """가격 정보 (extract_price_data와 동일한 규칙)"""
+        result = {
+            'current_price': 'N/A',
+            'opening_price': 'N/A',
+            'high_price': 'N/A',
+            'low_price': 'N/A',
+            'prev_close': 'N/A',
+            'upper_limit': 'N/A',
+            'lower_limit': 'N/A',
+            'high_52w': 'N/A',
+            'low_52w': 'N/A'
+        }
+
+        try:
+            if state.today_div:
+                if state.today_blind:
+                    result['current_price'] = state.text(state.today_blind)
+                else:
+                    emp = state.today_up or state.today_down
+                    if emp:
+                        result['current_price'] = state.text(emp)
+
+            if state.blind_dd:
+                result.update(self.scanner.scan('blind_price', state.raw_text(state.blind_dd)))
+
+            result.update(state.first_block_scan(self.scanner, 'week52'))
+
+        except Exception as e:
+            log.error("Failed to extract price data", extra={"error": e})
+
+        return result
+
+    def _trading_data(self, state: '_PageState') -> Dict[str, str]:
+        """거래 정보 (extract_trading_data와 동일한 규칙)"""
+        result = {
+            'volume': 'N/A',
+            'trading_value': 'N/A',
+            'market_cap': 'N/A'
+        }
+
+        try:
+            if state.blind_dd:
+                result.update(self.scanner.scan('blind_trading', state.raw_text(state.blind_dd)))
+
+            value = state.last_table_row_value(lambda label: '시가총액' in label)
+            if value is not None:
+                result['market_cap'] = value
+
+        except Exception as e:
+            log.error("Failed to extract trading data", extra={"error": e})
+
+        return result
+
+    def _valuation_metrics(self, state: '_PageState') -> Dict[str, str]:
+        """투자 지표 (extract_valuation_metrics와 동일한 규칙)"""
+        result = {
+            'per': 'N/A',
+            'per_industry': 'N/A',
+            'pbr': 'N/A',
+            'pbr_industry': 'N/A',
+            'eps': 'N/A',
+            'bps': 'N/A',
+            'dividend_yield': 'N/A',
+            'opinion_score': 'N/A',
+            'opinion': 'N/A',
+            'target_price': 'N/A'
+        }
+
+        try:
+            if state.per_table:
+                for row in state.per_table.rows:
+                    text = state.text(row)
+                    cell = row.first_td
+
+                    if 'PER' in text and 'EPS' in text and '업종PER' not in text and cell:
+                        result.update(self.scanner.scan('per_cell', state.text(cell)))
+
+                    if '업종PER' in text and cell:
+                        result.update(self.scanner.scan('per_industry_cell', state.text(cell)))
+
+                    if 'PBR' in text and 'BPS' in text and cell:
+                        result.update(self.scanner.scan('pbr_cell', state.text(cell)))
+
+                    if ('배당' in text or '수익률' in text) and cell:
+                        result.update(self.scanner.scan('dividend_cell', state.text(cell)))
+
+            result.update(state.first_block_scan(self.scanner, 'opinion'))
+
+        except Exception as e:
+            log.error("Failed to extract valuation metrics", extra={"error": e})
+
+        return result
+
+    def _supply_demand(self, state: '_PageState') -> Dict[str, str]:
+        """수급 정보 (extract_supply_demand와 동일한 규칙)"""
+        result = {
+            'foreign_ownership': 'N/A',
+            'foreign_net_buy': 'N/A',
+            'institutional_net_buy': 'N/A',
+            'individual_net_buy': 'N/A'
+        }
+
+        try:
+            value = state.last_table_row_value(lambda label: '외국인' in label and '보유' in label)
+            if value is not None:
+                result['foreign_ownership'] = value
+
+            for section in state.sub_sections:
+                text = state.raw_text(section)
+                if '외국인' in text or '기관' in text or '개인' in text:
+                    table = section.first_table
+                    if not table:
+                        continue
+                    for row in table.rows:
+                        if len(row.cells) < 2:
+                            continue
+                        label = state.text(row.cells[0])
+                        value = state.text(row.cells[1])
+
+                        if '외국인' in label:
+                            result['foreign_net_buy'] = value
+                        elif '기관' in label:
+                            result['institutional_net_buy'] = value
+                        elif '개인' in label:
+                            result['individual_net_buy'] = value
+
+        except Exception as e:
+            log.error("Failed to extract supply/demand data", extra={"error": e})
+
+        return result
+
+    def _financial_data(self, state: '_PageState') -> Dict[str, str]:
+        """재무 정보 (extract_financial_data와 동일한 규칙)"""
+        result = {
+            'roe': 'N/A',
+            'debt_ratio': 'N/A',
+            'operating_margin': 'N/A'
+        }
+
+        try:
+            for table in state.tables:
+                summary = table.tag.get('summary', '')
+                if not ('재무' in summary or '분석' in summary):
+                    continue
+                for row in table.rows:
+                    if not row.first_th or not row.first_td:
+                        continue
+
+                    label = state.text(row.first_th)
+                    value = state.text(row.first_td)
+
+                    if 'ROE' in label or '자기자본이익률' in label:
+                        result['roe'] = value
+                    elif '부채비율' in label:
+                        result['debt_ratio'] = value
+                    elif '영업이익률' in label:
+                        result['operating_margin'] = value
+
+        except Exception as e:
+            log.error("Failed to extract financial data", extra={"error": e})
+
+        return result
+
+    def _sector(self, state: '_PageState') -> str:
+        """업종 정보 (extract_sector와 동일한 규칙)"""
+        try:
+            if state.sector_th and state.sector_td:
+                return state.text(state.sector_td)
+
+            if state.sector_h4 and state.sector_a:
+                return state.text(state.sector_a)
+        except Exception as e:
+            log.error("Failed to extract sector", extra={"error": e})
+
+        return "N/A"
+
+
+class _PageState:
+    """한 번의 트리 순회로 수집한 페이지 상태"""
+
+    def __init__(self):
+        self.blocks: List[_Node] = []
+        self.tables: List[_Node] = []
+        self.sub_sections: List[_Node] = []
+
+        self.today_div: Optional[_Node] = None
+        self.today_blind: Optional[_Node] = None
+        self.today_up: Optional[_Node] = None
+        self.today_down: Optional[_Node] = None
+        self.blind_dd: Optional[_Node] = None
+        self.per_table: Optional[_Node] = None
+        self.sector_th: Optional[_Node] = None
+        self.sector_td: Optional[_Node] = None
+        self.sector_h4: Optional[_Node] = None
+        self.sector_a: Optional[_Node] = None
+
+        self._stripped: List[str] = []
+        self._raw: List[str] = []
+        self._offset = 0
+        self._raw_offset = 0
+        self._order = 0
+        self._open_tables: List[_Node] = []
+        self._open_rows: List[_Node] = []
+        self._open_sections: List[_Node] = []
+        self._in_today = False
+
+        self._text = ''
+        self._raw_text = ''
+        self._positions: Dict[str, List[int]] = {}
+
+    def walk(self, root: BeautifulSoup):
+        """트리를 한 번 순회하며 요소 진입/종료와 문자열을 처리합니다."""
+        iterators = [iter(root.contents)]
+        opened: List[Optional[_Node]] = []
+
+        while iterators:
+            node = next(iterators[-1], None)
+
+            if node is None:
+                iterators.pop()
+                if opened:
+                    self._exit(opened.pop())
+                continue
+
+            if isinstance(node, Tag):
+                opened.append(self._enter(node))
+                iterators.append(iter(node.contents))
+            elif type(node) in _MAIN_STRING_TYPES:
+                self._raw.append(node)
+                self._raw_offset += len(node)
+                stripped = node.strip()
+                if stripped:
+                    self._stripped.append(stripped)
+                    self._offset += len(stripped)
+
+        self._text = ''.join(self._stripped)
+        self._raw_text = ''.join(self._raw)
+
+    def _enter(self, tag: Tag) -> Optional[_Node]:
+        name = tag.name
+        if name not in _TRACKED_TAGS:
+            return None
+
+        self._order += 1
+        node = _Node(tag, self._order, self._offset, self._raw_offset)
+        classes = tag.get('class') or []
+
+        if name in _BLOCK_TAGS:
+            self.blocks.append(node)
+
+        if name == 'div':
+            if self.today_div is None and any(_TODAY_CLASS.search(c) for c in classes):
+                self.today_div = node
+                self._in_today = True
+            if 'sub_section' in classes:
+                self.sub_sections.append(node)
+                self._open_sections.append(node)
+
+        elif name == 'span':
+            if self._in_today and self.today_blind is None and 'blind' in classes:
+                self.today_blind = node
+
+        elif name == 'em':
+            if self._in_today:
+                if self.today_up is None and 'no_up' in classes:
+                    self.today_up = node
+                if self.today_down is None and 'no_down' in classes:
+                    self.today_down = node
+
+        elif name == 'dd':
+            if self.blind_dd is None and 'blind' in classes:
+                self.blind_dd = node
+
+        elif name == 'table':
+            node.rows = []
+            self.tables.append(node)
+            if self.per_table is None and _PER_SUMMARY.search(tag.get('summary', '')):
+                self.per_table = node
+            for section in self._open_sections:
+                if section.first_table is None:
+                    section.first_table = node
+            self._open_tables.append(node)
+
+        elif name == 'tr':
+            node.cells = []
+            for table in self._open_tables:
+                table.rows.append(node)
+            self._open_rows.append(node)
+
+        elif name == 'th':
+            for row in self._open_rows:
+                if row.first_th is None:
+                    row.first_th = node
+                row.cells.append(node)
+            if self.sector_th is None and _matches_string(tag, _SECTOR_TH):
+                self.sector_th = node
+
+        elif name == 'td':
+            for row in self._open_rows:
+                if row.first_td is None:
+                    row.first_td = node
+                row.cells.append(node)
+            if self.sector_th is not None and self.sector_td is None:
+                self.sector_td = node
+
+        elif name == 'h4':
+            if self.sector_h4 is None and _matches_string(tag, _SECTOR_H4):
+                self.sector_h4 = node
+
+        elif name == 'a':
+            if self.sector_h4 is not None and self.sector_a is None:
+                self.sector_a = node
+
+        return node
+
+    def _exit(self, node: Optional[_Node]):
+        if node is None:
+            return
+
+        node.end = self._offset
+        node.raw_end = self._raw_offset
+        node.last_order = self._order
+
+        if node is self.today_div:
+            self._in_today = False
+        if self._open_sections and node is self._open_sections[-1]:
+            self._open_sections.pop()
+        if self._open_tables and node is self._open_tables[-1]:
+            self._open_tables.pop()
+        if self._open_rows and node is self._open_rows[-1]:
+            self._open_rows.pop()
+
+    def text(self, node: _Node) -> str:
+        """get_text(strip=True)와 같은 결과"""
+        return self._text[node.start:node.end]
+
+    def raw_text(self, node: _Node) -> str:
+        """get_text()와 같은 결과"""
+        return self._raw_text[node.raw_start:node.raw_end]
+
+    def _contains(self, node: _Node, keyword: str) -> bool:
+        positions = self._positions.get(keyword)
+        if positions is None:
+            positions = []
+            index = self._text.find(keyword)
+            while index != -1:
+                positions.append(index)
+                index = self._text.find(keyword, index + 1)
+            self._positions[keyword] = positions
+
+        i = bisect_left(positions, node.start)
+        return i < len(positions) and positions[i] + len(keyword) <= node.end
+
+    def first_block_scan(self, scanner: PatternScanner, group_name: str) -> Dict[str, str]:
+        """
+        문서 순서상 처음으로 묶음 키워드를 모두 포함하고 패턴이 일치하는 div/td/p/em을 찾아
+        그 블록의 스캔 결과를 반환합니다.
+
+        하위 요소의 텍스트는 상위 요소 텍스트의 일부이므로, 패턴이 일치하지 않은
+        요소의 하위 요소들은 검사하지 않고 건너뜁니다.
+
+        Returns:
+            일치한 필드 -> 값 (일치하는 블록이 없으면 빈 딕셔너리)
+        """
+        keywords = scanner.groups[group_name].keywords
+        skip_until = 0
+        for node in self.blocks:
+            if node.order <= skip_until:
+                continue
+            if not all(self._contains(node, keyword) for keyword in keywords):
+                continue
+
+            found = scanner.scan(group_name, self.text(node))
+            if found:
+                return found
+            skip_until = node.last_order
+
+        return {}
+
+    def last_table_row_value(self, label_matches) -> Optional[str]:
+        """
+        테이블마다 첫 번째 th 라벨이 조건을 만족하는 첫 행의 td 값을 찾고,
+        문서 순서상 마지막 테이블의 값을 반환합니다.
+        """
+        value = None
+        for table in self.tables:
+            for row in table.rows:
+                if row.first_th and row.first_td and label_matches(self.raw_text(row.first_th)):
+                    value = self.text(row.first_td)
+                    break
+        return value
+
+
+def _matches_string(tag: Tag, pattern) -> bool:
+    """find(name, string=pattern)과 같이 태그의 .string에 패턴을 적용합니다."""
+    string = tag.string
+    return string is not None and pattern.search(string) is not None
@@ -0,0 +1,67 @@
+"""
+HTML 파서 백엔드 선택
+
+스크래퍼들은 모두 BeautifulSoup 트리를 사용하므로, 같은 트리 API를 유지하면서
+파서만 교체합니다. C 기반 lxml 파서를 우선 사용하고, 설치되어 있지 않으면
+기존 파이썬 내장 html.parser로 대체합니다.
+
+환경 변수 STOCK_HTML_PARSER로 기본 파서를 지정할 수 있습니다. ("auto", "lxml", "html.parser")
+"""
+
+import os
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from app_logging import get_logger
+
+
+log = get_logger(__name__)
+
+
+# 빠른 순서대로 나열한 파서 백엔드
+PARSER_BACKENDS = ('lxml', 'html.parser')
+
+FALLBACK_PARSER = 'html.parser'
+
+DEFAULT_PARSER = os.environ.get('STOCK_HTML_PARSER', 'auto')
+
+
+def available_parsers() -> List[str]:
+    """현재 환경에서 사용할 수 있는 파서 백엔드 목록을 반환합니다."""
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """
+    요청한 파서 이름을 실제로 사용할 파서로 변환합니다.
+
+    Args:
+        name: "auto", "lxml", "html.parser" 또는 None (None이면 DEFAULT_PARSER)
+
+    Returns:
+        BeautifulSoup에 전달할 파서 이름
+    """
+    name = name or DEFAULT_PARSER
+    available = available_parsers()
+
+    if name == 'auto':
+        return available[0] if available else FALLBACK_PARSER
+
+    if name not in available:
+        log.warning("HTML parser is not available, falling back", extra={"parser": name, "fallback": FALLBACK_PARSER})
+        return FALLBACK_PARSER
+
+    return name
+
+
+def parse_html(content: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    HTML 문자열을 선택된 파서 백엔드로 파싱합니다.
+
+    Args:
+        content: 디코딩된 HTML 문자열
+        parser: 파서 이름 (None이면 DEFAULT_PARSER)
+    """
+    return BeautifulSoup(content, resolve_parser(parser))
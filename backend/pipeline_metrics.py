@@ -0,0 +1,235 @@
+"""
+스크래핑 파이프라인 단계별 지표 (Prometheus 텍스트 형식)
+
+종목 페이지 하나를 가져오는 동안 각 단계(fetch, decode, parse, extract)와 추출기별
+(price_data, trading_data, ... sector) 소요 시간을 히스토그램으로, 네이버 응답의 상태 코드와
+크기, 필드별 추출 실패(N/A) 횟수를 카운터로 모읍니다. 캐시 적중률 같은 다른 모듈의 통계는
+수집기(collector)로 등록해 /api/metrics 응답에 함께 넣습니다.
+
+    with metrics.stage('trading', 'fetch'):
+        response = session.get(url)
+    metrics.record_response('trading', response.status_code, len(response.content))
+
+prometheus_client 없이 텍스트 형식(0.0.4)을 직접 만듭니다.
+
+trace_stages() 블록 안에서는 같은 요청(스레드/태스크 컨텍스트)에서 측정한 단계 시간을
+목록으로도 받을 수 있습니다. (요청 프로파일링용, request_profiler.py)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app_logging import get_logger
+
+
+log = get_logger(__name__)
+
+
+# 단계 소요 시간 버킷 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 응답 크기 버킷 (바이트)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 131072, 262144, 524288, 1048576, 4194304)
+
+# 지표 이름 -> (종류, 설명)
+METRICS = {
+    'scrape_stage_seconds': ('histogram', "Time spent in each scrape stage (fetch, decode, parse, extract)"),
+    'scrape_extractor_seconds': ('histogram', "Time spent in each field extractor of the trading scraper"),
+    'naver_http_responses_total': ('counter', "Naver HTTP responses by status code"),
+    'naver_http_response_bytes': ('histogram', "Size of Naver HTTP response bodies"),
+    'scrape_failures_total': ('counter', "Page scrapes that raised an exception, by error type"),
+    'scrape_pages_total': ('counter', "Pages run through field extraction"),
+    'scrape_field_missing_total': ('counter', "Extracted fields that came back as N/A"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# trace_stages() 블록 안에서 timer()가 (지표 이름, 라벨, 초)를 덧붙이는 목록
+_stage_trace: ContextVar[Optional[List[Tuple[str, LabelKey, float]]]] = ContextVar('stage_trace', default=None)
+
+
+@contextmanager
+def trace_stages():
+    """
+    블록 안에서 현재 컨텍스트가 측정한 timer() 구간을 모읍니다.
+
+    Returns:
+        (지표 이름, 라벨, 소요 시간(초)) 목록 - 블록이 끝난 뒤 채워진 상태로 읽습니다.
+    """
+    trace: List[Tuple[str, LabelKey, float]] = []
+    token = _stage_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _stage_trace.reset(token)
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: LabelKey) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else f"{bound:g}"
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum:.6g}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+
+def format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PipelineMetrics:
+    """스레드 안전한 히스토그램/카운터 모음"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """블록 실행 시간을 name 히스토그램에 기록합니다. (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(name, elapsed, **labels)
+            trace = _stage_trace.get()
+            if trace is not None:
+                trace.append((name, tuple(sorted(labels.items())), elapsed))
+
+    def stage(self, scraper: str, stage: str):
+        """스크래핑 단계 시간 (fetch, decode, parse, extract)"""
+        return self.timer('scrape_stage_seconds', scraper=scraper, stage=stage)
+
+    def extractor(self, name: str):
+        """필드 추출기 하나의 시간 (price_data, trading_data, ...)"""
+        return self.timer('scrape_extractor_seconds', extractor=name)
+
+    def record_response(self, scraper: str, status: int, size: int):
+        self.inc('naver_http_responses_total', scraper=scraper, status=str(status))
+        self.observe('naver_http_response_bytes', size, buckets=BYTE_BUCKETS, scraper=scraper)
+
+    def record_failure(self, scraper: str, error: BaseException):
+        self.inc('scrape_failures_total', scraper=scraper, error=type(error).__name__)
+
+    def record_fields(self, scraper: str, result: Dict):
+        """추출 결과에서 값이 N/A인 필드를 실패로 셉니다."""
+        self.inc('scrape_pages_total', scraper=scraper)
+        for field, value in result.items():
+            if value == 'N/A':
+                self.inc('scrape_field_missing_total', scraper=scraper, field=field)
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        """render() 때마다 호출해 결과 줄을 덧붙일 함수를 등록합니다."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict:
+        """테스트/디버깅용: {이름: {라벨: 값 또는 (count, sum)}}"""
+        with self._lock:
+            result = {name: dict(series) for name, series in self._counters.items()}
+            for name, series in self._histograms.items():
+                result[name] = {key: (h.count, h.sum) for key, h in series.items()}
+        return result
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                series = self._histograms.get(name) if kind == 'histogram' else self._counters.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels in sorted(series):
+                    if kind == 'histogram':
+                        lines.extend(series[labels].lines(name, labels))
+                    else:
+                        lines.append(f"{name}{format_labels(labels)} {series[labels]:g}")
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                log.warning("Metrics collector failed", extra={"error": e})
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+# ResponseCache.stats() 키 -> (지표 이름, 종류)
+CACHE_METRICS = {
+    'hits': ('response_cache_hits_total', 'counter'),
+    'misses': ('response_cache_misses_total', 'counter'),
+    'disk_hits': ('response_cache_disk_hits_total', 'counter'),
+    'hit_rate': ('response_cache_hit_ratio', 'gauge'),
+    'entries': ('response_cache_entries', 'gauge'),
+}
+
+
+def cache_metric_lines(caches: Dict[str, Dict]) -> List[str]:
+    """
+    여러 캐시의 ResponseCache.stats() 결과를 지표 줄로 바꿉니다.
+
+    Args:
+        caches: 캐시 이름 -> stats() 결과
+    """
+    lines = []
+    for key, (name, kind) in CACHE_METRICS.items():
+        lines.append(f"# TYPE {name} {kind}")
+        for cache_name, stats in caches.items():
+            lines.append(f"{name}{format_labels((('cache', cache_name),))} {stats[key]:g}")
+    return lines
+
+
+# 모든 스크래퍼가 공유하는 지표
+metrics = PipelineMetrics()
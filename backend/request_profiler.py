@@ -0,0 +1,191 @@
+"""
+분석 엔드포인트 요청 프로파일링
+
+운영 중 느린 요청 하나를 골라 원인을 보기 위한 도구입니다. 토큰을 가진 요청만
+?profile=1 (또는 X-Profile: 1 헤더)로 cProfile을 켤 수 있고, 응답에 함수별 누적 시간 상위 목록과
+단계별(fetch/decode/parse/extract, 추출기별) 소요 시간이 함께 실립니다.
+
+모든 분석 요청의 단계별 시간은 pipeline_metrics.trace_stages()로 가볍게 모으고,
+가장 느린 N개 요청을 (프로파일이 있으면 함께) 보관해 /api/profile/slowest로 보여줍니다.
+
+설정 (환경 변수):
+    STOCK_PROFILE_TOKEN        프로파일링 토큰 (X-Profile-Token 헤더). 비어 있으면 프로파일링 비활성
+    STOCK_PROFILE_SLOWEST      보관할 가장 느린 요청 수 (기본 20)
+    STOCK_PROFILE_SAMPLE_RATE  토큰 없이도 cProfile을 켤 요청 비율 (기본 0, 느린 요청 목록용)
+    STOCK_PROFILE_TOP          프로파일에 실을 함수 수 (기본 30)
+
+cProfile은 프로세스에 하나만 켤 수 있으므로(Python 3.12) 동시에 들어온 프로파일 요청은
+단계별 시간만 받습니다. (profile.stats가 null)
+"""
+
+import cProfile
+import heapq
+import hmac
+import itertools
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app_logging import get_logger
+from pipeline_metrics import trace_stages
+
+
+log = get_logger(__name__)
+
+
+PROFILE_TOKEN = os.environ.get('STOCK_PROFILE_TOKEN', '')
+PROFILE_SLOWEST = int(os.environ.get('STOCK_PROFILE_SLOWEST', '20'))
+PROFILE_SAMPLE_RATE = float(os.environ.get('STOCK_PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOP = int(os.environ.get('STOCK_PROFILE_TOP', '30'))
+
+
+def stage_label(name: str, labels) -> str:
+    """trace_stages() 항목 이름 (예: trading.fetch, extractor.price_data)"""
+    values = dict(labels)
+    if name == 'scrape_stage_seconds':
+        return f"{values.get('scraper')}.{values.get('stage')}"
+    if name == 'scrape_extractor_seconds':
+        return f"extractor.{values.get('extractor')}"
+    return '.'.join([name] + [str(value) for value in values.values()])
+
+
+def top_functions(profile: cProfile.Profile, limit: int) -> List[Dict]:
+    """누적 시간 순 상위 함수 목록"""
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({function})",
+            'calls': calls,
+            'total_ms': round(total * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+class ProfileRun:
+    """요청 하나의 측정 결과"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.started_at = time.time()
+        self.elapsed = 0.0
+        self.stages: List[Dict] = []
+        self.stats: Optional[List[Dict]] = None
+
+    def timings(self) -> Dict[str, float]:
+        """단계별 소요 시간 합계 (ms). 같은 단계가 여러 번이면 더합니다."""
+        timings = {'total': round(self.elapsed * 1000, 3)}
+        for stage in self.stages:
+            timings[stage['stage']] = round(timings.get(stage['stage'], 0) + stage['ms'], 3)
+        return timings
+
+    def report(self) -> Dict:
+        return {
+            'path': self.path,
+            'started_at': self.started_at,
+            'timings_ms': self.timings(),
+            'stats': self.stats,
+        }
+
+
+class RequestProfiler:
+    """토큰 확인, 요청 측정, 가장 느린 N개 요청 보관"""
+
+    def __init__(self, token: str = PROFILE_TOKEN, slowest: int = PROFILE_SLOWEST,
+                 sample_rate: float = PROFILE_SAMPLE_RATE, top: int = PROFILE_TOP):
+        """
+        Args:
+            token: 프로파일링 토큰 (빈 문자열이면 비활성)
+            slowest: 보관할 가장 느린 요청 수
+            sample_rate: 토큰 없이 cProfile을 켤 요청 비율 (0~1)
+            top: 프로파일에 실을 함수 수
+        """
+        self.token = token
+        self.slowest_size = slowest
+        self.sample_rate = sample_rate
+        self.top = top
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+        self._slowest: List = []  # (elapsed, 순번, ProfileRun) 최소 힙
+        self._sequence = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """토큰이 설정되어 있고 일치하는지 확인합니다."""
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    def sampled(self) -> bool:
+        """이번 요청을 sample_rate 표본으로 프로파일할지 정합니다."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def run(self, path: str, profile: Optional[bool] = None):
+        """
+        블록을 측정하고 가장 느린 요청 목록에 반영합니다.
+
+        Args:
+            path: 요청 경로 (보고서용)
+            profile: True면 cProfile을 켜고, False면 끄고, None이면 sample_rate 비율로 켬
+                     (비동기 요청은 이벤트 루프 스레드의 다른 요청까지 섞이므로 False)
+
+        Returns:
+            ProfileRun - 블록이 끝난 뒤 report()로 결과를 읽습니다.
+        """
+        run = ProfileRun(path)
+        if profile is None:
+            profile = self.sampled()
+        profiler = None
+        if profile and self._cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # 다른 프로파일러가 이미 켜져 있음
+                log.warning("Request profiling skipped", extra={"error": e})
+                self._cprofile_lock.release()
+                profiler = None
+        with trace_stages() as trace:
+            start = time.perf_counter()
+            try:
+                yield run
+            finally:
+                run.elapsed = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.disable()
+                    self._cprofile_lock.release()
+                    run.stats = top_functions(profiler, self.top)
+                run.stages = [{'stage': stage_label(name, labels), 'ms': round(elapsed * 1000, 3)}
+                              for name, labels, elapsed in trace]
+                self._remember(run)
+
+    def _remember(self, run: ProfileRun):
+        if self.slowest_size <= 0:
+            return
+        item = (run.elapsed, next(self._sequence), run)
+        with self._lock:
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, item)
+            elif run.elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def slowest(self) -> List[Dict]:
+        """보관 중인 요청 보고서 (느린 순)"""
+        with self._lock:
+            runs = sorted(self._slowest, reverse=True)
+        return [run.report() for _, _, run in runs]
+
+    def clear(self):
+        with self._lock:
+            self._slowest.clear()
+
+
+# 분석 엔드포인트가 공유하는 프로파일러
+request_profiler = RequestProfiler()
@@ -0,0 +1,318 @@
+"""
+스크래핑 결과 응답 캐시
+
+/api/trading-analysis, /api/analyze 앞에 두는 프로세스 내 LRU 캐시입니다.
+같은 종목을 짧은 시간 안에 다시 조회하면 네이버 페이지를 다시 받지 않습니다.
+
+- 필드별 TTL: 가격/거래 정보는 빨리, 투자지표는 중간, 업종/재무 정보는 천천히 만료
+  (필드마다 저장 시각을 따로 두어 만료된 필드가 있을 때만 다시 가져오고, 다시 가져온 값은 모든 필드에 반영)
+- 최대 항목 수 제한 (가장 오래 사용하지 않은 항목부터 제거)
+- 적중/미스 카운터
+- 선택적 디스크 계층 (SQLite, 재시작 후에도 유지)
+
+환경 변수로 설정을 바꿀 수 있습니다.
+    STOCK_CACHE_MAX_ENTRIES     메모리 캐시 최대 항목 수 (기본 1024)
+    STOCK_CACHE_PRICE_TTL       가격/거래/수급 필드 TTL 초 (기본 60)
+    STOCK_CACHE_VALUATION_TTL   투자지표/투자의견 필드 TTL 초 (기본 3600)
+    STOCK_CACHE_FINANCIAL_TTL   업종/재무 필드 TTL 초 (기본 86400)
+    STOCK_CACHE_DB              디스크 계층 SQLite 파일 경로 (없으면 사용 안 함)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+MAX_ENTRIES = int(os.environ.get('STOCK_CACHE_MAX_ENTRIES', '1024'))
+PRICE_TTL = float(os.environ.get('STOCK_CACHE_PRICE_TTL', '60'))
+VALUATION_TTL = float(os.environ.get('STOCK_CACHE_VALUATION_TTL', '3600'))
+FINANCIAL_TTL = float(os.environ.get('STOCK_CACHE_FINANCIAL_TTL', '86400'))
+DISK_PATH = os.environ.get('STOCK_CACHE_DB') or None
+
+PRICE_FIELDS = (
+    'current_price', 'opening_price', 'high_price', 'low_price', 'prev_close',
+    'upper_limit', 'lower_limit', 'volume', 'trading_value', 'market_cap',
+    'foreign_ownership', 'foreign_net_buy', 'institutional_net_buy', 'individual_net_buy',
+)
+VALUATION_FIELDS = (
+    'per', 'per_industry', 'pbr', 'pbr_industry', 'eps', 'bps', 'dividend_yield',
+    'opinion', 'opinion_score', 'target_price', 'high_52w', 'low_52w',
+)
+FINANCIAL_FIELDS = ('roe', 'debt_ratio', 'operating_margin', 'sector')
+
+
+def default_field_ttls() -> Dict[str, float]:
+    """필드 이름별 기본 TTL(초)을 반환합니다."""
+    ttls = {}
+    ttls.update({field: PRICE_TTL for field in PRICE_FIELDS})
+    ttls.update({field: VALUATION_TTL for field in VALUATION_FIELDS})
+    ttls.update({field: FINANCIAL_TTL for field in FINANCIAL_FIELDS})
+    return ttls
+
+
+class ResponseCache:
+    """필드별 TTL을 지원하는 LRU 응답 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        field_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = PRICE_TTL,
+        disk_path: Optional[str] = DISK_PATH,
+    ):
+        """
+        Args:
+            max_entries: 메모리에 보관할 최대 항목 수
+            field_ttls: 필드 이름별 TTL(초) (None이면 default_field_ttls())
+            default_ttl: field_ttls에 없는 필드의 TTL(초)
+            disk_path: 디스크 계층 SQLite 파일 경로 (None이면 메모리만 사용)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.field_ttls = field_ttls if field_ttls is not None else default_field_ttls()
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        # 키 -> (필드별 저장 시각, 값)
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, float], Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # 디스크 읽기/쓰기는 메모리 잠금과 따로 (디스크를 기다리는 동안 메모리 조회를 막지 않음)
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, stamps TEXT)'
+        )
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(response_cache)')]
+        if 'stamps' not in columns:  # 필드별 저장 시각 이전에 만든 파일
+            self._db.execute('ALTER TABLE response_cache ADD COLUMN stamps TEXT')
+        # stored_at은 가장 최근 필드 저장 시각 - 가장 긴 TTL보다 오래되었으면 쓸 수 있는 필드가 없음
+        max_ttl = max([self.default_ttl, *self.field_ttls.values()])
+        self._db.execute('DELETE FROM response_cache WHERE stored_at < ?', (time.time() - max_ttl,))
+        self._db.commit()
+
+    def ttl_for(self, fields: Iterable[str]) -> float:
+        """주어진 필드들이 모두 신선하게 유지되는 시간(초) = 필드 TTL 중 최솟값"""
+        return min((self.field_ttls.get(field, self.default_ttl) for field in fields), default=self.default_ttl)
+
+    def lookup(self, key: str, fields: Optional[Iterable[str]] = None,
+               max_age: Optional[float] = None) -> Tuple[Optional[Dict], List[str]]:
+        """
+        필드별로 신선한 값과 만료된 필드를 나누어 반환합니다.
+
+        Args:
+            key: 캐시 키 (예: "trading:005930")
+            fields: 확인할 필드 목록 (None이면 저장된 모든 필드)
+            max_age: 필드 TTL 대신 적용할 최대 경과 시간(초) (예: 내보내기처럼 조금 오래된 값도 되는 경우)
+
+        Returns:
+            (신선한 필드만 담은 딕셔너리, 만료되었거나 없는 필드 목록)
+            항목이 없으면 (None, fields 목록)
+        """
+        now = time.time()
+        entry = self._memory_entry(key)
+        from_disk = False
+        if entry is None and self._db is not None:
+            entry = self._load_from_disk(key)
+            from_disk = entry is not None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None, list(fields or [])
+
+            stamps, value = entry
+            wanted = list(fields) if fields is not None else list(value)
+            fresh, stale = {}, []
+            for field in wanted:
+                limit = self.field_ttls.get(field, self.default_ttl) if max_age is None else max_age
+                if field in value and now - stamps[field] < limit:
+                    fresh[field] = value[field]
+                else:
+                    stale.append(field)
+
+            # 일부 필드가 만료되었어도 나머지를 다시 쓸 수 있도록 메모리에 올려 둠
+            if from_disk:
+                self._remember(key, entry)
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+            if stale:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += from_disk
+            return fresh, stale
+
+    def get(self, key: str, fields: Optional[Iterable[str]] = None,
+            max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        캐시된 값을 반환합니다.
+
+        Args:
+            key: 캐시 키 (예: "trading:005930")
+            fields: 신선해야 하는 필드 목록 (None이면 저장된 모든 필드)
+            max_age: 필드 TTL 대신 적용할 최대 경과 시간(초)
+
+        Returns:
+            요청한 필드가 각자의 TTL(또는 max_age) 안에 있으면 저장된 딕셔너리의 복사본, 아니면 None
+        """
+        fresh, stale = self.lookup(key, fields, max_age)
+        if fresh is None or stale:
+            return None
+        entry = self._memory_entry(key)
+        return dict(entry[1]) if entry is not None else fresh
+
+    def set(self, key: str, value: Dict, stored_at: Optional[float] = None):
+        """
+        결과를 저장합니다. 모든 필드의 저장 시각을 stored_at으로 바꿉니다. 오류 응답은 저장하지 않습니다.
+
+        Args:
+            key: 캐시 키
+            value: 결과 딕셔너리
+            stored_at: 결과를 가져온 시각 (이력에서 다시 올릴 때, 기본 현재 시각)
+        """
+        if not isinstance(value, dict) or 'error' in value:
+            return
+
+        stored_at = time.time() if stored_at is None else stored_at
+        self._store(key, ({field: stored_at for field in value}, dict(value)))
+
+    def merge(self, key: str, value: Dict) -> Dict:
+        """
+        새로 가져온 결과의 모든 필드를 새 값과 새 저장 시각으로 바꿉니다.
+        필드별 TTL은 다시 가져올지만 정하고, 이미 받아 온 새 값을 버리지는 않습니다.
+        (예: 가격이 만료되어 페이지를 다시 받으면 재무 정보도 새 값으로 바뀌고 하루짜리 TTL이 다시 시작)
+        새 결과에 없는 필드는 아직 TTL 안이면 기존 값과 저장 시각을 유지합니다.
+
+        Args:
+            key: 캐시 키
+            value: 새로 가져온 결과 딕셔너리 (오류 응답이면 저장하지 않고 그대로 반환)
+
+        Returns:
+            저장된 결과의 복사본
+        """
+        if not isinstance(value, dict) or 'error' in value:
+            return value
+
+        now = time.time()
+        merged, stamps = dict(value), {field: now for field in value}
+        entry = self._memory_entry(key)
+        if entry is not None:
+            old_stamps, old_value = entry
+            for field, old in old_value.items():
+                if field not in value and now - old_stamps[field] < self.field_ttls.get(field, self.default_ttl):
+                    merged[field] = old
+                    stamps[field] = old_stamps[field]
+        self._store(key, (stamps, merged))
+        return dict(merged)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Dict], fields: Optional[Iterable[str]] = None) -> Dict:
+        """
+        캐시에 신선한 값이 있으면 반환하고, 없으면 fetch()를 호출해 결과를 반영(merge)한 뒤 반환합니다.
+        """
+        cached = self.get(key, fields)
+        if cached is not None:
+            return cached
+        return self.merge(key, fetch())
+
+    async def aget(self, key: str, fields: Optional[Iterable[str]] = None,
+                   max_age: Optional[float] = None) -> Optional[Dict]:
+        """get의 비동기 버전 (디스크 계층이 있으면 SQLite 조회를 작업 스레드에서)"""
+        if self._db is None or key in self._entries:
+            return self.get(key, fields, max_age)
+        return await asyncio.to_thread(self.get, key, fields, max_age)
+
+    async def amerge(self, key: str, value: Dict) -> Dict:
+        """merge의 비동기 버전 (디스크 계층이 있으면 SQLite 쓰기를 작업 스레드에서)"""
+        if self._db is None:
+            return self.merge(key, value)
+        return await asyncio.to_thread(self.merge, key, value)
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Dict]],
+                            fields: Optional[Iterable[str]] = None) -> Dict:
+        """get_or_fetch의 비동기 버전 (fetch는 코루틴을 반환하는 함수)"""
+        cached = await self.aget(key, fields)
+        if cached is not None:
+            return cached
+        return await self.amerge(key, await fetch())
+
+    def invalidate(self, key: str):
+        """항목 하나를 메모리와 디스크에서 제거합니다."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM response_cache WHERE key = ?', (key,))
+                self._db.commit()
+
+    def clear(self):
+        """모든 항목과 카운터를 초기화합니다."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM response_cache')
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        """캐시 적중률 통계를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'disk_enabled': self._db is not None,
+            }
+
+    def _memory_entry(self, key: str) -> Optional[Tuple[Dict[str, float], Dict]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _store(self, key: str, entry: Tuple[Dict[str, float], Dict]):
+        with self._lock:
+            self._remember(key, entry)
+        if self._db is not None:
+            stamps, value = entry
+            with self._db_lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO response_cache (key, value, stored_at, stamps) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value, ensure_ascii=False), max(stamps.values(), default=time.time()),
+                     json.dumps(stamps))
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple[Dict[str, float], Dict]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[Dict[str, float], Dict]]:
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT value, stored_at, stamps FROM response_cache WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        # 필드별 저장 시각이 없는 예전 행은 모든 필드를 stored_at에 저장한 것으로
+        stamps = json.loads(row[2]) if row[2] else {field: row[1] for field in value}
+        return stamps, value
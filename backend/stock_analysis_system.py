@@ -6,19 +6,42 @@ AI 기반 투자 공략 정보를 제공합니다.
 """
 
 from naver_scraper_trading import TradingStrategyScraper
+from async_scrape_engine import AsyncScrapeEngine, DEFAULT_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND
+from analysis_state import AnalysisState, STATE_PATH
+from history_store import HistoryStore
+from market_archive import ARCHIVE_DIR, MarketArchive
+from stock_universe import StockUniverse
+from vector_scoring import score_stock_records
+from stock_record import StockRecord, format_field
+from table_export import write_table
+from app_logging import flush as flush_logs, get_logger
 from pykrx import stock
-import pandas as pd
 from datetime import datetime
-from typing import List, Dict
-import time
+from typing import List, Dict, Optional
+
+
+log = get_logger(__name__)
+
+# 종목별 진행 줄은 DEBUG로 남기고, INFO로는 이 개수마다 한 번 진행 상황을 보여줍니다.
+PROGRESS_EVERY = 100
 
 
 class StockAnalysisSystem:
     """AI 기반 종합 주식 분석 시스템"""
     
-    def __init__(self):
-        self.scraper = TradingStrategyScraper()
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY,
+                 requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+                 history: Optional[HistoryStore] = None):
+        """
+        Args:
+            concurrency: 동시에 스크래핑할 최대 종목 수
+            requests_per_second: 네이버에 보내는 전체 초당 요청 한도 (기본 1, 기존 순차 스크래핑과 같은 예산)
+            history: 스크래핑 결과를 쌓아 둘 이력 저장소 (None이면 STOCK_HISTORY_DB가 설정된 경우 그 파일)
+        """
+        self.scraper = TradingStrategyScraper(history=history if history is not None else HistoryStore.open())
         self.stocks_data = []
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
     
     def get_all_stocks(self) -> List[Dict]:
         """
@@ -27,7 +50,7 @@ class StockAnalysisSystem:
         Returns:
             [{'ticker': '005930', 'name': '삼성전자', 'market': 'KOSPI'}, ...]
         """
-        print("\n[1/4] 전체 종목 리스트 가져오는 중...")
+        log.info("[1/4] 전체 종목 리스트 가져오는 중...")
         
         stocks = []
         
@@ -49,37 +72,31 @@ class StockAnalysisSystem:
                 'market': 'KOSDAQ'
             })
         
-        print(f"   총 {len(stocks)}개 종목 (KOSPI: {len(kospi_tickers)}, KOSDAQ: {len(kosdaq_tickers)})")
+        log.info("   총 %d개 종목 (KOSPI: %d, KOSDAQ: %d)", len(stocks), len(kospi_tickers), len(kosdaq_tickers))
         
         return stocks
     
-    def scrape_stock(self, ticker: str, name: str) -> Dict:
+    def scrape_stock(self, ticker: str, name: str, market: str = '') -> StockRecord:
         """
         개별 종목 스크래핑
         
         Args:
             ticker: 종목 코드
             name: 종목명
+            market: 시장
             
         Returns:
-            스크래핑된 데이터
+            숫자 필드를 변환한 StockRecord (실패하면 error가 채워진 레코드)
         """
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         try:
             data = self.scraper.get_complete_trading_info(ticker)
-            data['ticker'] = ticker
-            data['name'] = name
-            data['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            return data
+            return StockRecord.from_scraped(data, ticker, name, market, scraped_at)
         except Exception as e:
-            print(f"   오류 ({ticker} {name}): {e}")
-            return {
-                'ticker': ticker,
-                'name': name,
-                'error': str(e),
-                'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
+            log.warning("Scrape failed", extra={"ticker": ticker, "name": name, "error": e})
+            return StockRecord(ticker, name, market, scraped_at, error=str(e))
     
-    def scrape_all_stocks(self, stocks: List[Dict], limit: int = None) -> List[Dict]:
+    def scrape_all_stocks(self, stocks: List[Dict], limit: int = None) -> List[StockRecord]:
         """
         전체 종목 일괄 스크래핑
         
@@ -88,31 +105,72 @@ class StockAnalysisSystem:
             limit: 제한 개수 (테스트용, None이면 전체)
             
         Returns:
-            스크래핑된 데이터 리스트
+            StockRecord 리스트 (입력 순서)
         """
-        print(f"\n[2/4] 종목 스크래핑 중...")
+        log.info("[2/4] 종목 스크래핑 중...")
         
         if limit:
             stocks = stocks[:limit]
-            print(f"   테스트 모드: {limit}개 종목만 스크래핑")
+            log.info("   테스트 모드: %d개 종목만 스크래핑", limit)
         
-        results = []
-        total = len(stocks)
+        def scrape_entry(stock_info: Dict) -> StockRecord:
+            return self.scrape_stock(stock_info['ticker'], stock_info['name'], stock_info['market'])
         
-        for i, stock_info in enumerate(stocks, 1):
-            ticker = stock_info['ticker']
-            name = stock_info['name']
-            market = stock_info['market']
-            
-            print(f"   [{i}/{total}] {name} ({ticker}) - {market}")
-            
-            data = self.scrape_stock(ticker, name)
-            data['market'] = market
-            results.append(data)
+        def report(done: int, total: int, stock_info: Dict, record):
+            log.debug("   [%d/%d] %s (%s) - %s", done, total, stock_info['name'], stock_info['ticker'], stock_info['market'])
+            if done % PROGRESS_EVERY == 0 or done == total:
+                log.info("   [%d/%d] 스크래핑 완료", done, total)
+        
+        # 동시 실행 수와 초당 요청 한도 안에서 병렬 스크래핑 (입력 순서 유지)
+        engine = AsyncScrapeEngine(
+            scrape_entry,
+            concurrency=self.concurrency,
+            requests_per_second=self.requests_per_second
+        )
+        results = engine.run_sync(stocks, on_result=report)
+        
+        self.stocks_data = results
+        return results
+    
+    def fetch_price_snapshot(self) -> Dict[str, Dict]:
+        """
+        시가총액 목록 페이지로 전체 종목의 현재가/거래량을 가져옵니다.
+        
+        Returns:
+            종목 코드 -> 목록 항목 (실패하면 빈 딕셔너리)
+        """
+        try:
+            universe = StockUniverse(concurrency=self.concurrency,
+                                     requests_per_second=self.requests_per_second)
+            return {item['ticker']: item for item in universe.crawl()}
+        except Exception as e:
+            log.warning("Price snapshot failed, using stored prices", extra={"error": e})
+            return {}
+    
+    def scrape_incremental(self, stocks: List[Dict], state: AnalysisState) -> List[StockRecord]:
+        """
+        변경이 필요한 종목만 스크래핑하고 나머지는 저장된 데이터를 재사용합니다.
+        
+        Args:
+            stocks: 종목 리스트
+            state: 이전 실행의 종목별 데이터
             
-            # 과도한 요청 방지 (1초 대기)
-            if i < total:
-                time.sleep(1)
+        Returns:
+            종목 리스트 순서의 데이터 리스트 (재사용 종목은 가격만 갱신)
+        """
+        log.info("[2/4] 증분 갱신 중...")
+        
+        prices = self.fetch_price_snapshot()
+        to_fetch, reused, reasons = state.plan(stocks, prices)
+        
+        summary = ', '.join(f"{reason} {count}" for reason, count in sorted(reasons.items()))
+        log.info("   재사용 %d개, 다시 스크래핑 %d개%s", len(reused), len(to_fetch), f" ({summary})" if summary else "")
+        
+        scraped = self.scrape_all_stocks(to_fetch) if to_fetch else []
+        state.update(scraped)
+        
+        by_ticker = {record.ticker: record for record in reused + scraped}
+        results = [by_ticker[stock_info['ticker']] for stock_info in stocks]
         
         self.stocks_data = results
         return results
@@ -254,25 +312,15 @@ class StockAnalysisSystem:
         Returns:
             분석 결과 리스트
         """
-        print(f"\n[3/4] AI 투자 분석 중...")
+        log.info("[3/4] AI 투자 분석 중...")
         
-        analyzed = []
-        total = len(self.stocks_data)
+        # 오류 없는 종목 전체를 배열 연산으로 한 번에 점수 계산 (analyze_stock_ai와 같은 결과)
+        valid = [record for record in self.stocks_data if record.error is None]
+        batch = score_stock_records(valid)
+        log.info("   %d/%d개 종목 분석 완료", len(valid), len(self.stocks_data))
         
-        for i, data in enumerate(self.stocks_data, 1):
-            if 'error' in data:
-                continue
-            
-            ticker = data.get('ticker', 'N/A')
-            name = data.get('name', 'N/A')
-            
-            print(f"   [{i}/{total}] {name} ({ticker}) 분석 중...")
-            
-            ai_analysis = self.analyze_stock_ai(data)
-            
-            # 데이터와 분석 결과 병합
-            analyzed_data = {**data, **ai_analysis}
-            analyzed.append(analyzed_data)
+        # 데이터와 분석 결과 병합 (숫자 필드는 숫자 그대로)
+        analyzed = [{**record.to_json(), **ai_analysis} for record, ai_analysis in zip(valid, batch.results())]
         
         # 점수 순으로 정렬
         analyzed.sort(key=lambda x: x.get('score', 0), reverse=True)
@@ -284,18 +332,15 @@ class StockAnalysisSystem:
         분석 결과를 Excel 파일로 저장
         
         Args:
-            analyzed_data: 분석된 데이터
+            analyzed_data: 분석된 데이터 (숫자 필드는 숫자 셀로 저장, 결측값은 빈 셀)
             filename: 파일명 (None이면 자동 생성)
         """
-        print(f"\n[4/4] Excel 파일로 저장 중...")
+        log.info("[4/4] Excel 파일로 저장 중...")
         
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'stock_analysis_{timestamp}.xlsx'
         
-        # DataFrame 생성
-        df = pd.DataFrame(analyzed_data)
-        
         # 주요 컬럼 순서 정렬
         columns_order = [
             'grade', 'score', 'recommendation', 'ticker', 'name', 'market',
@@ -306,57 +351,99 @@ class StockAnalysisSystem:
         ]
         
         # 존재하는 컬럼만 선택
-        existing_columns = [col for col in columns_order if col in df.columns]
-        df = df[existing_columns]
+        present = set().union(*analyzed_data)
+        existing_columns = [col for col in columns_order if col in present]
         
-        # Excel 저장
-        df.to_excel(filename, index=False, sheet_name='AI Stock Analysis')
+        # 쓰기 전용 워크북에 한 행씩 저장 (DataFrame을 만들지 않음)
+        rows = (
+            [', '.join(value) if isinstance(value, list) else value
+             for value in (stock.get(col) for col in existing_columns)]
+            for stock in analyzed_data
+        )
+        write_table(filename, existing_columns, rows, export_format='xlsx', sheet_title='AI Stock Analysis')
         
-        print(f"   저장 완료: {filename}")
-        print(f"   총 {len(df)}개 종목 분석 완료")
+        log.info("   저장 완료: %s", filename)
+        log.info("   총 %d개 종목 분석 완료", len(analyzed_data))
         
         return filename
     
-    def run_full_analysis(self, limit: int = None):
+    def save_to_archive(self, analyzed_data: List[Dict], archive_dir: str = ARCHIVE_DIR) -> int:
+        """
+        분석 결과를 날짜/시장별 Parquet 아카이브에 추가 (오늘 날짜 파티션은 교체)
+        
+        Args:
+            analyzed_data: 분석된 데이터
+            archive_dir: 아카이브 디렉터리
+            
+        Returns:
+            저장한 행 수 (pyarrow가 없거나 저장에 실패하면 0)
+        """
+        try:
+            rows = MarketArchive(archive_dir).append(analyzed_data)
+        except ImportError:
+            log.warning("pyarrow가 없어 Parquet 아카이브 저장을 건너뜁니다.")
+            return 0
+        except Exception as e:
+            log.warning("Parquet 아카이브 저장 실패", extra={"error": e})
+            return 0
+        log.info("   아카이브 저장: %s (%d개 종목)", archive_dir, rows)
+        return rows
+    
+    def run_full_analysis(self, limit: int = None, incremental: bool = False,
+                          state_path: str = STATE_PATH, archive_dir: Optional[str] = ARCHIVE_DIR):
         """
         전체 분석 프로세스 실행
         
         Args:
             limit: 종목 제한 개수 (테스트용)
+            incremental: True면 이전 실행 결과를 재사용하고 변경된 종목만 스크래핑
+            state_path: 종목별 데이터를 저장할 상태 파일 경로
+            archive_dir: 일별 Parquet 아카이브 디렉터리 (None이면 저장하지 않음)
         """
-        print("\n" + "="*80)
-        print("AI 기반 종합 주식 분석 시스템")
-        print("="*80)
+        log.info("=" * 80)
+        log.info("AI 기반 종합 주식 분석 시스템")
+        log.info("=" * 80)
         
         # 1. 전체 종목 리스트 가져오기
         stocks = self.get_all_stocks()
         
-        # 2. 전체 종목 스크래핑
-        scraped = self.scrape_all_stocks(stocks, limit=limit)
+        # 2. 종목 스크래핑 (증분 모드면 변경된 종목만)
+        state = AnalysisState(state_path)
+        if incremental:
+            if limit:
+                stocks = stocks[:limit]
+            scraped = self.scrape_incremental(stocks, state)
+        else:
+            scraped = self.scrape_all_stocks(stocks, limit=limit)
+            state.update(scraped)
+        state.save()
         
         # 3. AI 분석
         analyzed = self.analyze_all_stocks()
         
-        # 4. Excel 저장
+        # 4. Excel 저장, 일별 아카이브 추가
         filename = self.save_to_excel(analyzed)
+        if archive_dir:
+            self.save_to_archive(analyzed, archive_dir)
         
         # 5. 상위 10개 종목 출력
-        print(f"\n{'='*80}")
-        print("TOP 10 추천 종목")
-        print(f"{'='*80}")
+        log.info("=" * 80)
+        log.info("TOP 10 추천 종목")
+        log.info("=" * 80)
         
         for i, stock in enumerate(analyzed[:10], 1):
-            print(f"\n{i}. [{stock['grade']}] {stock['name']} ({stock['ticker']}) - {stock['market']}")
-            print(f"   점수: {stock['score']}/100")
-            print(f"   추천: {stock['recommendation']} | 전략: {stock['strategy']}")
-            print(f"   현재가: {stock.get('current_price', 'N/A')} | PER: {stock.get('per', 'N/A')} | PBR: {stock.get('pbr', 'N/A')}")
-            print(f"   ROE: {stock.get('roe', 'N/A')}% | 목표가: {stock.get('target_price', 'N/A')}")
+            log.info("%d. [%s] %s (%s) - %s", i, stock['grade'], stock['name'], stock['ticker'], stock['market'])
+            log.info("   점수: %s/100", stock['score'])
+            log.info("   추천: %s | 전략: %s", stock['recommendation'], stock['strategy'])
+            shown = {field: format_field(field, stock.get(field)) for field in ('current_price', 'per', 'pbr', 'roe', 'target_price')}
+            log.info("   현재가: %s | PER: %s | PBR: %s", shown['current_price'], shown['per'], shown['pbr'])
+            log.info("   ROE: %s%% | 목표가: %s", shown['roe'], shown['target_price'])
             if stock.get('signals'):
-                print(f"   시그널: {', '.join(stock['signals'][:3])}")
+                log.info("   시그널: %s", ', '.join(stock['signals'][:3]))
         
-        print(f"\n{'='*80}")
-        print(f"분석 완료! 결과 파일: {filename}")
-        print(f"{'='*80}\n")
+        log.info("=" * 80)
+        log.info("분석 완료! 결과 파일: %s", filename)
+        log.info("=" * 80)
         
         return analyzed, filename
 
@@ -366,8 +453,12 @@ if __name__ == "__main__":
     system = StockAnalysisSystem()
     
     # 테스트: 10개 종목만 분석
-    print("테스트 모드: 10개 종목만 분석합니다.")
+    log.info("테스트 모드: 10개 종목만 분석합니다.")
     analyzed, filename = system.run_full_analysis(limit=10)
+    flush_logs()
     
     # 전체 분석을 원하면:
     # analyzed, filename = system.run_full_analysis()
+    
+    # 매일 갱신할 때는 이전 결과를 재사용하는 증분 모드:
+    # analyzed, filename = system.run_full_analysis(incremental=True)
@@ -0,0 +1,135 @@
+"""
+스크래핑한 종목 데이터의 타입 레코드
+
+TradingStrategyScraper는 모든 값을 표시용 문자열("1,234", "N/A")로 돌려줍니다.
+분석 파이프라인(점수 계산, 상태 저장, Excel 저장)은 StockRecord에 숫자로 한 번만
+변환해 두고 그대로 사용하며, 문자열 형식은 API/출력 직전에만 만듭니다.
+
+- 숫자 필드는 float, 값이 없으면 None ("N/A"를 대신하는 명시적 결측값)
+- __slots__ 클래스라 종목당 딕셔너리 + 문자열보다 메모리를 적게 사용
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+NA = 'N/A'
+
+# 정수로 표시하는 필드 (가격, 수량, 주당 값)
+INTEGER_FIELDS = (
+    'current_price', 'opening_price', 'high_price', 'low_price', 'prev_close',
+    'upper_limit', 'lower_limit', 'high_52w', 'low_52w', 'target_price',
+    'volume', 'trading_value', 'eps', 'bps',
+)
+# 부호를 붙여 표시하는 필드 (순매수)
+SIGNED_FIELDS = ('foreign_net_buy', 'institutional_net_buy', 'individual_net_buy')
+# 소수점 둘째 자리까지 표시하는 필드 (배수, 비율)
+RATIO_FIELDS = (
+    'per', 'per_industry', 'pbr', 'pbr_industry', 'dividend_yield', 'opinion_score',
+    'roe', 'debt_ratio', 'operating_margin',
+)
+NUMBER_FIELDS = INTEGER_FIELDS + SIGNED_FIELDS + RATIO_FIELDS
+
+# 숫자로 바꾸지 않는 필드 (예: "989조 4,675억원", "매수", 주식 수 또는 "28.14%")
+TEXT_FIELDS = ('market_cap', 'foreign_ownership', 'opinion', 'sector')
+
+META_FIELDS = ('ticker', 'name', 'market', 'scraped_at', 'error')
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """표시용 문자열(또는 숫자)을 float로 바꿉니다. 바꿀 수 없으면 None."""
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value.replace(',', ''))
+    except (AttributeError, ValueError):
+        return None
+
+
+def format_field(field: str, value: Any) -> str:
+    """필드 값을 스크래퍼와 같은 표시용 문자열로 바꿉니다."""
+    if value is None:
+        return NA
+    if field in INTEGER_FIELDS:
+        return f"{value:,.0f}"
+    if field in SIGNED_FIELDS:
+        return f"{value:+,.0f}"
+    if field in RATIO_FIELDS:
+        return f"{value:,.2f}"
+    return str(value)
+
+
+class StockRecord:
+    """종목 하나의 스크래핑 결과 (숫자 필드는 float 또는 None)"""
+
+    __slots__ = META_FIELDS + NUMBER_FIELDS + TEXT_FIELDS
+
+    def __init__(self, ticker: str, name: str = '', market: str = '',
+                 scraped_at: Optional[str] = None, error: Optional[str] = None, **values):
+        """
+        Args:
+            ticker: 종목 코드
+            name: 종목명
+            market: 시장 (KOSPI/KOSDAQ)
+            scraped_at: 스크래핑 시각 ("%Y-%m-%d %H:%M:%S")
+            error: 스크래핑 오류 메시지 (성공하면 None)
+            **values: 숫자 필드(float/None)와 텍스트 필드(str/None)
+        """
+        self.ticker = ticker
+        self.name = name
+        self.market = market
+        self.scraped_at = scraped_at
+        self.error = error
+        for field in NUMBER_FIELDS + TEXT_FIELDS:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_scraped(cls, data: Dict[str, Any], ticker: str, name: str = '', market: str = '',
+                     scraped_at: Optional[str] = None) -> 'StockRecord':
+        """스크래퍼가 돌려준 문자열 딕셔너리에서 숫자 필드를 한 번만 변환해 만듭니다."""
+        values = {field: parse_number(data.get(field)) for field in NUMBER_FIELDS}
+        for field in TEXT_FIELDS:
+            text = data.get(field)
+            values[field] = None if text in (None, NA) else text
+        return cls(ticker, name, market, scraped_at, data.get('error'), **values)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'StockRecord':
+        """to_json() 결과(숫자는 숫자 그대로)에서 다시 만듭니다."""
+        values = {field: parse_number(data.get(field)) for field in NUMBER_FIELDS}
+        values.update({field: data.get(field) for field in TEXT_FIELDS})
+        return cls(data['ticker'], data.get('name', ''), data.get('market', ''),
+                   data.get('scraped_at'), data.get('error'), **values)
+
+    def copy(self, **changes) -> 'StockRecord':
+        """일부 필드만 바꾼 복사본"""
+        record = StockRecord.__new__(StockRecord)
+        for field in self.__slots__:
+            setattr(record, field, changes[field] if field in changes else getattr(self, field))
+        return record
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def to_json(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """숫자를 숫자 그대로 둔 딕셔너리 (상태 파일, Excel 저장용)"""
+        fields = self.__slots__ if fields is None else fields
+        data = {field: getattr(self, field) for field in fields}
+        if data.get('error') is None:
+            data.pop('error', None)
+        return data
+
+    def to_dict(self) -> Dict[str, str]:
+        """스크래퍼 응답과 같은 표시용 문자열 딕셔너리 (API/프롬프트용)"""
+        data = {field: format_field(field, getattr(self, field)) for field in NUMBER_FIELDS + TEXT_FIELDS}
+        data.update(ticker=self.ticker, name=self.name, market=self.market)
+        if self.scraped_at:
+            data['scraped_at'] = self.scraped_at
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+    def __repr__(self) -> str:
+        return f"StockRecord({self.ticker!r}, {self.name!r}, {self.market!r})"
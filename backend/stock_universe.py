@@ -0,0 +1,338 @@
+"""
+KOSPI + KOSDAQ 전체 종목 목록 (시가총액 페이지 기반)
+
+네이버 금융 시가총액 페이지(sise_market_sum.naver)의 모든 페이지를 두 시장 모두
+병렬로 크롤링해 전체 종목 스냅샷을 만들고 메모리에 보관합니다.
+refresh_interval보다 오래된 스냅샷은 요청이 들어올 때 백그라운드에서 다시 만들고,
+갱신되는 동안에도 그대로 제공됩니다. 목록 페이지가 하나라도 실패하면 기존 스냅샷을 유지합니다.
+비동기 엔드포인트는 aget_snapshot()으로 첫 스냅샷을 공유 비동기 클라이언트로 만듭니다.
+
+환경 변수:
+    STOCK_UNIVERSE_REFRESH   스냅샷 갱신 주기 초 (기본 3600)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from app_logging import get_logger
+from async_scrape_engine import AsyncScrapeEngine
+from http_session import async_get, get_session, naver_url
+from parser_backend import parse_html, resolve_parser
+
+
+log = get_logger(__name__)
+
+LIST_PATH = "/sise/sise_market_sum.naver"
+
+# 시장 이름 -> sosok 파라미터
+MARKETS = {'KOSPI': 0, 'KOSDAQ': 1}
+
+REFRESH_SECONDS = float(os.environ.get('STOCK_UNIVERSE_REFRESH', '3600'))
+
+# 목록 표의 컬럼 제목 -> 결과 키
+COLUMN_KEYS = {
+    '현재가': 'current_price',
+    '등락률': 'change_rate',
+    '시가총액': 'market_cap',
+    '거래량': 'volume',
+    'PER': 'per',
+    'ROE': 'roe',
+}
+
+_CODE_PATTERN = re.compile(r'code=(\w+)')
+_PAGE_PATTERN = re.compile(r'page=(\d+)')
+
+
+class UniverseSnapshot:
+    """특정 시점의 전체 종목 목록"""
+
+    def __init__(self, stocks: List[Dict], built_at: float):
+        self.stocks = stocks
+        self.built_at = built_at
+        digest = hashlib.sha1(json.dumps(stocks, ensure_ascii=False).encode('utf-8')).hexdigest()
+        self.etag = f'"{digest[:20]}"'
+
+    def counts(self) -> Dict[str, int]:
+        """시장별 종목 수"""
+        counts = {market: 0 for market in MARKETS}
+        for stock in self.stocks:
+            counts[stock['market']] = counts.get(stock['market'], 0) + 1
+        return counts
+
+
+class StockUniverse:
+    """전체 종목 목록 스냅샷을 만들고 refresh_interval이 지나면 다시 만듭니다."""
+
+    def __init__(
+        self,
+        refresh_interval: float = REFRESH_SECONDS,
+        concurrency: int = 8,
+        requests_per_second: Optional[float] = 10.0,
+        parser: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Args:
+            refresh_interval: 스냅샷 갱신 주기 (초)
+            concurrency: 동시에 가져올 목록 페이지 수
+            requests_per_second: 크롤링 중 초당 요청 한도
+            parser: HTML 파서 백엔드
+            session: HTTP 세션 (None이면 공유 세션)
+        """
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.parser = resolve_parser(parser)
+        self.session = session or get_session()
+        self.headers = {'User-Agent': 'Mozilla/5.0'}
+
+        self._snapshot: Optional[UniverseSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._build_task: Optional[asyncio.Task] = None
+
+    def fetch_list_page(self, market: str, page: int) -> Tuple[List[Dict], int]:
+        """
+        시가총액 목록 한 페이지를 가져옵니다.
+
+        Returns:
+            (종목 리스트, 마지막 페이지 번호)
+        """
+        response = self.session.get(
+            naver_url(LIST_PATH),
+            params={'sosok': MARKETS[market], 'page': page},
+            headers=self.headers,
+            timeout=10
+        )
+        response.raise_for_status()
+        return self.parse_list_page(response.text, market, page)
+
+    async def afetch_list_page(self, market: str, page: int) -> Tuple[List[Dict], int]:
+        """fetch_list_page의 비동기 버전 (공유 비동기 클라이언트로 요청, 파싱은 스레드에서 실행)"""
+        response = await async_get(
+            naver_url(LIST_PATH),
+            params={'sosok': MARKETS[market], 'page': page},
+            headers=self.headers,
+        )
+        response.raise_for_status()
+        return await asyncio.to_thread(self.parse_list_page, response.text, market, page)
+
+    def parse_list_page(self, html: str, market: str, page: int) -> Tuple[List[Dict], int]:
+        """
+        목록 페이지 HTML에서 종목과 마지막 페이지 번호를 꺼냅니다.
+
+        Returns:
+            (종목 리스트, 마지막 페이지 번호)
+        """
+        soup = parse_html(html, self.parser)
+
+        table = soup.select_one('table.type_2')
+        stocks = []
+        if table:
+            headers = [th.get_text(strip=True) for th in table.select('thead th')]
+            columns = {COLUMN_KEYS[h]: i for i, h in enumerate(headers) if h in COLUMN_KEYS}
+
+            for row in table.select('tbody tr'):
+                cells = row.find_all('td')
+                if len(cells) < 2:
+                    continue
+                link = cells[1].find('a')
+                ticker_match = _CODE_PATTERN.search(link.get('href', '')) if link else None
+                if not ticker_match:
+                    continue
+
+                stock = {
+                    'ticker': ticker_match.group(1),
+                    'name': link.get_text(strip=True),
+                    'market': market,
+                }
+                for key, index in columns.items():
+                    if index < len(cells):
+                        stock[key] = cells[index].get_text(strip=True)
+                stocks.append(stock)
+
+        last_page = page
+        last_link = soup.select_one('td.pgRR a')
+        if last_link:
+            page_match = _PAGE_PATTERN.search(last_link.get('href', ''))
+            if page_match:
+                last_page = int(page_match.group(1))
+
+        return stocks, last_page
+
+    def crawl(self) -> List[Dict]:
+        """두 시장의 모든 목록 페이지를 병렬로 크롤링합니다."""
+        def fetch(job):
+            market, page = job
+            stocks, last_page = self.fetch_list_page(market, page)
+            return {'stocks': stocks, 'last_page': last_page}
+
+        return asyncio.run(self._crawl(fetch))
+
+    async def acrawl(self) -> List[Dict]:
+        """crawl의 비동기 버전 (스레드 없이 공유 비동기 클라이언트로 요청)"""
+        async def fetch(job):
+            market, page = job
+            stocks, last_page = await self.afetch_list_page(market, page)
+            return {'stocks': stocks, 'last_page': last_page}
+
+        return await self._crawl(fetch)
+
+    async def _crawl(self, fetch) -> List[Dict]:
+        engine = AsyncScrapeEngine(fetch, concurrency=self.concurrency,
+                                   requests_per_second=self.requests_per_second)
+
+        # 1페이지에서 시장별 마지막 페이지를 알아낸 뒤 나머지 페이지를 한꺼번에 요청
+        first_jobs = [(market, 1) for market in MARKETS]
+        first_pages = await engine.run(first_jobs)
+
+        jobs = []
+        for (market, _), result in zip(first_jobs, first_pages):
+            if 'error' in result:
+                raise RuntimeError(f"{market} list page failed: {result['error']}")
+            jobs.extend((market, page) for page in range(2, result['last_page'] + 1))
+
+        pages = dict(zip(first_jobs, first_pages))
+        pages.update(zip(jobs, await engine.run(jobs)))
+
+        # 일부 페이지만 빠진 목록을 스냅샷으로 내보내지 않도록 실패한 페이지가 있으면 중단
+        failed = [job for job in jobs if 'error' in pages[job]]
+        if failed:
+            market, page = failed[0]
+            raise RuntimeError(f"{len(failed)} list page(s) failed, first {market} page {page}: "
+                               f"{pages[failed[0]]['error']}")
+
+        stocks = []
+        seen = set()
+        for job in first_jobs + jobs:
+            for stock in pages[job]['stocks']:
+                if stock['ticker'] not in seen:
+                    seen.add(stock['ticker'])
+                    stocks.append(stock)
+
+        return stocks
+
+    def refresh(self) -> UniverseSnapshot:
+        """스냅샷을 새로 만듭니다. (실패하면 예외를 내고 기존 스냅샷을 유지)"""
+        with self._build_lock:
+            return self._rebuild()
+
+    def _rebuild(self) -> UniverseSnapshot:
+        # _build_lock을 잡은 상태에서 호출
+        stocks = self.crawl()
+        if not stocks:
+            raise RuntimeError("No stocks found in market list pages")
+        self._snapshot = UniverseSnapshot(stocks, time.time())
+        return self._snapshot
+
+    async def arefresh(self) -> UniverseSnapshot:
+        """refresh의 비동기 버전 (동기 경로와 같은 _build_lock 사용)"""
+        await self._acquire_build_lock()
+        try:
+            return await self._arebuild()
+        finally:
+            self._build_lock.release()
+
+    async def _arebuild(self) -> UniverseSnapshot:
+        # _build_lock을 잡은 상태에서 호출
+        stocks = await self.acrawl()
+        if not stocks:
+            raise RuntimeError("No stocks found in market list pages")
+        self._snapshot = UniverseSnapshot(stocks, time.time())
+        return self._snapshot
+
+    async def _acquire_build_lock(self):
+        # 이벤트 루프를 막지 않도록 잠깐씩 양보하며 시도 (기다리다 취소되어도 락이 남지 않음)
+        while not self._build_lock.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+
+    async def _abuild_first(self) -> UniverseSnapshot:
+        await self._acquire_build_lock()
+        try:
+            # 기다리는 동안 동기 경로(get_snapshot)가 만든 스냅샷이 있으면 그대로 사용
+            if self._snapshot is not None:
+                return self._snapshot
+            return await self._arebuild()
+        finally:
+            self._build_lock.release()
+
+    async def aget_snapshot(self) -> UniverseSnapshot:
+        """
+        get_snapshot의 비동기 버전입니다.
+
+        스냅샷이 없으면 이벤트 루프에서 한 번만 만들고 동시에 들어온 요청은 같은 작업을 기다립니다.
+        get_snapshot과 같은 _build_lock을 잡으므로 두 경로가 섞여도 크롤링은 한 번입니다.
+        오래된 스냅샷은 get_snapshot과 같이 반환하면서 백그라운드에서 갱신합니다.
+        """
+        if self._snapshot is None:
+            task = self._build_task
+            if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+                task = self._build_task = asyncio.ensure_future(self._abuild_first())
+            # 기다리던 요청이 취소되어도 다른 요청이 기다리는 작업은 계속 진행
+            return await asyncio.shield(task)
+        return self.get_snapshot()
+
+    def get_snapshot(self) -> UniverseSnapshot:
+        """
+        현재 스냅샷을 반환합니다.
+
+        스냅샷이 없으면 만들 때까지 기다리고, 오래되었으면 기존 스냅샷을 반환하면서
+        백그라운드에서 갱신합니다.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            # 동시에 들어온 요청은 먼저 만든 스냅샷을 그대로 사용
+            with self._build_lock:
+                if self._snapshot is not None:
+                    return self._snapshot
+                return self._rebuild()
+
+        if time.time() - snapshot.built_at >= self.refresh_interval:
+            self._refresh_in_background()
+
+        return snapshot
+
+    def _refresh_in_background(self):
+        # 이미 갱신 중이면 (또는 첫 스냅샷을 만드는 중이면) 기다리지 않고 넘어감
+        if not self._build_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._rebuild()
+            except Exception as e:
+                log.error("Stock universe refresh failed", extra={"error": e})
+            finally:
+                self._build_lock.release()
+
+        try:
+            threading.Thread(target=run, name='stock-universe-refresh', daemon=True).start()
+        except BaseException:
+            self._build_lock.release()
+            raise
+
+
+def filter_stocks(stocks: List[Dict], market: Optional[str] = None, query: Optional[str] = None) -> List[Dict]:
+    """
+    시장과 검색어(종목명 또는 종목코드 일부)로 종목을 거릅니다.
+
+    Args:
+        market: "KOSPI", "KOSDAQ" 또는 None/"ALL"
+        query: 검색어 (대소문자 무시)
+    """
+    if market and market.upper() != 'ALL':
+        market = market.upper()
+        stocks = [s for s in stocks if s['market'] == market]
+
+    if query:
+        query = query.strip().lower()
+        stocks = [s for s in stocks if query in s['name'].lower() or query in s['ticker']]
+
+    return stocks
@@ -0,0 +1,70 @@
+"""
+증분 갱신 계획 테스트
+
+AnalysisState.plan()이 신규/오류/분기 변경/만료/가격 없음 종목만 다시 스크래핑하고,
+나머지는 저장된 데이터에 시세 스냅샷 가격을 덮어써 재사용하는지 확인합니다.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+from analysis_state import AnalysisState, quarter_of
+from stock_record import StockRecord
+
+
+NOW = datetime(2026, 10, 16, 11, 0, 0)
+
+
+def make_state(records):
+    path = os.path.join(tempfile.mkdtemp(), 'state.json')
+    state = AnalysisState(path, max_age_days=7)
+    state.update(StockRecord.from_json(data) for data in records)
+    state.save()
+    return AnalysisState(path, max_age_days=7)
+
+
+def stock(ticker):
+    return {'ticker': ticker, 'name': ticker, 'market': 'KOSPI'}
+
+
+def test_quarter_of():
+    assert quarter_of(datetime(2026, 3, 31)) == '2026Q1'
+    assert quarter_of(datetime(2026, 10, 1)) == '2026Q4'
+
+
+def test_plan_refetches_only_stale_tickers():
+    state = make_state([
+        {'ticker': 'FRESH', 'scraped_at': '2026-10-15 10:00:00', 'current_price': '100', 'per': '8.00'},
+        {'ticker': 'ERROR', 'scraped_at': '2026-10-15 10:00:00', 'error': 'timeout'},
+        {'ticker': 'QUARTER', 'scraped_at': '2026-09-30 10:00:00'},
+        {'ticker': 'EXPIRED', 'scraped_at': '2026-10-02 10:00:00'},
+        {'ticker': 'NOPRICE', 'scraped_at': '2026-10-15 10:00:00'},
+    ])
+    stocks = [stock(t) for t in ('FRESH', 'ERROR', 'QUARTER', 'EXPIRED', 'NOPRICE', 'NEW')]
+    prices = {t: {'current_price': '120', 'volume': '5,000'} for t in ('FRESH', 'ERROR', 'QUARTER', 'EXPIRED')}
+
+    to_fetch, reused, reasons = state.plan(stocks, prices, now=NOW)
+
+    assert [s['ticker'] for s in to_fetch] == ['ERROR', 'QUARTER', 'EXPIRED', 'NOPRICE', 'NEW']
+    assert reasons == {'error': 1, 'quarter': 1, 'expired': 1, 'price': 1, 'new': 1}
+    assert len(reused) == 1
+    assert reused[0].current_price == 120.0
+    assert reused[0].volume == 5000.0
+    assert reused[0].per == 8.0
+
+
+def test_same_day_record_is_reused_without_snapshot():
+    state = make_state([{'ticker': 'TODAY', 'scraped_at': '2026-10-16 09:30:00', 'current_price': '100'}])
+
+    to_fetch, reused, _ = state.plan([stock('TODAY')], now=NOW)
+
+    assert to_fetch == []
+    assert reused[0].current_price == 100.0
+
+
+if __name__ == "__main__":
+    test_quarter_of()
+    test_plan_refetches_only_stale_tickers()
+    test_same_day_record_is_reused_without_snapshot()
+    print("[완료] 증분 갱신 계획 테스트 통과")
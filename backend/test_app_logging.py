@@ -0,0 +1,132 @@
+"""
+레벨/샘플링/큐 기반 로깅 테스트
+
+text/json 형식과 구조화 필드, DEBUG 샘플링, 꺼진 레벨/샘플링에서 레코드를 만들지 않는지,
+큐 기반 모드에서 포맷이 리스너 스레드에서 일어나고 큐가 가득 차면 버리는지 확인합니다.
+"""
+
+import json
+import logging
+import threading
+
+import app_logging
+from app_logging import get_logger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, block: threading.Event = None):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+        self.block = block
+
+    def emit(self, record):
+        if self.block is not None:
+            self.block.wait(5)
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+class Counted:
+    """포맷될 때마다 횟수를 셉니다."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __repr__(self):
+        self.formatted += 1
+        return '<counted>'
+
+    __str__ = __repr__
+
+
+def test_text_and_json_format():
+    log = get_logger('test')
+    try:
+        handler = ListHandler()
+        app_logging.configure(level='DEBUG', handler=handler, use_queue=False)
+        log.info("   총 %d개 종목", 3)
+        log.debug("Final result", extra={"ticker": "005930", "result": {"per": "12.5"}})
+        log.warning("Export without stock names", extra={"error": ValueError("bad")})
+        assert handler.lines == [
+            "   총 3개 종목",
+            "[DEBUG] Final result ticker=005930 result={'per': '12.5'}",
+            "[WARN] Export without stock names error=bad",
+        ]
+
+        handler = ListHandler()
+        app_logging.configure(level='DEBUG', fmt='json', handler=handler, use_queue=False)
+        log.debug("Final result", extra={"ticker": "005930"})
+        entry = json.loads(handler.lines[0])
+        assert entry['level'] == 'DEBUG' and entry['logger'] == 'stock.test'
+        assert entry['message'] == 'Final result' and entry['ticker'] == '005930'
+    finally:
+        app_logging.configure()
+
+
+def test_disabled_and_sampled_records_are_not_created():
+    log = get_logger('test')
+    created = []
+
+    class CountedRecord(app_logging.LightRecord):
+        def __init__(self, *args):
+            super().__init__(*args)
+            created.append(self)
+
+    light_record = app_logging.LightRecord
+    app_logging.LightRecord = CountedRecord
+    try:
+        value = Counted()
+        handler = ListHandler()
+        app_logging.configure(level='INFO', handler=handler, use_queue=False)
+        log.debug("Final result %s", value, extra={"result": value})
+        assert value.formatted == 0 and handler.lines == []
+
+        app_logging.configure(level='DEBUG', sample_rate=0, handler=handler, use_queue=False)
+        for _ in range(5):
+            log.debug("Final result %s", value)
+        log.error("Failed to fetch page")
+        assert value.formatted == 0 and len(created) == 1
+        assert handler.lines == ["[ERROR] Failed to fetch page"]
+        assert app_logging.stats()['sampled_out'] == 5
+
+        # 다른 라이브러리 로거의 레코드 생성 설정은 바꾸지 않음
+        assert logging.logThreads and logging.logProcesses
+        assert type(logging.getLogger('uvicorn').makeRecord('uvicorn', logging.INFO, '', 0, '', None, None)) \
+            is logging.LogRecord
+    finally:
+        app_logging.LightRecord = light_record
+        app_logging.configure()
+
+
+def test_queue_formats_off_thread_and_drops_when_full():
+    log = get_logger('test')
+    release = threading.Event()
+    try:
+        handler = ListHandler(block=release)
+        app_logging.configure(level='DEBUG', queue_size=1, handler=handler)
+        value = Counted()
+        log.debug("first %s", value)
+        # 리스너가 첫 레코드에서 멈춰 있는 동안 하나는 큐에 남고 나머지는 버려짐
+        for _ in range(50):
+            log.debug("more %s", value)
+            if app_logging.stats()['dropped']:
+                break
+        assert value.formatted == 0
+        assert app_logging.stats()['dropped'] >= 1
+
+        release.set()
+        app_logging.flush()
+        assert handler.lines[0] == "[DEBUG] first <counted>"
+        assert threading.current_thread() not in handler.threads
+        assert 'log_records_dropped_total' in '\n'.join(app_logging.metric_lines())
+    finally:
+        release.set()
+        app_logging.configure()
+
+
+if __name__ == "__main__":
+    test_text_and_json_format()
+    test_disabled_and_sampled_records_are_not_created()
+    test_queue_formats_off_thread_and_drops_when_full()
+    print("[완료] 로깅 테스트 통과")
@@ -0,0 +1,116 @@
+"""
+비동기 요청 경로 테스트
+
+공유 httpx.AsyncClient로 보내는 afetch_page/aget_complete_trading_info가 스레드 없이
+수백 개의 네이버 요청을 동시에 진행하고 동기 경로와 같은 결과를 내는지,
+비동기 엔드포인트(/api/analyze, /api/trading-analysis, /api/stocks)가 같은 응답을 주는지 확인합니다.
+(네이버 대신 naver_standin.py 대역 서버 사용)
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from fastapi.testclient import TestClient
+
+from async_scrape_engine import AsyncScrapeEngine
+from http_session import async_get, create_async_client, create_session
+from naver_scraper_enhanced import NaverFinanceScraper
+from naver_scraper_trading import TradingStrategyScraper
+from stock_universe import StockUniverse
+
+
+def test_hundreds_of_requests_in_flight(standin):
+    requests_count = 200
+    latency = 0.5
+    server = standin(latency=latency)
+    scraper = TradingStrategyScraper(session=create_session(max_retries=0))
+    expected = scraper.get_complete_trading_info('005935')
+
+    async def scrape_all():
+        client = create_async_client(max_connections=requests_count)
+        scraper.async_client = client
+        try:
+            return await asyncio.gather(*(scraper.aget_complete_trading_info('005935')
+                                          for _ in range(requests_count)))
+        finally:
+            await client.aclose()
+
+    start = time.perf_counter()
+    results = asyncio.run(scrape_all())
+    elapsed = time.perf_counter() - start
+
+    assert all(result == expected for result in results)
+    # 요청이 차례로 처리되었다면 200 x 0.5초
+    assert server.stats()['max_in_flight'] >= requests_count * 3 // 4
+    assert elapsed < requests_count * latency / 10
+
+
+def test_async_get_retries_once_per_attempt():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        if request.url.path == '/down':
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(503 if len(attempts) < 3 else 200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            try:
+                await async_get('http://naver.test/down', client=client, max_retries=2, backoff_factor=0)
+            except httpx.ConnectError:
+                pass
+            else:
+                raise AssertionError("expected ConnectError")
+            # 연결 실패는 재시도 횟수 + 1번만 시도 (전송 계층 재시도와 겹치지 않음)
+            assert attempts == ['/down'] * 3
+            attempts.clear()
+            return await async_get('http://naver.test/up', client=client, max_retries=2, backoff_factor=0)
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(attempts) == 3
+
+
+def test_enhanced_scraper_and_engine_coroutine_worker(standin):
+    standin(list_size=230)
+    scraper = NaverFinanceScraper(session=create_session(max_retries=0))
+    expected = scraper.get_stock_info('247540')
+    engine = AsyncScrapeEngine(scraper.aget_stock_info, concurrency=4, requests_per_second=None)
+    assert asyncio.run(engine.run(['247540'] * 4)) == [expected] * 4
+
+    universe = StockUniverse(requests_per_second=None, session=create_session(max_retries=0))
+    stocks = asyncio.run(universe.acrawl())
+    assert stocks == universe.crawl()
+    assert len(stocks) == 230
+
+
+def test_async_endpoints_match_sync_path(standin, app_state):
+    standin(list_size=230)
+    with TestClient(app_state.app) as client:
+        analysis = client.get('/api/analyze/005935').json()
+        assert analysis == app_state.fetch_stock_analysis('005935')
+        assert analysis['high_52w'] == '133,600'
+
+        trading = client.get('/api/trading-analysis/005935').json()
+        assert trading == app_state.trading_scraper.get_complete_trading_info('005935')
+
+        params = {'market': 'KOSDAQ', 'page': 1, 'page_size': 10}
+        stocks = client.get('/api/stocks', params=params)
+        assert stocks.status_code == 200
+        body = stocks.json()
+        assert body['total'] == 114 and len(body['items']) == 10
+        cached = client.get('/api/stocks', params=params, headers={'If-None-Match': stocks.headers['etag']})
+        assert cached.status_code == 304
+
+
+if __name__ == "__main__":
+    from conftest import fresh_app_state, standin_servers
+    with standin_servers() as standin:
+        test_hundreds_of_requests_in_flight(standin)
+        test_async_get_retries_once_per_attempt()
+        test_enhanced_scraper_and_engine_coroutine_worker(standin)
+        with fresh_app_state() as app_state:
+            test_async_endpoints_match_sync_path(standin, app_state)
+    print("[완료] 비동기 요청 경로 테스트 통과")
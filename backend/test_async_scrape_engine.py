@@ -0,0 +1,108 @@
+"""
+비동기 일괄 스크래핑 엔진 테스트
+
+토큰 버킷이 몰린 요청을 초당 한도로 나누는지, 결과가 입력 순서대로 돌아오는지,
+동시 실행 수가 concurrency를 넘지 않는지, 작업자 예외가 {'error': ...} 결과가 되는지 확인합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+from async_scrape_engine import AsyncScrapeEngine, TokenBucket
+
+
+def test_token_bucket_spreads_a_burst():
+    async def burst(bucket, count):
+        start = time.monotonic()
+        times = []
+        for _ in range(count):
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+        return times
+
+    # 용량 1, 초당 20개: 첫 요청은 바로, 나머지는 0.05초 간격
+    times = asyncio.run(burst(TokenBucket(20), 6))
+    assert times[0] < 0.02
+    assert 0.24 <= times[-1] < 0.4
+    assert all(later - earlier >= 0.04 for earlier, later in zip(times, times[1:]))
+
+    # 용량만큼은 한꺼번에 허용
+    times = asyncio.run(burst(TokenBucket(20, capacity=4), 4))
+    assert times[-1] < 0.02
+
+    # 제한 없음
+    times = asyncio.run(burst(TokenBucket(None), 100))
+    assert times[-1] < 0.05
+
+
+def test_shared_rate_limit_across_workers():
+    engine = AsyncScrapeEngine(lambda item: {'item': item}, concurrency=8, requests_per_second=25)
+    start = time.monotonic()
+    engine.run_sync(range(11))
+    # 8개 작업자가 나눠 써도 초당 25개 (첫 토큰 이후 10개 x 0.04초)
+    assert time.monotonic() - start >= 0.38
+
+
+def test_results_keep_input_order():
+    def worker(delay):
+        time.sleep(delay)
+        return {'delay': delay}
+
+    delays = [0.05, 0.0, 0.03, 0.01, 0.04, 0.02]
+    completed = []
+    results = AsyncScrapeEngine(worker, concurrency=6, requests_per_second=None).run_sync(
+        delays, on_result=lambda done, total, item, result: completed.append((done, total, item)))
+    assert results == [{'delay': delay} for delay in delays]
+    # 콜백은 끝나는 순서대로, 완료 개수는 1부터
+    assert [done for done, total, item in completed] == [1, 2, 3, 4, 5, 6]
+    assert completed[0][2] == 0.0 and completed[-1][2] == 0.05
+
+
+def test_concurrency_cap():
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0}
+
+    def worker(item):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        time.sleep(0.02)
+        with lock:
+            state['running'] -= 1
+        return {'item': item}
+
+    AsyncScrapeEngine(worker, concurrency=3, requests_per_second=None).run_sync(range(12))
+    assert state['peak'] == 3
+
+    # 코루틴 작업자도 같은 한도
+    async def aworker(item):
+        state['running'] += 1
+        state['peak'] = max(state['peak'], state['running'])
+        await asyncio.sleep(0.01)
+        state['running'] -= 1
+        return {'item': item}
+
+    state['peak'] = 0
+    AsyncScrapeEngine(aworker, concurrency=4, requests_per_second=None).run_sync(range(12))
+    assert state['peak'] == 4
+
+
+def test_worker_exceptions_become_error_results():
+    def worker(item):
+        if item % 2:
+            raise ValueError(f"bad item {item}")
+        return {'item': item}
+
+    results = AsyncScrapeEngine(worker, concurrency=2, requests_per_second=None).run_sync(range(4))
+    assert results == [{'item': 0}, {'error': 'bad item 1'}, {'item': 2}, {'error': 'bad item 3'}]
+    assert AsyncScrapeEngine(worker).run_sync([]) == []
+
+
+if __name__ == "__main__":
+    test_token_bucket_spreads_a_burst()
+    test_shared_rate_limit_across_workers()
+    test_results_keep_input_order()
+    test_concurrency_cap()
+    test_worker_exceptions_become_error_results()
+    print("[완료] 비동기 스크래핑 엔진 테스트 통과")
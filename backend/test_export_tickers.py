@@ -0,0 +1,124 @@
+"""
+종목 코드 내보내기 테스트
+
+POST /api/export/tickers가 캐시(없으면 이력, 그다음 클라이언트가 보낸 결과)로 행을 채우고, 모두 없는 종목만
+(저장된 네이버 페이지로) 가져오는지, 기존 /api/export와 같은 행을 만드는지 확인합니다.
+네트워크에 접속하지 않습니다.
+"""
+
+import csv
+import io
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from history_store import HistoryStore
+from naver_standin import FIXTURE_DIR
+from parser_backend import parse_html
+from stock_universe import UniverseSnapshot
+
+
+CACHED = {
+    'current_price': '70,000', 'opinion': '매수', 'opinion_score': '4.00', 'target_price': '90,000',
+    'high_52w': '88,000', 'low_52w': '50,000', 'sector': '반도체', 'per': '12.50',
+}
+
+
+def setup_module(module=None):
+    main.response_cache.clear()
+    main.history_store = main.trading_scraper.history = HistoryStore(':memory:')
+    main.response_cache.set('trading:005930', CACHED)
+    main.stock_universe._snapshot = UniverseSnapshot([
+        {'ticker': '005930', 'name': '삼성전자', 'market': 'KOSPI'},
+        {'ticker': '035720', 'name': '카카오', 'market': 'KOSDAQ'},
+    ], time.time())
+
+    def fetch_fixture(ticker):
+        path = os.path.join(FIXTURE_DIR, 'kosdaq_035720.html')
+        if ticker != '035720':
+            return None
+        with open(path, encoding='utf-8') as f:
+            return parse_html(f.read(), main.HTML_PARSER)
+
+    main.trading_scraper.fetch_page = fetch_fixture
+
+
+def read_csv(response):
+    return list(csv.reader(io.StringIO(response.content.decode('utf-8-sig'))))
+
+
+def test_cached_rows_match_payload_export():
+    client = TestClient(main.app)
+    by_tickers = client.post('/api/export/tickers?format=csv', json={'tickers': ['005930']})
+    assert by_tickers.headers['X-Export-Cached'] == '1'
+    assert by_tickers.headers['X-Export-Fetched'] == '0'
+
+    payload = client.post('/api/export?format=csv', json={
+        'stocks': [{'ticker': '005930', 'name': '삼성전자', 'market': 'KOSPI'}],
+        'analysis': {'005930': {key: CACHED[key] for key in CACHED if key != 'per'}},
+    })
+    assert read_csv(by_tickers) == read_csv(payload)
+    assert read_csv(by_tickers)[1] == ['005930', '삼성전자', '70,000', '매수 (4.00)', '90,000',
+                                       '88,000', '50,000', '반도체', 'KOSPI']
+
+
+def test_missing_tickers_are_fetched_or_left_blank():
+    client = TestClient(main.app)
+    body = {'tickers': ['005930', '035720', '999999'], 'columns': ['ticker', 'name', 'per', 'pbr'], 'fetch_missing': False}
+    rows = read_csv(client.post('/api/export/tickers?format=csv', json=body))
+    assert rows == [['종목코드', '종목명', 'per', 'pbr'], ['005930', '삼성전자', '12.50', 'N/A'],
+                    ['035720', '카카오', '-', '-'], ['999999', '', '-', '-']]
+
+    body['fetch_missing'] = True
+    response = client.post('/api/export/tickers?format=csv', json=body)
+    # 가져오지 못한 999999는 새로 가져온 수에서 제외
+    assert response.headers['X-Export-Fetched'] == '1'
+    rows = read_csv(response)
+    assert rows[2] == ['035720', '카카오', 'N/A', '1.92']
+    assert rows[3] == ['999999', '', '-', '-']
+    # 가져온 종목은 캐시에 저장되어 다음 내보내기에서 재사용
+    assert main.response_cache.get('trading:035720') is not None
+
+
+def test_history_fills_cache_misses():
+    now = time.time()
+    main.history_store.record('000660', {'per': '8.00', 'pbr': '1.10'}, scraped_at=now - 60)
+    main.history_store.record('000270', {'per': '5.00', 'pbr': '0.70'}, scraped_at=now - main.EXPORT_CACHE_MAX_AGE - 60)
+
+    client = TestClient(main.app)
+    body = {'tickers': ['000660', '000270'], 'columns': ['ticker', 'per', 'pbr'], 'fetch_missing': False}
+    response = client.post('/api/export/tickers?format=csv', json=body)
+    assert read_csv(response) == [['종목코드', 'per', 'pbr'], ['000660', '8.00', '1.10'], ['000270', '-', '-']]
+    assert response.headers['X-Export-Cached'] == '1'
+    assert response.headers['X-Export-Fetched'] == '0'
+
+
+def test_client_rows_fill_what_the_server_lacks():
+    client = TestClient(main.app)
+    mine = {'current_price': '1,000', 'opinion': '매수', 'opinion_score': '4.00', 'sector': '은행'}
+    body = {'tickers': ['005930', '000001', '000002'], 'columns': ['ticker', 'current_price', 'opinion', 'sector'],
+            'fetch_missing': False, 'analysis': {'005930': {'current_price': 'stale'}, '000001': mine}}
+    response = client.post('/api/export/tickers?format=csv', json=body)
+    # 서버 캐시가 있으면 서버 값, 없으면 클라이언트 값, 둘 다 없으면 '-'
+    assert read_csv(response)[1:] == [['005930', '70,000', '매수 (4.00)', '반도체'],
+                                      ['000001', '1,000', '매수 (4.00)', '은행'],
+                                      ['000002', '-', '-', '-']]
+    assert [response.headers[f'X-Export-{name}'] for name in ('Cached', 'Client', 'Fetched')] == ['1', '1', '0']
+
+
+def test_rejects_unknown_columns_and_formats():
+    client = TestClient(main.app)
+    assert 'error' in client.post('/api/export/tickers', json={'tickers': ['005930'], 'columns': ['bogus']}).json()
+    assert 'error' in client.post('/api/export/tickers?format=pdf', json={'tickers': ['005930']}).json()
+
+
+if __name__ == "__main__":
+    setup_module()
+    test_cached_rows_match_payload_export()
+    test_missing_tickers_are_fetched_or_left_blank()
+    test_history_fills_cache_misses()
+    test_client_rows_fill_what_the_server_lacks()
+    test_rejects_unknown_columns_and_formats()
+    print("[완료] 종목 코드 내보내기 테스트 통과")
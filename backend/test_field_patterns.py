@@ -0,0 +1,60 @@
+"""
+필드 정규식 스캐너 테스트
+
+PATTERN_GROUPS 묶음이 기존 개별 re.search와 같은 값을 추출하고,
+필드별 검사/일치 통계를 누적하는지 확인합니다.
+"""
+
+from field_patterns import PATTERN_GROUPS, PatternScanner
+
+
+BLIND_TEXT = (
+    '\n\t\t\t현재가 41,250 전일대비 하락 1,350\n\t\t\t전일가 42,600\n\t\t\t시가 42,300'
+    '\n\t\t\t고가 42,650\n\t\t\t상한가 55,300\n\t\t\t저가 41,000\n\t\t\t하한가 29,850'
+    '\n\t\t\t거래량 2,183,407\n\t\t\t거래대금 90,612백만\n\t\t'
+)
+
+
+def test_blind_groups():
+    scanner = PatternScanner()
+    assert scanner.scan('blind_price', BLIND_TEXT) == {
+        'prev_close': '42,600', 'opening_price': '42,300', 'high_price': '42,650',
+        'low_price': '41,000', 'upper_limit': '55,300', 'lower_limit': '29,850',
+    }
+    assert scanner.scan('blind_trading', BLIND_TEXT) == {'volume': '2,183,407', 'trading_value': '90,612'}
+
+
+def test_block_keywords_and_normalize():
+    scanner = PatternScanner()
+    assert scanner.scan('week52', '52주최고 l 최저 168,500l52,500') == {'high_52w': '168,500', 'low_52w': '52,500'}
+    assert scanner.scan('week52', '52주 최고가') == {}
+    assert scanner.scan('opinion', '투자의견 4.00매수 목표주가  214,125원') == {
+        'target_price': '214,125', 'opinion_score': '4.00', 'opinion': '매수',
+    }
+    # 목표주가가 일치하지 않으면 점수/의견도 추출하지 않음
+    assert scanner.scan('opinion', '투자의견 l 목표주가 4.00매수 l214,125') == {}
+
+
+def test_stats():
+    scanner = PatternScanner()
+    scanner.scan('per_cell', '34.84배4,816원')
+    scanner.scan('per_cell', 'N/A')
+    scanner.scan('week52', '관련 없는 텍스트')
+
+    stats = scanner.stats()
+    assert stats['fields']['per'] == {**stats['fields']['per'], 'scans': 2, 'matches': 1}
+    assert stats['fields']['eps']['matches'] == 1
+    assert stats['groups']['per_cell']['scans'] == 2
+    # 키워드가 없는 블록은 통계에 넣지 않음
+    assert stats['groups']['week52']['scans'] == 0
+    assert set(stats['fields']) == {field for group in PATTERN_GROUPS.values() for field in group.fields}
+
+    scanner.reset_stats()
+    assert scanner.stats()['fields']['per']['scans'] == 0
+
+
+if __name__ == "__main__":
+    test_blind_groups()
+    test_block_keywords_and_normalize()
+    test_stats()
+    print("[완료] 필드 정규식 스캐너 테스트 통과")
@@ -0,0 +1,133 @@
+"""
+비동기 Gemini 클라이언트 테스트
+
+agenerate_json이 API 키별 동시 요청 수 제한을 지키고, 기한이 지나면 진행 중인 요청을
+취소하며, aget_strategies가 일괄/재분석 요청을 처리하는지, 키별 제한이 개수 한도 안에서만
+보관되는지 확인합니다.
+httpx.MockTransport로 응답을 돌려주므로 API를 호출하지 않습니다.
+"""
+
+import asyncio
+import hashlib
+import json
+
+import httpx
+
+import gemini_analyzer
+
+
+def reply(payload):
+    text = "```json\n" + json.dumps(payload, ensure_ascii=False) + "\n```"
+    return httpx.Response(200, json={'candidates': [{'content': {'parts': [{'text': text}]}}]})
+
+
+def test_concurrency_is_limited_per_key(make_analyzer, mock_transport):
+    in_flight = {'test-key': 0, 'other-key': 0}
+    peak = dict(in_flight)
+
+    async def handler(request):
+        key = request.url.params['key']
+        in_flight[key] += 1
+        peak[key] = max(peak[key], in_flight[key])
+        await asyncio.sleep(0.02)
+        in_flight[key] -= 1
+        return reply({'strategic_recommendation': key, 'strategic_solution': 'ok'})
+
+    async def run():
+        await mock_transport(handler, concurrency=2)
+        first, second = make_analyzer('test-key'), make_analyzer('other-key')
+        results = await asyncio.gather(*(
+            analyzer.agenerate_json('prompt') for analyzer in [first, second] * 5
+        ))
+        await gemini_analyzer.close_async_client()
+        return results
+
+    results = asyncio.run(run())
+    assert len(results) == 10
+    assert peak == {'test-key': 2, 'other-key': 2}
+
+
+def test_deadline_cancels_request(make_analyzer, mock_transport):
+    cancelled = []
+
+    async def handler(request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return reply({})
+
+    async def run():
+        await mock_transport(handler)
+        analyzer = make_analyzer()
+        try:
+            await analyzer.agenerate_json('prompt', deadline=0.05)
+        except Exception as e:
+            assert 'deadline' in str(e)
+        else:
+            raise AssertionError("expected deadline error")
+        # 실패는 안내 문구로 바뀌고 캐시하지 않음
+        strategy = await analyzer.aget_strategy({'ticker': '005930', 'name': '삼성전자'}, deadline=0.05)
+        await gemini_analyzer.close_async_client()
+        return strategy
+
+    strategy = asyncio.run(run())
+    assert cancelled == [True, True]
+    assert strategy == gemini_analyzer.FALLBACK_STRATEGY
+
+
+def test_async_batch_with_fallback(make_analyzer, mock_transport):
+    stocks = [{'ticker': f"{i:06d}", 'name': f"종목{i}"} for i in range(5)]
+    singles = []
+
+    async def handler(request):
+        prompt = json.loads(request.content)['contents'][0]['parts'][0]['text']
+        if '종목별로 각각' in prompt:
+            tickers = [s['ticker'] for s in stocks if f"[{s['ticker']}]" in prompt]
+            return reply([{'ticker': t, 'strategic_recommendation': '분할 매수', 'strategic_solution': '손절가'}
+                          for t in tickers if t != '000003'])
+        singles.append(next(s['ticker'] for s in stocks if f"({s['ticker']})" in prompt))
+        return reply({'strategic_recommendation': 'single', 'strategic_solution': 'single'})
+
+    async def run():
+        await mock_transport(handler)
+        analyzer = make_analyzer()
+        results = await analyzer.aget_strategies(stocks, batch_size=2)
+        cached = await analyzer.aget_strategies(stocks, batch_size=2)
+        await gemini_analyzer.close_async_client()
+        return results, cached
+
+    results, cached = asyncio.run(run())
+    assert list(results) == [s['ticker'] for s in stocks]
+    assert singles == ['000003']
+    assert results['000003']['strategic_recommendation'] == 'single'
+    assert results['000004']['strategic_recommendation'] == '분할 매수'
+    assert cached == results
+
+
+def test_key_limiters_are_bounded():
+    original = gemini_analyzer.GEMINI_MAX_KEY_LIMITERS
+    gemini_analyzer.GEMINI_MAX_KEY_LIMITERS = 2
+    try:
+        state = gemini_analyzer._AsyncState()
+        first = state.limiter_for('key-a')
+        state.limiter_for('key-b')
+        assert state.limiter_for('key-a') is first
+
+        # 가장 오래 안 쓴 key-b를 버림
+        state.limiter_for('key-c')
+        assert len(state.limiters) == 2
+        assert state.limiter_for('key-a') is first
+        assert hashlib.sha256(b'key-b').hexdigest() not in state.limiters
+    finally:
+        gemini_analyzer.GEMINI_MAX_KEY_LIMITERS = original
+
+
+if __name__ == "__main__":
+    from conftest import new_analyzer, use_mock_transport
+    test_concurrency_is_limited_per_key(new_analyzer, use_mock_transport)
+    test_deadline_cancels_request(new_analyzer, use_mock_transport)
+    test_async_batch_with_fallback(new_analyzer, use_mock_transport)
+    test_key_limiters_are_bounded()
+    print("[완료] 비동기 Gemini 클라이언트 테스트 통과")
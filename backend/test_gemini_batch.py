@@ -0,0 +1,131 @@
+"""
+Gemini 일괄 전략 분석 테스트
+
+get_strategies가 종목을 batch_size개씩 한 번에 요청하고, 응답에서 빠졌거나 형식이 잘못된
+종목만 하나씩 다시 분석하며, 캐시에 있는 종목은 요청하지 않는지, API 호출이 실패한 묶음(429 등)은
+종목별로 다시 요청하지 않고 안내 문구로 채우는지 확인합니다. (API 호출 없음)
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import gemini_analyzer
+from gemini_analyzer import FALLBACK_STRATEGY, GeminiAPIError, parse_batch_answer
+
+
+STOCKS = [{'ticker': f"{i:06d}", 'name': f"종목{i}", 'current_price': f"{1000 + i:,}"} for i in range(7)]
+
+
+def entry(ticker, text='분할 매수'):
+    return {'ticker': ticker, 'strategic_recommendation': text, 'strategic_solution': '손절가 설정'}
+
+
+def batch_analyzer(make_analyzer, answer_for):
+    """answer_for(요청 종목 코드 목록) -> 일괄 응답"""
+    analyzer = make_analyzer()
+    analyzer.prompts = []
+    analyzer.singles = []
+
+    def generate_json(prompt, timeout=30):
+        if '종목별로 각각' in prompt:
+            tickers = [s['ticker'] for s in STOCKS if f"[{s['ticker']}]" in prompt]
+            analyzer.prompts.append(tickers)
+            return answer_for(tickers)
+        ticker = next(s['ticker'] for s in STOCKS if f"({s['ticker']})" in prompt)
+        analyzer.singles.append(ticker)
+        return {'strategic_recommendation': 'single', 'strategic_solution': 'single'}
+
+    analyzer.generate_json = generate_json
+    return analyzer
+
+
+def test_batches_and_fallback(make_analyzer):
+    def answer(tickers):
+        entries = [entry(t) for t in tickers]
+        if '000001' in tickers:
+            entries[1] = {'ticker': '000001', 'strategic_recommendation': ''}    # 빈 필드
+        if '000004' in tickers:
+            entries = [e for e in entries if e['ticker'] != '000004']           # 누락
+        return entries + [entry('999999')]                                      # 요청하지 않은 종목
+
+    analyzer = batch_analyzer(make_analyzer, answer)
+    results = analyzer.get_strategies(STOCKS, batch_size=3)
+
+    assert analyzer.prompts == [['000000', '000001', '000002'], ['000003', '000004', '000005'], ['000006']]
+    assert analyzer.singles == ['000001', '000004']
+    assert list(results) == [s['ticker'] for s in STOCKS]
+    assert results['000000']['strategic_recommendation'] == '분할 매수'
+    assert results['000004']['strategic_recommendation'] == 'single'
+
+    # 두 번째 요청은 전부 캐시에서
+    analyzer.prompts.clear()
+    analyzer.singles.clear()
+    assert analyzer.get_strategies(STOCKS, batch_size=3) == results
+    assert analyzer.prompts == [] and analyzer.singles == []
+
+
+def test_failed_batch_falls_back_per_ticker(make_analyzer):
+    def answer(tickers):
+        raise json.JSONDecodeError("Expecting value", "", 0)
+
+    analyzer = batch_analyzer(make_analyzer, answer)
+    results = analyzer.get_strategies(STOCKS[:2], batch_size=10)
+    assert analyzer.singles == ['000000', '000001']
+    assert results['000001']['strategic_solution'] == 'single'
+
+
+def test_rate_limited_batch_is_not_retried_per_ticker(make_analyzer):
+    def answer(tickers):
+        if '000003' in tickers:
+            raise GeminiAPIError("API Error: 429")
+        return [entry(t) for t in tickers]
+
+    analyzer = batch_analyzer(make_analyzer, answer)
+    results = analyzer.get_strategies(STOCKS, batch_size=3)
+    assert len(analyzer.prompts) == 3 and analyzer.singles == []
+    assert [results[t] for t in ('000003', '000004', '000005')] == [FALLBACK_STRATEGY] * 3
+    assert results['000006']['strategic_recommendation'] == '분할 매수'
+
+    # 안내 문구는 캐시하지 않으므로 다음 호출에서 실패한 묶음만 다시 요청
+    analyzer.prompts.clear()
+    analyzer.get_strategies(STOCKS, batch_size=3)
+    assert analyzer.prompts == [['000003', '000004', '000005']]
+
+
+def test_async_rate_limited_batch_is_not_retried_per_ticker(make_analyzer, mock_transport):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(429, json={'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED'}})
+
+    async def run():
+        await mock_transport(handler)
+        results = await make_analyzer().aget_strategies(STOCKS, batch_size=3)
+        await gemini_analyzer.close_async_client()
+        return results
+
+    results = asyncio.run(run())
+    # 묶음 3개만 요청하고 종목별 재요청 없음
+    assert len(calls) == 3
+    assert list(results.values()) == [FALLBACK_STRATEGY] * len(STOCKS)
+
+
+def test_parse_batch_answer_accepts_mapping():
+    answer = {'000000': {'strategic_recommendation': 'a', 'strategic_solution': 'b'}, '000001': 'bad'}
+    assert parse_batch_answer(answer, ['000000', '000001']) == {
+        '000000': {'strategic_recommendation': 'a', 'strategic_solution': 'b'}
+    }
+    assert parse_batch_answer("not json array", ['000000']) == {}
+
+
+if __name__ == "__main__":
+    from conftest import new_analyzer, use_mock_transport
+    test_batches_and_fallback(new_analyzer)
+    test_failed_batch_falls_back_per_ticker(new_analyzer)
+    test_rate_limited_batch_is_not_retried_per_ticker(new_analyzer)
+    test_async_rate_limited_batch_is_not_retried_per_ticker(new_analyzer, use_mock_transport)
+    test_parse_batch_answer_accepts_mapping()
+    print("[완료] Gemini 일괄 분석 테스트 통과")
@@ -0,0 +1,67 @@
+"""
+Gemini 전략 분석 결과 캐시 테스트
+
+프롬프트에 쓰이는 필드와 모델이 같으면 API를 다시 호출하지 않고,
+필드/모델이 바뀌거나 분석이 실패하면 캐시를 쓰지 않는지 확인합니다. (API 호출 없음)
+"""
+
+from gemini_analyzer import prompt_fingerprint
+from stock_record import StockRecord
+
+
+STOCK = {'ticker': '005930', 'name': '삼성전자', 'current_price': '72,000', 'per': '12.70', 'sector': '반도체'}
+
+
+def counting_analyzer(make_analyzer, cache, model='gemini-1.5-flash', fail=False):
+    analyzer = make_analyzer(model=model, cache=cache)
+    analyzer.calls = 0
+
+    def generate_json(prompt, timeout=30):
+        analyzer.calls += 1
+        if fail:
+            raise Exception("API Error: 429")
+        return {'strategic_recommendation': f"call {analyzer.calls}", 'strategic_solution': '분할 매수'}
+
+    analyzer.generate_json = generate_json
+    return analyzer
+
+
+def test_fingerprint_uses_prompt_fields_only():
+    base = prompt_fingerprint(STOCK)
+    assert prompt_fingerprint({**STOCK, 'loading': False, 'volume': '1,000'}) == base
+    assert prompt_fingerprint({**STOCK, 'current_price': '72,100'}) != base
+    assert prompt_fingerprint(STOCK, model='gemini-1.5-pro') != base
+
+
+def test_repeat_analysis_is_served_from_cache(make_analyzer, cache):
+    analyzer = counting_analyzer(make_analyzer, cache)
+    first = analyzer.get_strategy(STOCK)
+    assert analyzer.get_strategy(dict(STOCK)) == first
+    assert analyzer.calls == 1
+
+    # StockRecord는 표시용 문자열(없는 필드는 'N/A')로 바꾼 프롬프트 기준이라 다른 키
+    record = StockRecord.from_scraped(STOCK, '005930', '삼성전자')
+    counting_analyzer(make_analyzer, cache).get_strategy(record)
+    assert cache.stats()['entries'] == 2
+
+    other_model = counting_analyzer(make_analyzer, cache, model='gemini-1.5-pro')
+    other_model.get_strategy(STOCK)
+    assert other_model.calls == 1
+
+
+def test_failures_are_not_cached(make_analyzer, cache):
+    failing = counting_analyzer(make_analyzer, cache, fail=True)
+    assert failing.get_strategy(STOCK)['strategic_recommendation'] == "분석 오류가 발생했습니다."
+    assert cache.stats()['entries'] == 0
+
+    working = counting_analyzer(make_analyzer, cache)
+    working.get_strategy(STOCK)
+    assert working.calls == 1
+
+
+if __name__ == "__main__":
+    from conftest import memory_cache, new_analyzer
+    test_fingerprint_uses_prompt_fields_only()
+    test_repeat_analysis_is_served_from_cache(new_analyzer, memory_cache())
+    test_failures_are_not_cached(new_analyzer, memory_cache())
+    print("[완료] Gemini 결과 캐시 테스트 통과")
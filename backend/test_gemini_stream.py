@@ -0,0 +1,116 @@
+"""
+Gemini 스트리밍 전략 분석 테스트
+
+astream_text가 streamGenerateContent SSE 조각을 생성이 끝나기 전에 내보내고,
+astream_strategy가 마지막에 전체 텍스트를 JSON으로 파싱해 캐시하며,
+/api/gemini-analyze/{ticker}/stream이 delta/result 이벤트를 보내는지 확인합니다. (API 호출 없음)
+"""
+
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+import gemini_analyzer
+import main
+from gemini_analyzer import GeminiAnalyzer
+
+
+STOCK = {'ticker': '005930', 'name': '삼성전자', 'current_price': '72,000'}
+ANSWER = json.dumps({'strategic_recommendation': '분할 매수', 'strategic_solution': '손절가 설정'}, ensure_ascii=False)
+PIECES = ["```json\n", ANSWER[:20], ANSWER[20:], "\n```"]
+
+
+def sse_chunk(text):
+    payload = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\r\n\r\n".encode('utf-8')
+
+
+def test_first_delta_arrives_before_generation_ends(make_analyzer, mock_transport):
+    async def run():
+        released = asyncio.Event()
+        requests_seen = []
+
+        async def body():
+            yield sse_chunk(PIECES[0])
+            # 테스트가 첫 조각을 받은 뒤에야 나머지를 생성
+            await released.wait()
+            for piece in PIECES[1:]:
+                yield sse_chunk(piece)
+            yield b'data: {"candidates": [{"finishReason": "STOP"}]}\r\n\r\n'
+
+        def handler(request):
+            requests_seen.append(request.url)
+            return httpx.Response(200, content=body(), headers={'Content-Type': 'text/event-stream'})
+
+        await mock_transport(handler)
+
+        analyzer = make_analyzer()
+        events = []
+        async for event, data in analyzer.astream_strategy(STOCK):
+            if not events:
+                assert not released.is_set()
+                released.set()
+            events.append((event, data))
+
+        # 두 번째는 캐시에서 result만
+        cached = [event async for event in analyzer.astream_strategy(STOCK)]
+        await gemini_analyzer.close_async_client()
+        return requests_seen, events, cached
+
+    requests_seen, events, cached = asyncio.run(run())
+    assert len(requests_seen) == 1
+    assert 'streamGenerateContent' in requests_seen[0].path and requests_seen[0].params['alt'] == 'sse'
+    assert [data['text'] for event, data in events if event == 'delta'] == PIECES
+    assert events[-1] == ('result', json.loads(ANSWER))
+    assert cached == [('result', json.loads(ANSWER))]
+
+
+def test_malformed_stream_falls_back(make_analyzer, mock_transport):
+    async def run():
+        def handler(request):
+            return httpx.Response(200, content=sse_chunk('분석할 수 없습니다'))
+
+        await mock_transport(handler)
+
+        events = [event async for event in make_analyzer().astream_strategy(STOCK)]
+        await gemini_analyzer.close_async_client()
+        return events
+
+    events = asyncio.run(run())
+    assert [event for event, data in events] == ['delta', 'error', 'result']
+    assert events[-1][1] == gemini_analyzer.FALLBACK_STRATEGY
+
+
+def test_stream_endpoint():
+    async def fake_stream(self, prompt, deadline=30):
+        for piece in PIECES:
+            yield piece
+
+    original = GeminiAnalyzer.astream_text
+    GeminiAnalyzer.astream_text = fake_stream
+    gemini_analyzer.strategy_cache.clear()
+    try:
+        client = TestClient(main.app)
+        response = client.post('/api/gemini-analyze/005930/stream', json=STOCK, headers={'X-Gemini-API-Key': 'test-key'})
+    finally:
+        GeminiAnalyzer.astream_text = original
+        gemini_analyzer.strategy_cache.clear()
+
+    assert response.headers['content-type'].startswith('text/event-stream')
+    blocks = [block.split('\n') for block in response.text.strip().split('\n\n')]
+    events = [(lines[0][len('event: '):], json.loads(lines[1][len('data: '):])) for lines in blocks]
+    assert [event for event, data in events] == ['delta'] * len(PIECES) + ['result']
+    assert ''.join(data['text'] for event, data in events[:-1]) == ''.join(PIECES)
+    assert events[-1][1]['strategic_recommendation'] == '분할 매수'
+
+    assert 'error' in client.post('/api/gemini-analyze/005930/stream', json=STOCK).json()
+
+
+if __name__ == "__main__":
+    from conftest import new_analyzer, use_mock_transport
+    test_first_delta_arrives_before_generation_ends(new_analyzer, use_mock_transport)
+    test_malformed_stream_falls_back(new_analyzer, use_mock_transport)
+    test_stream_endpoint()
+    print("[완료] Gemini 스트리밍 전략 분석 테스트 통과")
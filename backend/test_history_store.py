@@ -0,0 +1,102 @@
+"""
+스크래핑 이력 저장소 테스트
+
+HistoryStore가 (ticker, scraped_at) 순서의 시계열을 저장/조회하고,
+/api/history/{ticker}와 get_trading_info가 네이버 요청 없이 이력을 사용하는지 확인합니다.
+"""
+
+import time
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import main
+from history_store import HistoryStore
+from stock_analysis_system import StockAnalysisSystem
+
+
+def day(text):
+    return datetime.fromisoformat(text).timestamp()
+
+
+def make_store():
+    store = HistoryStore(':memory:')
+    store.record('005930', {'current_price': '70,000', 'per': '12.50'}, scraped_at=day('2026-10-14 15:30:00'))
+    store.record('005930', {'current_price': '71,000', 'per': '12.60'}, scraped_at=day('2026-10-15 15:30:00'))
+    store.record('005930', {'current_price': '72,000', 'per': '12.70'}, scraped_at=day('2026-10-16 15:30:00'))
+    store.record('035720', {'current_price': '41,250'}, scraped_at=day('2026-10-16 15:30:00'))
+    store.record('005930', {'error': 'Failed to fetch page'})
+    return store
+
+
+def test_series_and_latest():
+    store = make_store()
+    assert store.count() == 4
+    assert store.count('005930') == 3
+
+    items = store.series('005930', fields=['current_price'])
+    assert items == [
+        {'scraped_at': '2026-10-14 15:30:00', 'current_price': '70,000'},
+        {'scraped_at': '2026-10-15 15:30:00', 'current_price': '71,000'},
+        {'scraped_at': '2026-10-16 15:30:00', 'current_price': '72,000'},
+    ]
+    # 날짜만 준 until은 그날 끝까지 포함, limit은 가장 최근 것부터
+    assert [i['per'] for i in store.series('005930', since='2026-10-15', until='2026-10-15')] == ['12.60']
+    assert [i['per'] for i in store.series('005930', limit=2)] == ['12.60', '12.70']
+
+    scraped_at, data = store.latest('005930')
+    assert scraped_at == day('2026-10-16 15:30:00') and data['current_price'] == '72,000'
+    assert store.latest('005930', max_age=60) is None
+    assert store.latest('000000') is None
+
+
+def test_history_endpoint():
+    main.history_store = make_store()
+    client = TestClient(main.app)
+
+    body = client.get('/api/history/005930', params={'fields': 'current_price', 'since': '2026-10-15'}).json()
+    assert body['count'] == 2
+    assert body['items'][-1] == {'scraped_at': '2026-10-16 15:30:00', 'current_price': '72,000'}
+    assert 'error' in client.get('/api/history/005930', params={'since': 'yesterday'}).json()
+
+
+def test_recent_history_is_served_without_scraping():
+    store = HistoryStore(':memory:')
+    store.record('005930', {'current_price': '72,000'}, scraped_at=time.time() - 5)
+    main.history_store = store
+    main.response_cache.clear()
+
+    def no_network(ticker):
+        raise AssertionError("should not scrape")
+
+    original = main.trading_scraper.fetch_page
+    main.trading_scraper.fetch_page = no_network
+    try:
+        assert main.get_trading_info('005930') == {'current_price': '72,000'}
+        # 캐시에는 이력의 원래 시각으로 올라가므로 TTL이 늘어나지 않음
+        assert main.response_cache.get('trading:005930', max_age=4) is None
+        assert main.response_cache.get('trading:005930') == {'current_price': '72,000'}
+    finally:
+        main.trading_scraper.fetch_page = original
+
+
+def test_scrapes_are_recorded():
+    store = HistoryStore(':memory:')
+    scraper = main.TradingStrategyScraper(history=store)
+    scraper.fetch_page = lambda ticker: main.parse_html('<div class="no_today"></div>', main.HTML_PARSER)
+    scraper.get_complete_trading_info('005930')
+    assert store.count('005930') == 1
+
+    # 일괄 분석 파이프라인도 같은 저장소에 기록
+    system = StockAnalysisSystem(history=store)
+    system.scraper.fetch_page = scraper.fetch_page
+    system.scrape_stock('035720', '카카오', 'KOSDAQ')
+    assert store.count('035720') == 1
+
+
+if __name__ == "__main__":
+    test_series_and_latest()
+    test_history_endpoint()
+    test_recent_history_is_served_without_scraping()
+    test_scrapes_are_recorded()
+    print("[완료] 스크래핑 이력 저장소 테스트 통과")
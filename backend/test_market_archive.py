@@ -0,0 +1,95 @@
+"""
+Parquet 아카이브 테스트
+
+MarketArchive가 분석 결과를 날짜/시장 파티션에 타입 있는 컬럼으로 저장하고,
+같은 날짜를 다시 저장하면 교체하며, 필요한 컬럼/기간/시장만 읽는지 확인합니다.
+pyarrow가 없으면 건너뜁니다.
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+
+from table_export import parquet_available
+
+
+ANALYZED = [
+    {'ticker': '005930', 'name': '삼성전자', 'market': 'KOSPI', 'scraped_at': '2026-10-15 15:30:00',
+     'current_price': 70000.0, 'per': 12.5, 'opinion': '매수', 'score': 75, 'grade': 'A',
+     'signals': ['저PER', '고ROE'], 'recommendation': '매수', 'strategy': '분할 매수 추천'},
+    {'ticker': '035720', 'name': '카카오', 'market': 'KOSDAQ', 'scraped_at': '2026-10-15 15:30:00',
+     'current_price': 41250.0, 'per': None, 'score': 40, 'grade': 'D', 'signals': [],
+     'recommendation': '매도 검토', 'strategy': '리스크 관리 필요'},
+]
+
+
+def make_archive():
+    from market_archive import MarketArchive
+    archive = MarketArchive(os.path.join(tempfile.mkdtemp(), 'archive'))
+    archive.append(ANALYZED, '2026-10-15')
+    archive.append(ANALYZED[:1], date(2026, 10, 16))
+    return archive
+
+
+def test_partitions_and_types():
+    if not parquet_available():
+        print("[SKIP] pyarrow가 없어 아카이브 테스트를 건너뜁니다.")
+        return
+    import pyarrow as pa
+
+    archive = make_archive()
+    assert archive.dates() == [date(2026, 10, 15), date(2026, 10, 16)]
+    assert os.path.exists(os.path.join(archive.root, 'date=2026-10-15', 'market=KOSDAQ', 'part-0.parquet'))
+
+    table = archive.read()
+    assert table.num_rows == 3
+    assert table.schema.field('per').type == pa.float64()
+    assert table.schema.field('score').type == pa.int16()
+    assert table.schema.field('date').type == pa.date32()
+    rows = {(row['date'], row['ticker']): row for row in table.to_pylist()}
+    samsung = rows[(date(2026, 10, 15), '005930')]
+    assert samsung['signals'] == ['저PER', '고ROE']
+    assert samsung['scraped_at'] == datetime(2026, 10, 15, 15, 30)
+    assert rows[(date(2026, 10, 15), '035720')]['per'] is None
+
+
+def test_same_day_is_replaced():
+    if not parquet_available():
+        return
+    archive = make_archive()
+    archive.append([dict(ANALYZED[0], score=80)], '2026-10-15')
+    table = archive.read(['ticker', 'score'], start='2026-10-15', end='2026-10-15')
+    # KOSPI 파티션만 교체되고 KOSDAQ 파티션은 그대로
+    assert sorted(table.column('ticker').to_pylist()) == ['005930', '035720']
+    assert dict(zip(table.column('ticker').to_pylist(), table.column('score').to_pylist()))['005930'] == 80
+
+
+def test_read_filters_columns_dates_and_markets():
+    if not parquet_available():
+        return
+    archive = make_archive()
+    table = archive.read(['ticker', 'score'], start=date(2026, 10, 16))
+    assert table.column_names == ['date', 'market', 'ticker', 'score']
+    assert table.to_pylist() == [{'date': date(2026, 10, 16), 'market': 'KOSPI', 'ticker': '005930', 'score': 75}]
+
+    assert archive.read(['ticker'], markets=['KOSDAQ']).column('ticker').to_pylist() == ['035720']
+    assert archive.read(['ticker'], end='2026-10-01').num_rows == 0
+
+    try:
+        archive.read(['bogus'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+    from market_archive import MarketArchive
+    empty = MarketArchive(os.path.join(tempfile.mkdtemp(), 'missing'))
+    assert empty.dates() == []
+    assert empty.read(['score']).num_rows == 0
+
+
+if __name__ == "__main__":
+    test_partitions_and_types()
+    test_same_day_is_replaced()
+    test_read_filters_columns_dates_and_markets()
+    print("[완료] Parquet 아카이브 테스트 통과")
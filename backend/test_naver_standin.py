@@ -0,0 +1,95 @@
+"""
+네이버 대역 서버 테스트
+
+NAVER_BASE_URL을 naver_standin.py 서버로 바꾸면 스크래퍼와 종목 목록 크롤러가
+저장된 페이지로 동작하고, 지연/오류 설정이 적용되는지, 오류 응답이 캐시/이력에 남지 않는지 확인합니다.
+부하 테스트 요약(백분위수) 계산도 함께 확인합니다.
+"""
+
+import asyncio
+import os
+import time
+
+import requests
+
+from history_store import HistoryStore
+from http_session import create_session
+from loadtest_api import percentile, summarize, ticker_for
+from naver_scraper_enhanced import NaverFinanceScraper
+from naver_scraper_trading import TradingStrategyScraper
+from naver_standin import FIXTURE_DIR
+from parser_backend import parse_html
+from stock_universe import StockUniverse
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_scrapers_read_recorded_pages(standin):
+    server = standin()
+    scraper = TradingStrategyScraper(session=create_session(max_retries=0))
+    expected = scraper.extractor.extract(parse_html(fixture('kospi_005935.html'), scraper.parser))
+    assert scraper.get_complete_trading_info('005935') == expected
+
+    # 픽스처에 없는 코드는 전체 크기 기본 페이지
+    default = scraper.extractor.extract(parse_html(fixture('kospi_005930_full.html'), scraper.parser))
+    assert scraper.get_complete_trading_info('123456') == default
+
+    info = NaverFinanceScraper(session=create_session(max_retries=0)).get_stock_info('247540')
+    assert info['high_52w'] == '282,500'
+    assert server.stats()['requests'] == 3
+
+
+def test_universe_crawls_list_pages(standin):
+    standin(list_size=230)
+    universe = StockUniverse(requests_per_second=None, session=create_session(max_retries=0))
+    stocks = universe.crawl()
+    assert len(stocks) == 230
+    tickers = {stock['ticker'] for stock in stocks}
+    assert {'005930', '005935', '247540', '069500', '900000'} <= tickers
+    assert {stock['market'] for stock in stocks if stock['ticker'] == '247540'} == {'KOSDAQ'}
+
+
+def test_latency_and_errors(standin):
+    server = standin(latency=0.05, error_rate=1.0)
+    start = time.perf_counter()
+    assert requests.get(f"{server.url}/item/main.naver?code=005930").status_code == 503
+    assert time.perf_counter() - start >= 0.05
+    assert server.stats() == {'requests': 1, 'errors': 1, 'max_in_flight': 1}
+
+
+def test_error_pages_are_not_cached(standin, app_state):
+    standin(error_rate=1.0, error_status=404)
+    app_state.history_store = app_state.trading_scraper.history = HistoryStore(':memory:')
+
+    assert app_state.get_trading_info('005930') == {'error': 'Failed to fetch page'}
+    assert asyncio.run(app_state.aget_trading_info('005930')) == {'error': 'Failed to fetch page'}
+    assert app_state.response_cache.get('trading:005930') is None
+    assert app_state.history_store.count() == 0
+
+    assert 'error' in app_state.fetch_stock_analysis('005930')
+    assert NaverFinanceScraper(session=create_session(max_retries=0)).fetch_page('005930') is None
+
+
+def test_percentiles():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.0505
+    assert abs(percentile(values, 99) - 0.09901) < 1e-9
+    summary = summarize(values, errors=2, elapsed=2.0)
+    assert summary['requests'] == 100 and summary['errors'] == 2 and summary['rps'] == 50
+    assert summary['max'] == 100
+    assert ticker_for(7, 0) == '900007' and ticker_for(7, 5) == '900002'
+
+
+if __name__ == "__main__":
+    from conftest import fresh_app_state, standin_servers
+    with standin_servers() as standin:
+        test_scrapers_read_recorded_pages(standin)
+        test_universe_crawls_list_pages(standin)
+        test_latency_and_errors(standin)
+        with fresh_app_state() as app_state:
+            test_error_pages_are_not_cached(standin, app_state)
+    test_percentiles()
+    print("[완료] 네이버 대역 서버 테스트 통과")
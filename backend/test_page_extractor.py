@@ -0,0 +1,60 @@
+"""
+단일 순회 추출기 결과 일치 테스트
+
+SinglePassExtractor가 저장된 네이버 종목 페이지(fixtures/naver/*.html)와 일부가 빠진 페이지에서
+TradingStrategyScraper의 개별 extract_* 메서드를 차례로 부른 결과와 키 순서까지 같은지 확인합니다.
+(파서 백엔드끼리의 비교는 test_parser_parity.py)
+"""
+
+from naver_scraper_trading import TradingStrategyScraper
+from naver_standin import fixture_pages
+from page_extractor import SinglePassExtractor
+from parser_backend import available_parsers, parse_html
+
+
+PARTIAL_PAGES = {
+    'empty': '<html><body></body></html>',
+    'price_only': '<html><body><div class="today"><p class="no_today"><em class="no_up">'
+                  '<span class="blind">72,000</span></em></p></div></body></html>',
+    'sector_only': '<html><body><h4 class="h_sub sub_tit7"><em><a href="#">업종명 : 반도체</a></em></h4></body></html>',
+}
+
+
+def load_pages():
+    """(이름, HTML) 목록 - 픽스처 페이지와 일부가 빠진 페이지"""
+    return fixture_pages() + sorted(PARTIAL_PAGES.items())
+
+
+def legacy_trading_info(scraper: TradingStrategyScraper, html: str) -> dict:
+    """개별 extract_* 메서드로 만든 기존 get_complete_trading_info 결과"""
+    soup = parse_html(html, scraper.parser)
+    return {
+        **scraper.extract_price_data(soup),
+        **scraper.extract_trading_data(soup),
+        **scraper.extract_valuation_metrics(soup),
+        **scraper.extract_supply_demand(soup),
+        **scraper.extract_financial_data(soup),
+        'sector': scraper.extract_sector(soup)
+    }
+
+
+def test_single_pass_extractor_matches_extract_methods():
+    for parser in available_parsers():
+        scraper = TradingStrategyScraper(parser=parser)
+        for name, html in load_pages():
+            expected = legacy_trading_info(scraper, html)
+            actual = scraper.extractor.extract(parse_html(html, parser))
+            assert list(actual.items()) == list(expected.items()), f"{name} ({parser})"
+
+
+def test_empty_page_has_every_field():
+    result = SinglePassExtractor().extract(parse_html(PARTIAL_PAGES['empty'], 'html.parser'))
+    full = SinglePassExtractor().extract(parse_html(load_pages()[0][1], 'html.parser'))
+    assert list(result) == list(full)
+    assert set(result.values()) <= {'N/A'}
+
+
+if __name__ == "__main__":
+    test_single_pass_extractor_matches_extract_methods()
+    test_empty_page_has_every_field()
+    print("[완료] 단일 순회 추출기 결과 일치 테스트 통과")
@@ -0,0 +1,51 @@
+"""
+HTML 파서 백엔드 결과 일치 테스트
+
+저장된 네이버 종목 페이지(fixtures/naver/*.html)를 사용 가능한 모든 파서 백엔드로
+파싱한 뒤, 세 스크래퍼가 추출한 딕셔너리가 기준 파서(html.parser)의 결과와
+같은지 확인합니다. 네트워크에 접속하지 않습니다.
+(단일 순회 추출기와 extract_* 메서드의 비교는 test_page_extractor.py)
+"""
+
+from naver_scraper_enhanced import parse_invest_info
+from naver_scraper_trading import TradingStrategyScraper
+from naver_standin import FIXTURE_DIR, fixture_pages
+from parser_backend import FALLBACK_PARSER, available_parsers, parse_html
+from main import parse_stock_analysis
+
+
+def extract_all(html: str, parser: str) -> dict:
+    """한 파서 백엔드로 세 스크래퍼의 추출 결과를 모읍니다."""
+    scraper = TradingStrategyScraper(parser=parser)
+    return {
+        'trading': scraper.extractor.extract(parse_html(html, parser)),
+        'enhanced': parse_invest_info(parse_html(html, parser)),
+        'analyze': analyze_result(html, parser),
+    }
+
+
+def analyze_result(html: str, parser: str) -> dict:
+    """/api/analyze 엔드포인트와 같이 예외를 error 딕셔너리로 바꿉니다."""
+    try:
+        return parse_stock_analysis(parse_html(html, parser))
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def test_fixtures_exist():
+    assert fixture_pages(), f"no fixtures found in {FIXTURE_DIR}"
+
+
+def test_backends_match_reference_parser():
+    for name, html in fixture_pages():
+        expected = extract_all(html, FALLBACK_PARSER)
+        for parser in available_parsers():
+            actual = extract_all(html, parser)
+            assert actual == expected, f"{name}: {parser} differs from {FALLBACK_PARSER}"
+
+
+if __name__ == "__main__":
+    print(f"사용 가능한 파서: {available_parsers()}")
+    test_fixtures_exist()
+    test_backends_match_reference_parser()
+    print("[완료] 모든 파서 백엔드 결과가 일치합니다.")
@@ -0,0 +1,84 @@
+"""
+스크래핑 파이프라인 지표 테스트
+
+로컬 대역 서버(naver_standin.py)의 페이지를 가져오는 동안 단계별/추출기별 시간,
+응답 상태와 크기, 필드별 N/A 횟수가 기록되고 /api/metrics가 Prometheus 텍스트 형식으로
+내보내는지 확인합니다.
+"""
+
+from fastapi.testclient import TestClient
+
+import main
+from http_session import create_session
+from naver_scraper_trading import TradingStrategyScraper
+from pipeline_metrics import Histogram, PipelineMetrics, metrics
+
+
+def test_histogram_and_render():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.lines('x', (('stage', 'fetch'),)) == [
+        'x_bucket{stage="fetch",le="0.1"} 2',
+        'x_bucket{stage="fetch",le="1"} 3',
+        'x_bucket{stage="fetch",le="+Inf"} 4',
+        'x_sum{stage="fetch"} 3.65',
+        'x_count{stage="fetch"} 4',
+    ]
+
+    registry = PipelineMetrics()
+    registry.inc('scrape_field_missing_total', scraper='trading', field='per')
+    registry.inc('scrape_field_missing_total', scraper='trading', field='per')
+    registry.add_collector(lambda: ['custom_metric 1'])
+    text = registry.render()
+    assert '# TYPE scrape_field_missing_total counter' in text
+    assert 'scrape_field_missing_total{field="per",scraper="trading"} 2' in text
+    assert text.endswith('custom_metric 1\n')
+
+
+def test_scrape_stages_are_recorded(standin):
+    standin()
+    metrics.reset()
+    scraper = TradingStrategyScraper(session=create_session(max_retries=0))
+    scraper.get_complete_trading_info('247540')
+    scraper.get_complete_trading_info('069500')
+    main.fetch_stock_analysis('005930')
+
+    snapshot = metrics.snapshot()
+    stages = snapshot['scrape_stage_seconds']
+    for stage in ('fetch', 'decode', 'parse', 'extract'):
+        assert stages[(('scraper', 'trading'), ('stage', stage))][0] == 2
+        assert stages[(('scraper', 'analyze'), ('stage', stage))][0] == 1
+    extractors = snapshot['scrape_extractor_seconds']
+    assert {key[0][1] for key in extractors} == {'walk', 'price_data', 'trading_data', 'valuation_metrics',
+                                                 'supply_demand', 'financial_data', 'sector'}
+
+    assert snapshot['naver_http_responses_total'][(('scraper', 'trading'), ('status', '200'))] == 2
+    count, size = snapshot['naver_http_response_bytes'][(('scraper', 'analyze'),)]
+    assert count == 1 and size > 100000
+
+    # ETF 페이지에는 재무 정보가 없음
+    missing = snapshot['scrape_field_missing_total']
+    assert missing[(('field', 'roe'), ('scraper', 'trading'))] == 1
+    assert snapshot['scrape_pages_total'][(('scraper', 'trading'),)] == 2
+
+
+def test_metrics_endpoint():
+    metrics.reset()
+    with metrics.stage('trading', 'fetch'):
+        pass
+    response = TestClient(main.app).get('/api/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'scrape_stage_seconds_count{scraper="trading",stage="fetch"} 1' in response.text
+    assert 'response_cache_hit_ratio{cache="response"}' in response.text
+    assert 'response_cache_hits_total{cache="gemini"}' in response.text
+
+
+if __name__ == "__main__":
+    test_histogram_and_render()
+    from conftest import standin_servers
+    with standin_servers() as standin:
+        test_scrape_stages_are_recorded(standin)
+    test_metrics_endpoint()
+    print("[완료] 스크래핑 파이프라인 지표 테스트 통과")
@@ -0,0 +1,70 @@
+"""
+요청 프로파일링 테스트
+
+토큰이 맞는 ?profile=1 요청만 cProfile 결과와 단계별 시간을 받고,
+가장 느린 N개 요청 목록이 느린 순으로 유지되는지 확인합니다.
+(네이버 대신 naver_standin.py 대역 서버 사용)
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from request_profiler import RequestProfiler, request_profiler
+
+
+def test_slowest_buffer_keeps_slowest():
+    profiler = RequestProfiler(token='secret', slowest=2)
+    for delay in (0.03, 0.0, 0.02):
+        with profiler.run(f"/sleep/{delay}"):
+            time.sleep(delay)
+    assert [run['path'] for run in profiler.slowest()] == ['/sleep/0.03', '/sleep/0.02']
+    assert all(run['stats'] is None for run in profiler.slowest())
+
+    assert profiler.authorized('secret')
+    assert not profiler.authorized('wrong') and not profiler.authorized(None)
+    assert not RequestProfiler(token='').authorized('')
+
+
+def test_profile_flag_requires_token(standin, app_state):
+    standin()
+    original = request_profiler.token
+    request_profiler.token = 'secret'
+    request_profiler.clear()
+    client = TestClient(app_state.app)
+    try:
+        assert client.get('/api/trading-analysis/005935?profile=1').status_code == 403
+        assert client.get('/api/profile/slowest').status_code == 403
+
+        response = client.get('/api/trading-analysis/005930?profile=1', headers={'X-Profile-Token': 'secret'})
+        assert response.status_code == 200
+        body = response.json()
+        assert body['result']['current_price'] != 'N/A'
+        timings = body['profile']['timings_ms']
+        for stage in ('trading.fetch', 'trading.decode', 'trading.parse', 'trading.extract',
+                      'extractor.price_data', 'extractor.sector'):
+            assert timings[stage] >= 0
+        assert timings['total'] >= timings['trading.fetch']
+        functions = [row['function'] for row in body['profile']['stats']]
+        assert any('get_complete_trading_info' in function for function in functions)
+
+        # 프로파일 없이 들어온 요청도 느린 요청 목록에는 단계별 시간이 남음
+        plain = client.get('/api/analyze/247540')
+        assert 'profile' not in plain.json()
+
+        slowest = client.get('/api/profile/slowest', headers={'X-Profile-Token': 'secret'}).json()['slowest']
+        paths = {run['path'] for run in slowest}
+        assert paths == {'/api/trading-analysis/005930', '/api/analyze/247540'}
+        analyze = next(run for run in slowest if run['path'] == '/api/analyze/247540')
+        assert 'analyze.parse' in analyze['timings_ms'] and analyze['stats'] is None
+    finally:
+        request_profiler.token = original
+        request_profiler.clear()
+
+
+if __name__ == "__main__":
+    test_slowest_buffer_keeps_slowest()
+    from conftest import fresh_app_state, standin_servers
+    with standin_servers() as standin, fresh_app_state() as app_state:
+        test_profile_flag_requires_token(standin, app_state)
+    print("[완료] 요청 프로파일링 테스트 통과")
@@ -0,0 +1,132 @@
+"""
+응답 캐시 테스트
+
+필드 그룹마다 자기 TTL로 만료되는지(다시 가져오면 모든 필드가 새 값과 새 저장 시각), 최대 항목 수를 넘으면
+가장 오래 쓰지 않은 항목부터 빠지는지, 디스크 계층에서 재시작 후 다시 읽히는지 확인합니다.
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+import response_cache
+from response_cache import ResponseCache
+
+
+TTLS = {'current_price': 60, 'per': 3600, 'sector': 86400}
+
+
+class Clock:
+    """response_cache.time.time을 대신하는 시계"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.original = response_cache.time.time
+
+    def __enter__(self):
+        response_cache.time.time = lambda: self.now
+        return self
+
+    def __exit__(self, *exc):
+        response_cache.time.time = self.original
+
+
+def scraped(version):
+    return {'current_price': f"price {version}", 'per': f"per {version}", 'sector': f"sector {version}"}
+
+
+def test_field_groups_expire_on_their_own_ttl():
+    cache = ResponseCache(max_entries=8, field_ttls=TTLS, default_ttl=60, disk_path=None)
+    fetches = []
+
+    def fetch():
+        fetches.append(len(fetches) + 1)
+        return scraped(len(fetches))
+
+    with Clock() as clock:
+        assert cache.get_or_fetch('trading:005930', fetch) == scraped(1)
+        clock.now += 30
+        assert cache.get_or_fetch('trading:005930', fetch) == scraped(1)
+        assert fetches == [1]
+
+        # 가격만 만료: 투자지표/업종만 필요하면 다시 가져오지 않음
+        clock.now += 31
+        assert cache.lookup('trading:005930') == ({'per': 'per 1', 'sector': 'sector 1'}, ['current_price'])
+        assert cache.get('trading:005930', fields=['per', 'sector']) == scraped(1)
+
+        # 다시 가져오면 아직 신선하던 필드도 새 값과 새 저장 시각
+        assert cache.get_or_fetch('trading:005930', fetch) == scraped(2)
+        clock.now += 61
+        assert cache.lookup('trading:005930') == ({'per': 'per 2', 'sector': 'sector 2'}, ['current_price'])
+
+        # 새 결과에 없는 필드는 TTL 안이면 기존 값 유지
+        assert cache.merge('trading:005930', {'current_price': 'price 3'}) == {**scraped(2), 'current_price': 'price 3'}
+        clock.now += 3600
+        assert cache.get_or_fetch('trading:005930', fetch) == scraped(3)
+        assert fetches == [1, 2, 3]
+
+        # 오류 응답은 저장하지 않고 신선한 값도 건드리지 않음
+        assert cache.merge('trading:005930', {'error': 'Failed to fetch page'}) == {'error': 'Failed to fetch page'}
+        assert cache.get('trading:005930') == scraped(3)
+
+        # max_age는 필드 TTL 대신 적용
+        clock.now += 120
+        assert cache.get('trading:005930') is None
+        assert cache.get('trading:005930', max_age=3600) == scraped(3)
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2, field_ttls=TTLS, default_ttl=60, disk_path=None)
+    cache.set('a', scraped(1))
+    cache.set('b', scraped(2))
+    assert cache.get('a') is not None     # a를 최근에 사용
+    cache.set('c', scraped(3))            # 가장 오래 쓰지 않은 b가 빠짐
+    assert cache.get('b') is None
+    assert cache.get('a') == scraped(1) and cache.get('c') == scraped(3)
+    assert cache.stats()['entries'] == 2
+
+
+def test_disk_tier_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+        with Clock() as clock:
+            first = ResponseCache(max_entries=8, field_ttls=TTLS, default_ttl=60, disk_path=path)
+            first.set('trading:005930', scraped(1))
+            clock.now += 61
+            first.merge('trading:005930', {'current_price': 'price 2'})   # 가격만 새 저장 시각
+
+            # 재시작: 메모리는 비었지만 디스크에서 필드별 저장 시각까지 다시 읽음
+            restarted = ResponseCache(max_entries=8, field_ttls=TTLS, default_ttl=60, disk_path=path)
+            assert restarted.stats()['entries'] == 0
+            assert asyncio.run(restarted.aget('trading:005930')) == {**scraped(1), 'current_price': 'price 2'}
+            assert restarted.stats()['disk_hits'] == 1
+            clock.now += 3600
+            assert restarted.lookup('trading:005930')[1] == ['current_price', 'per']
+
+            # 가장 긴 TTL보다 오래된 행은 열 때 정리
+            clock.now += 86400
+            ResponseCache(max_entries=8, field_ttls=TTLS, default_ttl=60, disk_path=path)
+            assert sqlite3.connect(path).execute('SELECT COUNT(*) FROM response_cache').fetchone()[0] == 0
+
+
+def test_disk_rows_without_field_stamps():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+        db = sqlite3.connect(path)
+        db.execute('CREATE TABLE response_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)')
+        with Clock() as clock:
+            db.execute('INSERT INTO response_cache VALUES (?, ?, ?)', ('k', '{"per": "12.5"}', clock.now - 100))
+            db.commit()
+            cache = ResponseCache(max_entries=8, field_ttls=TTLS, default_ttl=60, disk_path=path)
+            assert cache.get('k') == {'per': '12.5'}
+            clock.now += 3500
+            assert cache.get('k') is None
+
+
+if __name__ == "__main__":
+    test_field_groups_expire_on_their_own_ttl()
+    test_lru_eviction()
+    test_disk_tier_reload()
+    test_disk_rows_without_field_stamps()
+    print("[완료] 응답 캐시 테스트 통과")
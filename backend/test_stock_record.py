@@ -0,0 +1,54 @@
+"""
+StockRecord 변환 테스트
+
+저장된 네이버 종목 페이지(fixtures/naver/*.html)에서 추출한 문자열 딕셔너리를
+StockRecord로 바꿨다가 다시 표시용 문자열/JSON으로 바꿔도 값이 유지되는지 확인합니다.
+"""
+
+import json
+
+from naver_scraper_trading import TradingStrategyScraper
+from naver_standin import fixture_pages
+from parser_backend import parse_html
+from stock_record import NA, NUMBER_FIELDS, StockRecord, format_field, parse_number
+
+
+def scraped_fixtures():
+    scraper = TradingStrategyScraper()
+    for name, html in fixture_pages():
+        yield name, scraper.extractor.extract(parse_html(html, scraper.parser))
+
+
+def test_parse_and_format():
+    assert parse_number('1,234') == 1234.0
+    assert parse_number(NA) is None
+    assert parse_number(None) is None
+    assert format_field('current_price', 167500.0) == '167,500'
+    assert format_field('foreign_net_buy', -7702173.0) == '-7,702,173'
+    assert format_field('per', 8.0) == '8.00'
+    assert format_field('roe', None) == NA
+
+
+def test_record_keeps_scraped_values():
+    for name, data in scraped_fixtures():
+        record = StockRecord.from_scraped(data, '000000', market='KOSPI')
+        for field, value in data.items():
+            if field in NUMBER_FIELDS:
+                assert getattr(record, field) == parse_number(value), f"{name}: {field}"
+            else:
+                assert record.to_dict()[field] == value, f"{name}: {field}"
+
+
+def test_json_round_trip():
+    for name, data in scraped_fixtures():
+        record = StockRecord.from_scraped(data, '000000', '종목', 'KOSDAQ', '2026-10-16 09:00:00')
+        restored = StockRecord.from_json(json.loads(json.dumps(record.to_json(), ensure_ascii=False)))
+        assert restored.to_json() == record.to_json(), name
+        assert restored.to_dict() == record.to_dict(), name
+
+
+if __name__ == "__main__":
+    test_parse_and_format()
+    test_record_keeps_scraped_values()
+    test_json_round_trip()
+    print("[완료] StockRecord 변환 테스트 통과")
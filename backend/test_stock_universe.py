@@ -0,0 +1,152 @@
+"""
+전체 종목 목록 테스트
+
+/api/stocks의 시장/검색어 필터와 페이지 응답, ETag/If-None-Match 304 응답,
+목록 페이지가 실패했을 때 기존 스냅샷을 유지하는지, 첫 스냅샷을 동시에 요청해도 (동기/비동기 경로가 섞여도)
+한 번만 크롤링하는지 확인합니다.
+(네이버 대신 naver_standin.py 대역 서버 사용)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from http_session import create_session
+from stock_universe import StockUniverse, UniverseSnapshot
+
+
+def new_universe() -> StockUniverse:
+    return StockUniverse(requests_per_second=None, session=create_session(max_retries=0))
+
+
+def test_filter_and_paging(standin, app_state):
+    standin(list_size=230)
+    client = TestClient(app_state.app)
+
+    everything = client.get('/api/stocks').json()
+    assert len(everything) == 230
+    kosdaq = client.get('/api/stocks', params={'market': 'kosdaq'}).json()
+    assert kosdaq and all(stock['market'] == 'KOSDAQ' for stock in kosdaq)
+
+    # 종목명 일부 또는 종목코드 일부로 검색
+    assert sorted(s['ticker'] for s in client.get('/api/stocks', params={'q': '합성종목12'}).json()) == \
+        ['900012'] + [f"900{i}" for i in range(120, 130)]
+    assert sorted(s['ticker'] for s in client.get('/api/stocks', params={'q': '90010'}).json()) == \
+        [f"90010{i}" for i in range(10)]
+
+    pages = [client.get('/api/stocks', params={'market': 'KOSDAQ', 'page': page, 'page_size': 50}).json()
+             for page in (1, 2, 3)]
+    assert [page['total'] for page in pages] == [len(kosdaq)] * 3
+    assert [len(page['items']) for page in pages] == [50, 50, len(kosdaq) - 100]
+    assert sum((page['items'] for page in pages), []) == kosdaq
+
+    # page_size는 1~1000 사이로, page는 1 이상으로 맞춤
+    clamped = client.get('/api/stocks', params={'page': 0, 'page_size': 0}).json()
+    assert (clamped['page'], clamped['page_size'], clamped['items']) == (1, 1, everything[:1])
+
+
+def test_etag_round_trip(standin, app_state):
+    standin(list_size=230)
+    client = TestClient(app_state.app)
+
+    first = client.get('/api/stocks', params={'market': 'KOSPI'})
+    etag = first.headers['etag']
+    assert first.status_code == 200 and first.headers['cache-control'] == 'no-cache'
+
+    not_modified = client.get('/api/stocks', params={'market': 'KOSPI'}, headers={'If-None-Match': f'"x", W/{etag}'})
+    assert not_modified.status_code == 304 and not_modified.content == b''
+    assert not_modified.headers['etag'] == etag
+
+    # 검색 조건이 다르면 다른 ETag
+    other = client.get('/api/stocks', params={'market': 'KOSDAQ'}, headers={'If-None-Match': etag})
+    assert other.status_code == 200 and other.headers['etag'] != etag
+
+    # 스냅샷이 바뀌면 같은 조건도 다시 보냄
+    universe = app_state.stock_universe
+    universe._snapshot = UniverseSnapshot(universe._snapshot.stocks[:-1], time.time())
+    changed = client.get('/api/stocks', params={'market': 'KOSPI'}, headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['etag'] != etag
+
+
+def test_failed_page_keeps_previous_snapshot(standin):
+    standin(list_size=230)
+    universe = new_universe()
+    snapshot = universe.refresh()
+
+    fetch_list_page = universe.fetch_list_page
+
+    def flaky(market, page):
+        if (market, page) == ('KOSDAQ', 2):
+            raise ConnectionError("page 2 timed out")
+        return fetch_list_page(market, page)
+
+    universe.fetch_list_page = flaky
+    with pytest.raises(RuntimeError, match='KOSDAQ page 2'):
+        universe.refresh()
+    assert universe._snapshot is snapshot and len(snapshot.stocks) == 230
+
+    # 백그라운드 갱신이 실패해도 기존 스냅샷을 계속 제공
+    universe.refresh_interval = 0
+    assert universe.get_snapshot() is snapshot
+    with universe._build_lock:
+        pass
+    assert universe._snapshot is snapshot
+
+
+def test_cold_start_crawls_once(standin):
+    server = standin(list_size=230, latency=0.05)
+    universe = new_universe()
+    snapshots = []
+
+    threads = [threading.Thread(target=lambda: snapshots.append(universe.get_snapshot())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(snapshots) == 4 and all(snapshot is snapshots[0] for snapshot in snapshots)
+    # 시장별 목록 3페이지 (페이지당 50종목)를 한 번만
+    assert server.stats()['requests'] == 6
+
+    # 오래된 스냅샷은 바로 반환하고 갱신은 한 번만 진행
+    universe.refresh_interval = 0
+    assert {id(universe.get_snapshot()) for _ in range(5)} == {id(snapshots[0])}
+    with universe._build_lock:
+        pass
+    assert server.stats()['requests'] == 12
+    assert universe._snapshot is not snapshots[0]
+    assert universe._snapshot.stocks == snapshots[0].stocks
+
+
+def test_mixed_sync_and_async_cold_start_crawls_once(standin):
+    server = standin(list_size=230, latency=0.05)
+    universe = new_universe()
+    snapshots = []
+
+    async def async_requests():
+        snapshots.extend(await asyncio.gather(*(universe.aget_snapshot() for _ in range(3))))
+
+    threads = [threading.Thread(target=lambda: snapshots.append(universe.get_snapshot())) for _ in range(3)]
+    threads.append(threading.Thread(target=lambda: asyncio.run(async_requests())))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(snapshots) == 6 and all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert server.stats()['requests'] == 6
+
+
+if __name__ == "__main__":
+    from conftest import fresh_app_state, standin_servers
+    with standin_servers() as standin:
+        for test in (test_filter_and_paging, test_etag_round_trip):
+            with fresh_app_state() as app_state:
+                test(standin, app_state)
+        test_failed_page_keeps_previous_snapshot(standin)
+        test_cold_start_crawls_once(standin)
+        test_mixed_sync_and_async_cold_start_crawls_once(standin)
+    print("[완료] 전체 종목 목록 테스트 통과")
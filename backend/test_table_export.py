@@ -0,0 +1,99 @@
+"""
+스트리밍 내보내기 테스트
+
+table_export의 xlsx/CSV/Parquet 조각을 이어 붙인 결과가 같은 행을 담은 올바른 파일인지,
+CSV/Parquet가 행 묶음마다 조각을 내보내는지, save_to_excel이 쓰기 전용 워크북으로
+같은 컬럼을 저장하는지 확인합니다.
+"""
+
+import csv
+import io
+import os
+import tempfile
+
+import openpyxl
+
+from stock_analysis_system import StockAnalysisSystem
+from table_export import iter_csv, iter_parquet, iter_table, iter_xlsx, parquet_available, write_table
+
+
+HEADERS = ['ticker', 'name', 'price']
+ROWS = [[f"{i:06d}", f"종목{i}", i * 10.5 if i % 3 else None] for i in range(1200)]
+
+
+def test_xlsx_round_trip():
+    data = b''.join(iter_xlsx(HEADERS, iter(ROWS), sheet_title='Stocks'))
+    ws = openpyxl.load_workbook(io.BytesIO(data))['Stocks']
+    values = [list(row) for row in ws.values]
+    assert values[0] == HEADERS
+    assert values[1:] == ROWS
+
+
+def test_csv_streams_in_chunks():
+    chunks = list(iter_csv(HEADERS, iter(ROWS), chunk_rows=500))
+    # 헤더 조각 + 500/500/200 행 조각
+    assert len(chunks) == 4
+    assert chunks[0].startswith(b'\xef\xbb\xbf')
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig'))))
+    assert rows[0] == HEADERS
+    assert rows[2] == ['000001', '종목1', '10.5']
+    assert rows[1][2] == ''
+    assert len(rows) == len(ROWS) + 1
+
+
+def test_parquet_row_groups():
+    if not parquet_available():
+        print("[SKIP] pyarrow가 없어 Parquet 테스트를 건너뜁니다.")
+        return
+    import pyarrow.parquet as pq
+
+    data = b''.join(iter_parquet(HEADERS, iter(ROWS), numeric_columns=['price'], chunk_rows=500))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == HEADERS
+    assert [list(row.values()) for row in table.to_pylist()] == ROWS
+
+
+def test_unknown_format():
+    path = os.path.join(tempfile.mkdtemp(), 'stocks.pdf')
+    try:
+        write_table(path, HEADERS, ROWS)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    assert not os.path.exists(path)
+    try:
+        iter_table('json', HEADERS, ROWS)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_save_to_excel():
+    analyzed = [
+        {'grade': 'A', 'score': 75, 'ticker': '005930', 'name': '삼성전자', 'per': 12.5,
+         'signals': ['저PER', '고ROE'], 'debug': 'ignored'},
+        {'grade': 'D', 'score': 40, 'ticker': '000660', 'name': 'SK하이닉스', 'per': None, 'signals': []},
+    ]
+    path = os.path.join(tempfile.mkdtemp(), 'analysis.xlsx')
+    StockAnalysisSystem().save_to_excel(analyzed, path)
+
+    ws = openpyxl.load_workbook(path)['AI Stock Analysis']
+    values = [list(row) for row in ws.values]
+    assert values == [
+        ['grade', 'score', 'ticker', 'name', 'per', 'signals'],
+        ['A', 75, '005930', '삼성전자', 12.5, '저PER, 고ROE'],
+        ['D', 40, '000660', 'SK하이닉스', None, None],
+    ]
+
+
+if __name__ == "__main__":
+    test_xlsx_round_trip()
+    test_csv_streams_in_chunks()
+    test_parquet_row_groups()
+    test_unknown_format()
+    test_save_to_excel()
+    print("[완료] 스트리밍 내보내기 테스트 통과")
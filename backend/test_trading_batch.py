@@ -0,0 +1,110 @@
+"""
+일괄 매매 전략 분석 스트리밍 테스트
+
+POST /api/trading-analysis/batch가 캐시에 있는 종목을 먼저 보내고, 나머지를 완료 순서대로
+NDJSON/SSE 형식으로 스트리밍하는지, BATCH_MAX_TICKERS를 넘는 요청을 거절하는지,
+동시에 들어온 일괄 요청들이 하나의 토큰 버킷을 나눠 쓰는지 확인합니다.
+(네이버 대신 naver_standin.py 대역 서버 사용)
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from async_scrape_engine import TokenBucket
+
+
+CACHED = {'current_price': '70,000', 'per': '12.50', 'sector': '반도체'}
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_ndjson_streams_cached_first(standin, app_state):
+    server = standin(latency=0.05)
+    app_state.response_cache.set('trading:005930', CACHED)
+    client = TestClient(app_state.app)
+
+    response = client.post('/api/trading-analysis/batch', json={'tickers': ['247540', ' 005930', '069500', '247540', '']})
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    lines = ndjson(response)
+    assert lines[0] == {'ticker': '005930', 'data': CACHED}
+    assert sorted(line['ticker'] for line in lines[1:]) == ['069500', '247540']
+    assert all(line['data']['current_price'] != 'N/A' for line in lines[1:])
+    # 중복/빈 종목 코드는 한 번만, 캐시에 있던 종목은 네이버에 요청하지 않음
+    assert server.stats()['requests'] == 2
+
+    # 가져온 결과는 캐시에 올라가 다음 요청에서는 모두 즉시
+    again = ndjson(client.post('/api/trading-analysis/batch', json={'tickers': ['247540', '069500']}))
+    assert [line['ticker'] for line in again] == ['247540', '069500']
+    assert server.stats()['requests'] == 2
+
+
+def test_sse_framing(standin, app_state):
+    standin()
+    client = TestClient(app_state.app)
+    response = client.post('/api/trading-analysis/batch?format=sse', json={'tickers': ['005935', '247540']})
+    assert response.headers['content-type'].startswith('text/event-stream')
+
+    blocks = response.text.split('\n\n')
+    assert blocks[-1] == '' and blocks[-2] == 'event: done\ndata: {}'
+    events = [json.loads(block[len('data: '):]) for block in blocks[:-2]]
+    assert all(block.startswith('data: ') and '\n' not in block for block in blocks[:-2])
+    assert sorted(event['ticker'] for event in events) == ['005935', '247540']
+
+
+def test_rejects_too_many_tickers(app_state):
+    original = app_state.BATCH_MAX_TICKERS
+    app_state.BATCH_MAX_TICKERS = 3
+    try:
+        client = TestClient(app_state.app)
+        response = client.post('/api/trading-analysis/batch', json={'tickers': [f"{i:06d}" for i in range(4)]})
+        assert response.json() == {'error': 'Too many tickers (max 3)'}
+
+        # 중복을 뺀 뒤 한도 안이면 처리
+        for ticker in ('000001', '000002'):
+            app_state.response_cache.set(f'trading:{ticker}', CACHED)
+        accepted = client.post('/api/trading-analysis/batch', json={'tickers': ['000001', '000002', '000001', '000002']})
+        assert [line['ticker'] for line in ndjson(accepted)] == ['000001', '000002']
+    finally:
+        app_state.BATCH_MAX_TICKERS = original
+
+
+def test_concurrent_batches_share_the_rate_limit(standin, app_state):
+    standin()
+    original = app_state.batch_bucket
+    app_state.batch_bucket = TokenBucket(20)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app_state.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post('/api/trading-analysis/batch', json={'tickers': [f"{900000 + i:06d}" for i in range(offset, offset + 5)]})
+                for offset in (0, 5)
+            ))
+            return responses, time.perf_counter() - start
+
+    try:
+        responses, elapsed = asyncio.run(run())
+    finally:
+        app_state.batch_bucket = original
+
+    assert [len(ndjson(response)) for response in responses] == [5, 5]
+    # 요청마다 버킷을 따로 썼다면 4 x 0.05초, 함께 쓰면 첫 토큰 이후 9 x 0.05초
+    assert elapsed >= 0.4
+
+
+if __name__ == "__main__":
+    from conftest import fresh_app_state, standin_servers
+    with standin_servers() as standin:
+        for test in (test_ndjson_streams_cached_first, test_sse_framing, test_concurrent_batches_share_the_rate_limit):
+            with fresh_app_state() as app_state:
+                test(standin, app_state)
+    with fresh_app_state() as app_state:
+        test_rejects_too_many_tickers(app_state)
+    print("[완료] 일괄 매매 전략 분석 테스트 통과")
@@ -0,0 +1,65 @@
+"""
+벡터화 점수 계산 결과 일치 테스트
+
+vector_scoring.score_batch가 StockAnalysisSystem.analyze_stock_ai와
+점수/등급/시그널/오류 메시지까지 똑같은 결과를 내는지 확인합니다.
+"""
+
+from stock_analysis_system import StockAnalysisSystem
+from stock_record import NUMBER_FIELDS, StockRecord
+from vector_scoring import score_batch, score_records, score_stock_records
+from benchmark_scoring import make_records
+
+
+EDGE_CASES = [
+    {},
+    {'per': 'N/A'},
+    {'per': '8.5', 'pbr': 'N/A'},
+    {'per': '12', 'pbr': '0.8', 'roe': '-', 'debt_ratio': '30'},
+    {'per': '12', 'pbr': '0.8', 'roe': '20', 'debt_ratio': '30',
+     'current_price': '10,000', 'high_52w': '10,000', 'low_52w': '10,000', 'opinion_score': 'N/A'},
+    {'current_price': '10,000', 'high_52w': '12,000', 'low_52w': '9,000', 'opinion_score': '1.50'},
+    {'current_price': '0', 'high_52w': '5,000', 'low_52w': '5,000'},
+    {'current_price': '11,900', 'high_52w': '12,000', 'low_52w': '9,000', 'dividend_yield': '3.5'},
+    {'per': 'nan', 'pbr': 'inf', 'roe': '-inf', 'debt_ratio': '1_000'},
+    {'per': None, 'pbr': '1'},
+    {'per': 15, 'pbr': '1'},
+    {'opinion_score': '2.5', 'dividend_yield': ''},
+    {'per': '-3.2', 'pbr': '1.99', 'roe': '10', 'debt_ratio': '100', 'opinion_score': '2'},
+]
+
+
+def test_matches_analyze_stock_ai_on_edge_cases():
+    system = StockAnalysisSystem()
+    expected = [system.analyze_stock_ai(data) for data in EDGE_CASES]
+    assert score_records(EDGE_CASES) == expected
+
+
+def test_matches_analyze_stock_ai_on_synthetic_universe():
+    system = StockAnalysisSystem()
+    records = make_records(3000, seed=7)
+    expected = [system.analyze_stock_ai(data) for data in records]
+    batch = score_batch(records)
+    assert batch.results() == expected
+    assert [batch.result(i) for i in range(0, len(records), 97)] == expected[::97]
+
+
+def test_stock_records_match_analyze_stock_ai():
+    # 스크래퍼처럼 모든 숫자 필드가 있고 값이 없으면 "N/A"인 데이터
+    system = StockAnalysisSystem()
+    records = [{field: 'N/A' for field in NUMBER_FIELDS} | data for data in make_records(3000, seed=11)]
+    expected = [system.analyze_stock_ai(data) for data in records]
+    stock_records = [StockRecord.from_scraped(data, data['ticker']) for data in records]
+    assert score_stock_records(stock_records).results() == expected
+
+
+def test_empty_input():
+    assert score_records([]) == []
+
+
+if __name__ == "__main__":
+    test_matches_analyze_stock_ai_on_edge_cases()
+    test_matches_analyze_stock_ai_on_synthetic_universe()
+    test_stock_records_match_analyze_stock_ai()
+    test_empty_input()
+    print("[완료] 벡터화 점수 계산 결과가 analyze_stock_ai와 일치합니다.")
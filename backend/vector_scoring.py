@@ -0,0 +1,325 @@
+"""
+벡터화된 AI 투자 점수 계산 엔진
+
+StockAnalysisSystem.analyze_stock_ai와 같은 점수/등급/시그널을 전체 종목에 대해
+NumPy 배열 연산으로 한 번에 계산합니다.
+
+- 문자열 -> 숫자 변환은 서로 다른 값마다 한 번만 수행 (pandas.factorize)
+- PER/PBR/ROE/부채비율/52주 위치/투자의견/배당 점수를 불리언 마스크로 계산
+- 기존 함수와 결과가 완전히 같도록 예외 처리 순서도 그대로 재현
+  (앞 단계에서 숫자 변환에 실패하면 이후 단계 점수는 더하지 않고 "분석 오류" 시그널 추가)
+"""
+
+from itertools import compress
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_record import NA, StockRecord
+
+
+# (필드, 값이 없을 때 기본값) - analyze_stock_ai가 숫자로 변환하는 순서
+NUMERIC_FIELDS = (
+    ('per', '999'),
+    ('pbr', '999'),
+    ('roe', '0'),
+    ('debt_ratio', '100'),
+    ('current_price', '0'),
+    ('high_52w', '0'),
+    ('low_52w', '0'),
+    ('opinion_score', '3'),
+    ('dividend_yield', '0'),
+)
+
+# StockRecord의 결측값(None)은 스크래퍼의 "N/A" 변환 실패와 같은 메시지로 기록
+MISSING_ERROR = f"could not convert string to float: {NA!r}"
+
+# 예외가 날 수 있는 단계 (NUMERIC_FIELDS 순서 + 52주 위치 계산의 0 나누기)
+STAGE_PER, STAGE_PBR, STAGE_ROE, STAGE_DEBT = 0, 1, 2, 3
+STAGE_CURRENT, STAGE_HIGH, STAGE_LOW, STAGE_POSITION = 4, 5, 6, 7
+STAGE_OPINION, STAGE_DIVIDEND = 8, 9
+STAGE_NONE = 10
+
+# 점수 구간 -> (등급, 추천, 전략)
+GRADES = (
+    (80, 'S', '강력 매수', '적극적 매수 포지션 구축'),
+    (70, 'A', '매수', '분할 매수 추천'),
+    (60, 'B', '보유', '관망 또는 소량 매수'),
+    (50, 'C', '중립', '추가 분석 필요'),
+)
+LOWEST_GRADE = ('D', '매도 검토', '리스크 관리 필요')
+
+# 시그널 문구 (analyze_stock_ai와 같은 순서)
+SIGNALS = (
+    "✓ 매우 낮은 PER - 저평가",
+    "✓ 낮은 PER - 적정 가치",
+    "⚠ 높은 PER - 고평가 가능",
+    "✓ PBR < 1 - 청산가치 이하",
+    "✓ 낮은 PBR - 저평가",
+    "✓ 높은 ROE - 우수한 수익성",
+    "✓ 양호한 ROE",
+    "⚠ 낮은 ROE - 수익성 부족",
+    "✓ 낮은 부채비율 - 재무 안정",
+    "⚠ 높은 부채비율 - 재무 리스크",
+    "⚠ 52주 고점 근처 - 조정 가능",
+    "✓ 52주 저점 근처 - 반등 기대",
+    "✓ 증권사 강력 매수 의견",
+    "✓ 증권사 매수 의견",
+    "✓ 높은 배당수익률",
+)
+SIGNAL_POINTS = np.array([15, 10, -10, 15, 10, 15, 10, -10, 10, -10, -5, 10, 10, 5, 5])
+
+
+def parse_number(value) -> Tuple[float, str]:
+    """
+    analyze_stock_ai와 같은 방식으로 값을 숫자로 바꿉니다.
+
+    Returns:
+        (숫자, 오류 메시지) - 변환에 실패하면 (nan, 예외 메시지)
+    """
+    try:
+        return float(value.replace(',', '')), None
+    except Exception as e:
+        return np.nan, str(e)
+
+
+def parse_column(values: Sequence) -> Tuple[np.ndarray, np.ndarray, Dict[int, str]]:
+    """
+    한 필드의 값들을 숫자 배열로 바꿉니다. (서로 다른 값마다 한 번만 변환)
+
+    Returns:
+        (숫자 배열, 변환 실패 마스크, 실패한 행 -> 오류 메시지)
+    """
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    try:
+        codes, uniques = pd.factorize(column)
+    except TypeError:  # 해시할 수 없는 값이 섞인 경우 행마다 변환
+        codes = np.full(len(values), -1)
+        uniques = []
+
+    unique_numbers = []
+    unique_errors = {}
+    for code, value in enumerate(uniques):
+        try:
+            unique_numbers.append(float(value.replace(',', '')))
+        except Exception as e:
+            unique_numbers.append(np.nan)
+            unique_errors[code] = str(e)
+
+    # codes == -1 (결측)은 마지막 자리의 nan/False를 가리킴
+    numbers = np.array(unique_numbers + [np.nan], dtype=np.float64)[codes]
+    unique_failed = np.zeros(len(uniques) + 1, dtype=bool)
+    unique_failed[list(unique_errors)] = True
+    failed = unique_failed[codes]
+    errors = {row: unique_errors[code] for row, code in zip(np.flatnonzero(failed).tolist(), codes[failed].tolist())}
+
+    # None/NaN 등 factorize가 결측으로 보는 값은 원래 값 그대로 변환
+    for row in np.flatnonzero(codes == -1).tolist():
+        number, error = parse_number(values[row])
+        numbers[row] = number
+        if error is not None:
+            failed[row] = True
+            errors[row] = error
+
+    return numbers, failed, errors
+
+
+class ScoreBatch:
+    """전체 종목의 점수 계산 결과 (열 단위 배열)"""
+
+    def __init__(self, scores: np.ndarray, grade_index: np.ndarray,
+                 signal_mask: np.ndarray, errors: Dict[int, str]):
+        self.scores = scores
+        self.grade_index = grade_index
+        self.signal_mask = signal_mask
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def signals(self, row: int) -> List[str]:
+        """한 종목의 시그널 리스트"""
+        return self._with_error(row, list(compress(SIGNALS, self.signal_mask[row].tolist())))
+
+    def result(self, row: int) -> Dict:
+        """analyze_stock_ai와 같은 형식의 결과 딕셔너리"""
+        return self._result(int(self.scores[row]), int(self.grade_index[row]), self.signals(row))
+
+    def results(self) -> List[Dict]:
+        """모든 종목의 결과 딕셔너리 (같은 시그널 조합의 문구 리스트는 한 번만 만듦)"""
+        pattern_codes = self.signal_mask.astype(np.int64) @ (1 << np.arange(len(SIGNALS), dtype=np.int64))
+        patterns: Dict[int, List[str]] = {}
+        results = []
+        for row, (score, index, code) in enumerate(zip(
+            self.scores.tolist(), self.grade_index.tolist(), pattern_codes.tolist()
+        )):
+            signals = patterns.get(code)
+            if signals is None:
+                signals = patterns[code] = [SIGNALS[i] for i in range(len(SIGNALS)) if code >> i & 1]
+            results.append(self._result(score, index, self._with_error(row, list(signals))))
+        return results
+
+    def _with_error(self, row: int, signals: List[str]) -> List[str]:
+        if row in self.errors:
+            signals.append(f"분석 오류: {self.errors[row]}")
+        return signals
+
+    def _result(self, score: int, index: int, signals: List[str]) -> Dict:
+        grade, recommendation, strategy = GRADES[index][1:] if index < len(GRADES) else LOWEST_GRADE
+        return {
+            'score': score,
+            'grade': grade,
+            'signals': signals,
+            'recommendation': recommendation,
+            'strategy': strategy
+        }
+
+
+class ScoreColumns:
+    """점수 계산에 쓰는 숫자 열과 종목별 첫 번째 변환 실패 단계"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], failed_stage: np.ndarray, errors: Dict[int, str]):
+        """
+        Args:
+            columns: NUMERIC_FIELDS 필드 이름 -> float64 배열 (변환 실패는 nan)
+            failed_stage: 종목별로 처음 예외가 나는 단계 (없으면 STAGE_NONE)
+            errors: 예외가 난 종목 -> 오류 메시지
+        """
+        self.columns = columns
+        self.failed_stage = failed_stage
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.failed_stage)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict]) -> 'ScoreColumns':
+        """스크래핑된 문자열 딕셔너리들을 숫자 열로 바꿉니다."""
+        return cls._from_parsed(len(records), [
+            parse_column([data.get(field, default) for data in records])
+            for field, default in NUMERIC_FIELDS
+        ])
+
+    @classmethod
+    def from_stock_records(cls, records: Sequence[StockRecord]) -> 'ScoreColumns':
+        """
+        이미 숫자로 변환된 StockRecord들에서 열을 만듭니다. (문자열 변환 없음)
+
+        결측값(None)은 스크래퍼의 "N/A"와 같게 취급합니다.
+        """
+        parsed = []
+        for field, _ in NUMERIC_FIELDS:
+            values = [getattr(record, field) for record in records]
+            missing = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+            numbers = np.array(values, dtype=np.float64)
+            parsed.append((numbers, missing, dict.fromkeys(np.flatnonzero(missing).tolist(), MISSING_ERROR)))
+        return cls._from_parsed(len(records), parsed)
+
+    @classmethod
+    def _from_parsed(cls, n: int, parsed: List[Tuple[np.ndarray, np.ndarray, Dict[int, str]]]) -> 'ScoreColumns':
+        columns = {}
+        failed_stage = np.full(n, STAGE_NONE)
+        errors: Dict[int, str] = {}
+
+        # 각 행에서 처음 실패한 단계와 그 오류 메시지를 기록
+        for stage, ((field, _), (numbers, failed, column_errors)) in enumerate(zip(NUMERIC_FIELDS, parsed)):
+            columns[field] = numbers
+            stage = stage if stage < STAGE_POSITION else stage + 1
+            first = failed & (failed_stage == STAGE_NONE)
+            failed_stage[first] = stage
+            for row in np.flatnonzero(first).tolist():
+                errors[row] = column_errors[row]
+
+        # 52주 위치 계산: 고점 == 저점이면 기존 함수처럼 0 나누기 오류
+        # (투자의견/배당 변환 실패보다 먼저 일어나므로 그 오류를 대신함)
+        current, high_52w, low_52w = columns['current_price'], columns['high_52w'], columns['low_52w']
+        has_range = (current > 0) & (high_52w > 0)
+        with np.errstate(invalid='ignore'):
+            zero_range = has_range & (high_52w - low_52w == 0) & (failed_stage > STAGE_POSITION)
+        failed_stage[zero_range] = STAGE_POSITION
+        for row in np.flatnonzero(zero_range).tolist():
+            errors[row] = 'float division by zero'
+
+        return cls(columns, failed_stage, errors)
+
+
+def score_columns(data: ScoreColumns) -> ScoreBatch:
+    """
+    숫자 열에 대해 점수/등급/시그널을 배열 연산으로 계산합니다.
+    """
+    columns = data.columns
+    per, pbr = columns['per'], columns['pbr']
+    roe, debt_ratio = columns['roe'], columns['debt_ratio']
+    current, high_52w, low_52w = columns['current_price'], columns['high_52w'], columns['low_52w']
+    opinion_score, dividend = columns['opinion_score'], columns['dividend_yield']
+    failed_stage = data.failed_stage
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        position = (current - low_52w) / (high_52w - low_52w) * 100
+
+    valuation_ok = failed_stage > STAGE_PBR
+    financial_ok = failed_stage > STAGE_DEBT
+    momentum_ok = (failed_stage > STAGE_POSITION) & (current > 0) & (high_52w > 0)
+    opinion_ok = failed_stage > STAGE_OPINION
+    dividend_ok = failed_stage > STAGE_DIVIDEND
+
+    per_low = per < 10
+    per_fair = ~per_low & (per < 15)
+    pbr_low = pbr < 1
+    roe_high = roe > 15
+    roe_good = ~roe_high & (roe > 10)
+    debt_low = debt_ratio < 50
+    near_high = position > 80
+    opinion_strong = opinion_score <= 2
+
+    signal_mask = np.column_stack([
+        valuation_ok & per_low,
+        valuation_ok & per_fair,
+        valuation_ok & ~per_low & ~per_fair & (per > 30),
+        valuation_ok & pbr_low,
+        valuation_ok & ~pbr_low & (pbr < 2),
+        financial_ok & roe_high,
+        financial_ok & roe_good,
+        financial_ok & ~roe_high & ~roe_good & (roe < 5),
+        financial_ok & debt_low,
+        financial_ok & ~debt_low & (debt_ratio > 100),
+        momentum_ok & near_high,
+        momentum_ok & ~near_high & (position < 20),
+        opinion_ok & opinion_strong,
+        opinion_ok & ~opinion_strong & (opinion_score <= 2.5),
+        dividend_ok & (dividend > 3),
+    ]) if len(data) else np.zeros((0, len(SIGNALS)), dtype=bool)
+
+    scores = np.clip(50 + signal_mask.astype(np.int64) @ SIGNAL_POINTS, 0, 100)
+    grade_index = np.select(
+        [scores >= threshold for threshold, *_ in GRADES],
+        np.arange(len(GRADES)),
+        default=len(GRADES)
+    )
+
+    return ScoreBatch(scores, grade_index, signal_mask, data.errors)
+
+
+def score_batch(records: Sequence[Dict]) -> ScoreBatch:
+    """
+    종목 데이터 전체의 점수를 한 번에 계산합니다.
+
+    Args:
+        records: 스크래핑된 종목 데이터 딕셔너리 리스트
+
+    Returns:
+        ScoreBatch (result(i)는 analyze_stock_ai(records[i])와 같음)
+    """
+    return score_columns(ScoreColumns.from_records(records))
+
+
+def score_stock_records(records: Sequence[StockRecord]) -> ScoreBatch:
+    """StockRecord 리스트의 점수를 한 번에 계산합니다. (숫자 변환 없이 바로 배열 연산)"""
+    return score_columns(ScoreColumns.from_stock_records(records))
+
+
+def score_records(records: Sequence[Dict]) -> List[Dict]:
+    """score_batch(records).results() - analyze_stock_ai를 모든 종목에 적용한 결과와 같음"""
+    return score_batch(records).results()
@@ -10,6 +10,8 @@ interface Stock {
 }
 
 const API_BASE = '/api'; // Modified for Vercel deployment
+const BATCH_LIMIT = 200; // 일괄 분석 한 번에 요청할 최대 종목 수
+const STOCKS_CACHE_KEY = 'stock_list_snapshot'; // 종목 목록 + ETag 로컬 저장 키
 
 interface AnalysisResult {
   opinion: string;
@@ -21,6 +23,7 @@ interface AnalysisResult {
   sector: string;
   loading?: boolean;
   ai_loading?: boolean;
+  ai_stream?: string;
   strategic_recommendation?: string;
   strategic_solution?: string;
 }
@@ -39,10 +42,31 @@ function App() {
   const [testStatus, setTestStatus] = useState<'idle' | 'testing' | 'success' | 'error'>('idle');
 
   const fetchStocks = async () => {
-    setLoading(true);
+    // 저장해 둔 목록을 먼저 보여주고, ETag로 바뀐 경우에만 전체 목록을 다시 받음
+    let cached: { etag: string; stocks: Stock[] } | null = null;
     try {
-      const response = await axios.get(`${API_BASE}/stocks`);
-      setStocks(response.data);
+      cached = JSON.parse(localStorage.getItem(STOCKS_CACHE_KEY) || 'null');
+    } catch {
+      cached = null;
+    }
+    if (cached) {
+      setStocks(cached.stocks);
+    } else {
+      setLoading(true);
+    }
+
+    try {
+      const response = await axios.get(`${API_BASE}/stocks`, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        validateStatus: status => status === 200 || status === 304,
+      });
+      if (response.status === 200 && Array.isArray(response.data)) {
+        setStocks(response.data);
+        const etag = response.headers['etag'];
+        if (etag) {
+          localStorage.setItem(STOCKS_CACHE_KEY, JSON.stringify({ etag, stocks: response.data }));
+        }
+      }
     } catch (error) {
       console.error('주식 리스트 로드 실패:', error);
     } finally {
@@ -84,9 +108,17 @@ function App() {
   const handleExport = async () => {
     setExporting(true);
     try {
-      const response = await axios.post(`${API_BASE}/export`, {
-        stocks: stocks,
-        analysis: analysis
+      // 행은 서버 캐시의 분석 결과로 채우고, 서버에 없으면 화면에 있는 분석 결과를 사용 (둘 다 없으면 '-')
+      const analyzed: Record<string, Partial<AnalysisResult>> = {};
+      for (const [ticker, data] of Object.entries(analysis)) {
+        if (!data?.current_price || data.loading) continue;
+        const { opinion, opinion_score, target_price, high_52w, low_52w, current_price, sector } = data;
+        analyzed[ticker] = { opinion, opinion_score, target_price, high_52w, low_52w, current_price, sector };
+      }
+      const response = await axios.post(`${API_BASE}/export/tickers`, {
+        tickers: stocks.map(stock => stock.ticker),
+        analysis: analyzed,
+        fetch_missing: false
       }, {
         responseType: 'blob',
       });
@@ -117,14 +149,57 @@ function App() {
 
   const handleBatchAnalyze = async () => {
     setBatchAnalyzing(true);
-    const topStocks = filteredStocks.slice(0, 20); // API 과부하 방지를 위해 상위 20개만 시범 실시
-    for (const stock of topStocks) {
-      if (!analysis[stock.ticker]?.current_price || analysis[stock.ticker]?.current_price === 'N/A') {
-        await handleAnalyze(stock.ticker);
-        await new Promise(r => setTimeout(r, 500)); // 매너 타임
+    const targets = filteredStocks
+      .slice(0, BATCH_LIMIT)
+      .map(stock => stock.ticker)
+      .filter(ticker => !analysis[ticker]?.current_price || analysis[ticker]?.current_price === 'N/A');
+    if (targets.length === 0) {
+      setBatchAnalyzing(false);
+      return;
+    }
+
+    setAnalysis(prev => {
+      const next = { ...prev };
+      for (const ticker of targets) next[ticker] = { ...next[ticker], loading: true } as any;
+      return next;
+    });
+
+    try {
+      // 서버가 속도 제한 안에서 동시에 가져와 완료되는 대로 NDJSON 한 줄씩 보내줌
+      const response = await fetch(`${API_BASE}/trading-analysis/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tickers: targets }),
+      });
+      if (!response.body) throw new Error('스트리밍 응답을 받을 수 없습니다.');
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const { ticker, data } = JSON.parse(line);
+          setAnalysis(prev => ({ ...prev, [ticker]: { ...data, loading: false } }));
+        }
       }
+    } catch (error) {
+      console.error('일괄 분석 실패:', error);
+    } finally {
+      setAnalysis(prev => {
+        const next = { ...prev };
+        for (const ticker of targets) {
+          if (next[ticker]?.loading) next[ticker] = { ...next[ticker], loading: false };
+        }
+        return next;
+      });
+      setBatchAnalyzing(false);
     }
-    setBatchAnalyzing(false);
   };
 
   const handleAIAnalyze = async (ticker: string) => {
@@ -137,19 +212,44 @@ function App() {
       await handleAnalyze(ticker);
     }
 
-    setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ai_loading: true } }));
+    setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ai_loading: true, ai_stream: '' } }));
     try {
       const currentData = analysis[ticker] || {};
-      const response = await axios.post(`${API_BASE}/gemini-analyze/${ticker}`, {
-        ...currentData,
-        name: stocks.find(s => s.ticker === ticker)?.name
-      }, {
-        headers: { 'X-Gemini-API-Key': apiKey }
+      // 생성되는 텍스트를 SSE(delta)로 바로 보여주고, 마지막 result로 교체
+      const response = await fetch(`${API_BASE}/gemini-analyze/${ticker}/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-Gemini-API-Key': apiKey },
+        body: JSON.stringify({ ...currentData, name: stocks.find(s => s.ticker === ticker)?.name })
       });
-      setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ...response.data, ai_loading: false } }));
+      if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const blocks = buffer.split('\n\n');
+        buffer = blocks.pop() ?? '';
+        for (const block of blocks) {
+          const event = block.match(/^event: (.*)$/m)?.[1];
+          const data = block.match(/^data: (.*)$/m)?.[1];
+          if (!event || !data) continue;
+          const payload = JSON.parse(data);
+          if (event === 'delta') {
+            setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ai_stream: (prev[ticker]?.ai_stream ?? '') + payload.text } }));
+          } else if (event === 'result') {
+            setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ...payload, ai_stream: undefined } }));
+          } else if (event === 'error') {
+            console.error('AI 분석 실패:', payload.error);
+          }
+        }
+      }
     } catch (error) {
       console.error('AI 분석 실패:', error);
-      setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ai_loading: false } }));
+    } finally {
+      setAnalysis(prev => ({ ...prev, [ticker]: { ...prev[ticker], ai_loading: false, ai_stream: undefined } }));
     }
   };
 
@@ -218,7 +318,7 @@ function App() {
           </div>
           <button className="btn btn-batch" onClick={handleBatchAnalyze} disabled={batchAnalyzing || loading}>
             <PlayCircle size={18} />
-            {batchAnalyzing ? '일괄 분석 중...' : '전체 일괄 분석 (상위 20개)'}
+            {batchAnalyzing ? '일괄 분석 중...' : `전체 일괄 분석 (상위 ${BATCH_LIMIT}개)`}
           </button>
         </div>
 
@@ -305,7 +405,18 @@ function App() {
                         </div>
                       </td>
                     </tr>
-                    {analysis[stock.ticker]?.strategic_recommendation && (
+                    {analysis[stock.ticker]?.ai_stream && (
+                      <tr className="ai-row">
+                        <td colSpan={8}>
+                          <div className="ai-report animate-fade-in">
+                            <div className="report-item">
+                              <strong>💡 AI 분석 중:</strong> {analysis[stock.ticker].ai_stream}
+                            </div>
+                          </div>
+                        </td>
+                      </tr>
+                    )}
+                    {!analysis[stock.ticker]?.ai_stream && analysis[stock.ticker]?.strategic_recommendation && (
                       <tr className="ai-row">
                         <td colSpan={8}>
                           <div className="ai-report animate-fade-in">